@@ -1,13 +1,23 @@
 import os
-from flask import Flask, render_template
+import click
+from flask import Flask, render_template, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from config import config_by_name
+from app.utils.cache import init_cache
+from app.utils.passwords import init_password_hasher
+from app.utils.db_pool import configure_engine_options, pool_stats, pool_metric_samples
+from app.utils.instrumentation import init_instrumentation
+from app.utils.health import init_health
+from app.utils.internal import internal_only
+from app.utils.json_provider import init_json, init_compression
+from app.utils.replica import RoutingSession, init_replicas
 
 # SQLAlchemy 객체를 초기화합니다.
 # 아직 특정 앱에 연결되지 않은 상태입니다.
-db = SQLAlchemy()
+# 읽기 복제본이 설정되어 있으면 RoutingSession 이 @replica_read 라우트의 조회를 복제본으로 보냅니다.
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
 def create_app():
@@ -47,21 +57,75 @@ def create_app():
     # 동적으로 생성된 SQLALCHEMY_DATABASE_URI가 확실히 적용되도록 합니다.
     app.config.from_mapping(vars(config_object))
 
-    # db 객체를 Flask 앱에 연결합니다.
+    # 커넥션 풀 사용 현황을 측정할 수 있도록 엔진 옵션을 보완한 뒤, db 객체를 Flask 앱에 연결합니다.
+    configure_engine_options(app)
     db.init_app(app)
     # Migrate 객체를 db와 app에 연결하여 'flask db' 명령어를 활성화합니다.
     migrate.init_app(app, db)
+    # DB_REPLICA_URIS 가 설정되어 있으면 읽기 복제본 라우팅을 초기화합니다.
+    replica_router = init_replicas(app, db)
+    # CACHE_BACKEND 설정에 따라 게시글 조회 응답 캐시를 초기화합니다.
+    response_cache = init_cache(app)
+    # 비밀번호 해시 전용 실행기를 초기화합니다.
+    init_password_hasher(app)
+    # JSON_BACKEND 설정에 따라 JSON 인코더(orjson/msgspec/표준 json)를 고릅니다. (한글은 이스케이프하지 않습니다.)
+    init_json(app)
+
+    # 요청별 처리 시간/SQL 측정 미들웨어와 /metrics 엔드포인트를 등록합니다.
+    request_metrics = init_instrumentation(app, db)
+    if request_metrics is not None:
+        if response_cache is not None:
+            request_metrics.collectors.append(response_cache.metric_samples)
+        request_metrics.collectors.append(lambda: pool_metric_samples(db.engine))
+        if replica_router is not None:
+            request_metrics.collectors.append(replica_router.metric_samples)
+    # 큰 JSON 응답 압축 (RESPONSE_COMPRESSION). 압축 시간도 요청 측정에 포함되도록 측정 미들웨어 다음에 등록합니다.
+    init_compression(app)
 
     # --- 3. 모델 및 블루프린트 등록 ---
     # Import models here to prevent circular dependencies.
-    # JSON 응답에서 한글이 유니코드 이스케이프되지 않도록 설정합니다.
-    app.json.ensure_ascii = False
-
     from . import models
     from .routes import user_routes, post_routes
+    from .utils.decorators import init_principal_cache
+    # 인증된 사용자 정보(Principal) 캐시를 초기화합니다.
+    init_principal_cache(app)
     app.register_blueprint(user_routes.bp, url_prefix='/users')
     app.register_blueprint(post_routes.bp, url_prefix='/posts')
 
+    @app.cli.command('backfill-denormalized')
+    @click.option('--batch-size', default=5000, show_default=True, help="한 트랜잭션에서 처리할 id 범위")
+    def backfill_denormalized(batch_size):
+        """비어 있는 posts.author_username 을 채우고 users.post_count 를 다시 셉니다. (모든 서버를 새 버전으로 바꾼 뒤 실행)"""
+        from .repositories import post_repository
+        filled, recounted = post_repository.backfill_denormalized_columns(batch_size)
+        click.echo(f"author_username 채움: {filled}건, post_count 다시 셈: {recounted}명")
+
+    # 아래 운영용 엔드포인트는 내부 요청(INTERNAL_API_TOKEN/INTERNAL_NETWORKS)만 허용합니다.
+    @app.route('/cache/stats', methods=['GET'])
+    @internal_only
+    def cache_stats():
+        """응답 캐시 적중/미스 카운터 조회 API (워커 프로세스별 값입니다.)"""
+        if response_cache is None:
+            return jsonify({"backend": None}), 200
+        return jsonify(response_cache.stats()), 200
+
+    @app.route('/db/pool', methods=['GET'])
+    @internal_only
+    def db_pool_stats():
+        """DB 커넥션 풀 사용 현황 조회 API (체크아웃/오버플로/대기 시간, 워커 프로세스별 값입니다.)"""
+        return jsonify(pool_stats(db.engine)), 200
+
+    @app.route('/db/replicas', methods=['GET'])
+    @internal_only
+    def db_replica_stats():
+        """읽기 복제본 상태(복제 지연, 사용 가능 여부, 조회 수) 조회 API (워커 프로세스별 값입니다.)"""
+        if replica_router is None:
+            return jsonify({"replicas": []}), 200
+        return jsonify(replica_router.stats()), 200
+
+    # 상태 확인 엔드포인트(/healthz, /readyz)를 등록합니다.
+    init_health(app, db)
+
     # 루트 URL에 대한 라우트는 Nginx가 처리하므로 Flask에서 제거합니다.
 
     return app
\ No newline at end of file
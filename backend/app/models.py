@@ -2,7 +2,34 @@
 # 예를 들어, User 모델과 Post 모델이 여기에 위치하게 됩니다.
 
 from . import db
-from sqlalchemy.sql import func
+from sqlalchemy import event, DateTime
+from sqlalchemy.ext.compiler import compiles
+from flask import has_app_context
+from sqlalchemy.orm import Session, deferred
+from sqlalchemy.sql.expression import FunctionElement
+from app.utils.cache import invalidate_posts_cache
+
+class db_now(FunctionElement):
+    """
+    created_at/updated_at 의 기본값으로 쓰는 현재 시각. Postgres 에서는 now() 와 같습니다.
+    SQLite 의 CURRENT_TIMESTAMP 는 '2025-01-01 12:00:00' 처럼 마이크로초 없이 저장되어, SQLAlchemy 가 비교 값으로 바인딩하는
+    '2025-01-01 12:00:00.000000' 과 문자열로 비교하면 순서가 어긋납니다. (keyset 커서가 같은 행을 다시 돌려줌)
+    그래서 SQLite 에서는 SQLAlchemy 와 같은 형식으로 저장합니다.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(db_now)
+def _compile_db_now(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+@compiles(db_now, 'postgresql')
+def _compile_db_now_postgresql(element, compiler, **kw):
+    return 'now()'
+
+@compiles(db_now, 'sqlite')
+def _compile_db_now_sqlite(element, compiler, **kw):
+    return "(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -11,7 +38,9 @@ class User(db.Model):
     email = db.Column(db.String(255), unique=True, nullable=False)
     username = db.Column(db.String(50), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
-    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db_now())
+    # 작성한 게시글 수 (비정규화). 게시글 작성/삭제 시 post_repository.adjust_post_count 로 함께 갱신합니다.
+    post_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # User와 Post 모델 간의 관계 설정
     # 'posts'는 User 객체에서 자신의 모든 Post 객체에 접근하기 위한 속성입니다.
@@ -26,15 +55,53 @@ class Post(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
-    content = db.Column(db.Text, nullable=False)
+    # 본문은 클 수 있으므로 지연 로딩합니다. Post 엔티티를 조회해도 본문은 실제로 접근할 때(또는 undefer 옵션을 줄 때)만 읽습니다.
+    content = deferred(db.Column(db.Text, nullable=False))
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
-    updated_at = db.Column(db.DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    # 작성자 닉네임 (비정규화). 조회 시 users 와 JOIN 하지 않기 위해 작성 시 저장하고, 닉네임이 바뀌면 아래 이벤트로 갱신합니다.
+    author_username = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db_now())
+    updated_at = db.Column(db.DateTime(timezone=True), default=db_now(), onupdate=db_now())
 
     # Post와 User 모델 간의 관계 설정
     # 'author'는 Post 객체에서 작성자 User 객체에 접근하기 위한 속성입니다.
     author = db.relationship('User', back_populates='posts')
 
+    # 목록 조회의 keyset 페이지네이션((created_at, id) 최신순)을 위한 복합 내림차순 인덱스
+    __table_args__ = (
+        db.Index('ix_posts_created_at_id', created_at.desc(), id.desc()),
+        # 사용자별 게시글 목록(GET /users/<id>/posts)과 게시글 수 집계를 위한 인덱스
+        db.Index('ix_posts_user_id_created_at_id', user_id, created_at.desc(), id.desc()),
+        # 내보내기(GET /posts/export)의 updated_since 증분 조회를 위한 인덱스
+        db.Index('ix_posts_updated_at_id', updated_at, id),
+    )
+
     def __repr__(self):
         return f'<Post {self.title}>'
 
+@event.listens_for(User, 'after_update')
+def sync_author_username(mapper, connection, target):
+    """
+    닉네임이 바뀌면 같은 트랜잭션에서 그 사용자의 게시글에 저장된 author_username 도 바꿉니다.
+    게시글 내용이 바뀐 것은 아니므로 updated_at 은 그대로 둡니다. (onupdate 가 적용되면 증분 내보내기가 모든 게시글을 다시 보냅니다.)
+    대신 ETag 에 작성자 닉네임을 넣고, 커밋 후 그 게시글들의 응답 캐시를 무효화합니다. (invalidate_renamed_author_posts)
+    """
+    if db.inspect(target).attrs.username.history.has_changes():
+        posts = Post.__table__
+        connection.execute(
+            posts.update().where(posts.c.user_id == target.id)
+            .values(author_username=target.username, updated_at=posts.c.updated_at)
+        )
+        post_ids = connection.execute(db.select(posts.c.id).where(posts.c.user_id == target.id)).scalars()
+        db.inspect(target).session.info.setdefault('renamed_author_posts', set()).update(post_ids)
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_renamed_author_posts(session):
+    """닉네임이 바뀐 사용자의 게시글 목록/상세 캐시를 커밋 후에 무효화합니다. (커밋 전에 지우면 다른 요청이 이전 닉네임을 다시 캐시할 수 있습니다.)"""
+    post_ids = session.info.pop('renamed_author_posts', None)
+    if post_ids is not None and has_app_context():
+        invalidate_posts_cache(post_ids)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_renamed_author_posts(session):
+    session.info.pop('renamed_author_posts', None)
@@ -0,0 +1 @@
+# 이 파일은 'repositories' 디렉토리를 파이썬 패키지로 만들어줍니다.
\ No newline at end of file
@@ -0,0 +1,219 @@
+# 이 파일은 게시글 조회 쿼리를 한곳에 모아두는 곳입니다.
+# 라우트에서 post.author 를 지연 로딩(lazy loading)하면 게시글마다 users 테이블을
+# 한 번씩 더 조회하는 N+1 문제가 생기므로, 작성자 정보가 필요한 조회는 모두 이 함수들을 거칩니다.
+# POSTS_DENORMALIZED_AUTHOR 가 켜져 있으면 작성자 닉네임은 users 와 JOIN 하지 않고 posts.author_username 에서 읽습니다.
+import re
+from flask import current_app
+from sqlalchemy import tuple_, func, literal, literal_column, or_, insert, select
+from sqlalchemy.orm import joinedload, undefer
+from app import db
+from app.models import Post, User
+
+def _denormalized_author():
+    return current_app.config.get('POSTS_DENORMALIZED_AUTHOR', False)
+
+def _with_author(columns):
+    """columns 뒤에 작성자 닉네임('author')을 더한 쿼리를 만듭니다. 비정규화 컬럼을 쓰지 않을 때만 users 와 JOIN 합니다."""
+    if _denormalized_author():
+        return db.session.query(*columns, Post.author_username.label('author'))
+    return db.session.query(*columns, User.username.label('author')).join(User, Post.user_id == User.id)
+
+def _summary_query(excerpt_length=None):
+    """
+    목록 응답에 필요한 컬럼만 작성자 닉네임과 함께 한 번의 쿼리로 가져오는 기본 쿼리.
+    본문(content)은 읽지 않으며, excerpt_length 가 주어지면 본문 앞부분만 DB 에서 잘라 'excerpt' 로 가져옵니다.
+    """
+    query = _with_author([Post.id, Post.title, Post.created_at, Post.updated_at])
+    if excerpt_length:
+        # left(content, n) 과 같은 결과이며 SQLite 에서도 동작하도록 substr 을 사용합니다.
+        query = query.add_columns(func.substr(Post.content, 1, excerpt_length).label('excerpt'))
+    return query.order_by(Post.created_at.desc(), Post.id.desc())
+
+def list_post_summaries(limit=None, after=None, excerpt_length=None):
+    """
+    게시글 요약 목록을 최신순으로 반환합니다.
+    after 가 주어지면 (created_at, id) 가 그보다 작은 행부터 keyset 방식으로 가져옵니다.
+    반환값은 ORM 객체가 아닌 (id, title, created_at, updated_at, author[, excerpt]) Row 목록입니다.
+    """
+    query = _summary_query(excerpt_length)
+    if after is not None:
+        query = query.filter(tuple_(Post.created_at, Post.id) < tuple_(*after))
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def list_user_post_summaries(user_id, limit=None, after=None):
+    """
+    한 사용자의 게시글 요약 목록을 최신순으로 반환합니다. (user_id, created_at, id) 인덱스 범위만 읽습니다.
+    after, 반환값 형식은 list_post_summaries 와 같습니다.
+    """
+    query = _summary_query().filter(Post.user_id == user_id)
+    if after is not None:
+        query = query.filter(tuple_(Post.created_at, Post.id) < tuple_(*after))
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def count_user_posts(user_id):
+    """
+    한 사용자의 게시글 수를 반환합니다.
+    비정규화 컬럼을 쓰면 users.post_count 를, 아니면 user_id 인덱스 범위를 셉니다.
+    """
+    if _denormalized_author():
+        return db.session.query(User.post_count).filter(User.id == user_id).scalar() or 0
+    return db.session.query(func.count(Post.id)).filter(Post.user_id == user_id).scalar()
+
+def adjust_post_count(user_id, delta):
+    """
+    users.post_count 를 delta 만큼 바꾸고 바뀐 행 수를 반환합니다. (사용자가 없으면 0)
+    읽고 쓰지 않고 UPDATE 한 문장으로 더하므로 동시 작성에도 안전합니다.
+    게시글 INSERT 보다 먼저 호출하면 사용자 행이 잠기므로, 그 사이에 사용자가 삭제되어 외래 키 오류가 나는 일이 없습니다.
+    """
+    return db.session.query(User).filter(User.id == user_id).update(
+        {User.post_count: User.post_count + delta}, synchronize_session=False
+    )
+
+def backfill_denormalized_columns(batch_size=5000):
+    """
+    비어 있는 posts.author_username 을 채우고 users.post_count 를 다시 셉니다. (flask backfill-denormalized)
+    마이그레이션(d2b6f0a47c91)의 채우기는 서비스 중에 실행되어, 그동안 이전 버전 서버가 쓴 게시글이나
+    동시에 작성/삭제된 게시글 때문에 값이 어긋날 수 있으므로 모든 서버가 새 버전으로 바뀐 뒤 실행합니다.
+    사용자 id 범위 batch_size 개씩 사용자 행을 잠근 뒤 세므로(Postgres), 진행 중인 작성/삭제가 끝나기를 기다렸다가
+    그 결과까지 포함해 세고, 이후의 작성/삭제는 다시 센 값에 더해집니다. (쓰기 경로는 게시글 수를 먼저 바꿔 사용자 행을 잠급니다.)
+    채운 게시글 수와 다시 센 사용자 수를 반환합니다.
+    """
+    filled = recounted = 0
+    max_post_id = db.session.query(func.max(Post.id)).scalar() or 0
+    author = select(User.username).where(User.id == Post.user_id).scalar_subquery()
+    for start in range(1, max_post_id + 1, batch_size):
+        filled += db.session.query(Post).filter(
+            Post.id >= start, Post.id < start + batch_size, Post.author_username.is_(None)
+        ).update({Post.author_username: author, Post.updated_at: Post.updated_at}, synchronize_session=False)
+        db.session.commit()
+
+    max_user_id = db.session.query(func.max(User.id)).scalar() or 0
+    post_count = select(func.count(Post.id)).where(Post.user_id == User.id).scalar_subquery()
+    for start in range(1, max_user_id + 1, batch_size):
+        in_batch = (User.id >= start, User.id < start + batch_size)
+        # FOR NO KEY UPDATE: 게시글 INSERT 의 외래 키 확인(KEY SHARE)은 막지 않고, post_count 갱신만 기다리게 합니다.
+        db.session.query(User.id).filter(*in_batch).with_for_update(key_share=True).all()
+        recounted += db.session.query(User).filter(*in_batch).update(
+            {User.post_count: post_count}, synchronize_session=False
+        )
+        db.session.commit()
+    return filled, recounted
+
+def get_post_with_author(post_id):
+    """
+    본문과 작성자 정보를 함께 로딩한 게시글을 반환합니다. 없으면 None 을 반환합니다.
+    비정규화 컬럼을 쓰면 posts 만 조회하고(작성자는 post.author_username), 아니면 User 를 JOIN 으로 함께 로딩합니다.
+    """
+    if _denormalized_author():
+        return db.session.get(Post, post_id, options=[undefer(Post.content)])
+    return db.session.get(Post, post_id, options=[joinedload(Post.author), undefer(Post.content)])
+
+def get_posts_with_author(post_ids):
+    """
+    여러 게시글의 상세 정보를 작성자 닉네임과 함께 한 번의 쿼리로 가져옵니다.
+    반환값은 (id, title, content, created_at, updated_at, author) Row 목록이며 순서는 보장하지 않습니다.
+    """
+    if not post_ids:
+        return []
+    return (
+        _with_author([Post.id, Post.title, Post.content, Post.created_at, Post.updated_at])
+        .filter(Post.id.in_(post_ids))
+        .all()
+    )
+
+def bulk_insert_posts(user, items):
+    """
+    여러 게시글을 다중 행 INSERT ... RETURNING 으로 한 번에 추가하고 작성자의 게시글 수를 늘립니다. (커밋은 호출한 쪽에서 합니다.)
+    items 는 {"title", "content"} 목록이며, 같은 순서의 (id, created_at) Row 목록을 반환합니다.
+    작성자가 이미 삭제되었으면 아무것도 추가하지 않고 None 을 반환합니다.
+    """
+    if not items:
+        return []
+    if not adjust_post_count(user.id, len(items)):
+        return None
+    statement = insert(Post).returning(Post.id, Post.created_at, sort_by_parameter_order=True)
+    rows = db.session.execute(statement, [
+        {"title": item["title"], "content": item["content"], "user_id": user.id, "author_username": user.username}
+        for item in items
+    ]).all()
+    return rows
+
+def iter_post_export_batches(updated_since=None, batch_size=1000):
+    """
+    전체 게시글(본문 포함)을 (updated_at, id) 순서로 batch_size 개씩 나누어 돌려주는 제너레이터.
+    yield_per 로 서버 측 커서(Postgres)를 사용하므로, 게시글 수와 관계없이 한 번에 batch_size 행만 메모리에 올립니다.
+    updated_since 가 주어지면 그 시각 이후(같은 시각 포함)에 수정된 게시글만 돌려줍니다.
+    각 행은 (id, title, content, user_id, created_at, updated_at, author) Row 입니다.
+    """
+    query = _with_author([Post.id, Post.title, Post.content, Post.user_id, Post.created_at, Post.updated_at])
+    if updated_since is not None:
+        query = query.filter(Post.updated_at >= updated_since)
+    query = query.order_by(Post.updated_at, Post.id)
+    result = db.session.execute(query.statement, execution_options={"yield_per": batch_size})
+    try:
+        yield from result.partitions()
+    finally:
+        # 중간에 클라이언트 연결이 끊겨도 서버 측 커서를 닫습니다.
+        result.close()
+
+def get_post(post_id):
+    """작성자 정보와 본문 없이 게시글만 조회합니다. (권한 확인은 post.user_id 로 충분합니다.)"""
+    return db.session.get(Post, post_id)
+
+# 검색 방식
+#   - 'simple' : posts.search_vector(tsvector, 'simple' 설정) + GIN 인덱스. 공백 단위로 나누고 각 단어를 접두어로 검색하므로
+#                '게시글' 로 '게시글을', '게시글에서' 도 찾을 수 있습니다.
+#   - 'trigram': pg_trgm GIN 인덱스를 사용하는 부분 문자열(ILIKE) 검색. 단어 중간이 일치해도 찾지만 3글자 이상에서 효과적입니다.
+SEARCH_MODES = ('simple', 'trigram')
+# to_tsquery 에서 연산자로 해석되는 문자
+_TSQUERY_SPECIAL = re.compile(r"[&|!():*<>'\\]")
+
+def _prefix_tsquery(text):
+    """검색어를 단어별 접두어 검색을 AND 로 묶은 tsquery 문자열로 만듭니다. 예) '플라스크 게시' -> '플라스크':* & '게시':*"""
+    return ' & '.join(f"'{term}':*" for term in _TSQUERY_SPECIAL.sub(' ', text).split())
+
+def _like_pattern(text):
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+def search_post_summaries(text, mode='simple', limit=None, after=None):
+    """
+    제목/내용에 검색어가 포함된 게시글 요약을 관련도(rank) 높은 순으로 반환합니다.
+    after 가 주어지면 (rank, id) 가 그보다 작은 행부터 keyset 방식으로 가져옵니다.
+    반환값은 (id, title, created_at, updated_at, author, rank) Row 목록입니다.
+    Postgres 가 아니면(로컬 SQLite 등) 인덱스 없이 LIKE 로 찾고 rank 는 0 입니다.
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        pattern = _like_pattern(text)
+        condition = or_(Post.title.ilike(pattern, escape='\\'), Post.content.ilike(pattern, escape='\\'))
+        rank = literal(0.0)
+    elif mode == 'trigram':
+        pattern = _like_pattern(text)
+        condition = or_(Post.title.ilike(pattern, escape='\\'), Post.content.ilike(pattern, escape='\\'))
+        # 제목이 비슷할수록, 그다음은 내용에 검색어와 비슷한 단어가 있을수록 높은 점수를 줍니다.
+        rank = func.greatest(func.similarity(Post.title, text) * 2, func.word_similarity(text, Post.content))
+    else:
+        tsquery = _prefix_tsquery(text)
+        if not tsquery:
+            return []
+        query_vector = func.to_tsquery('simple', tsquery)
+        search_vector = literal_column('posts.search_vector')
+        condition = search_vector.op('@@')(query_vector)
+        rank = func.ts_rank(search_vector, query_vector)
+
+    query = (
+        _summary_query()
+        .add_columns(rank.label('rank'))
+        .filter(condition)
+        .order_by(None)
+        .order_by(rank.desc(), Post.id.desc())
+    )
+    if after is not None:
+        query = query.filter(tuple_(rank, Post.id) < tuple_(*after))
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
@@ -1,8 +1,15 @@
 # 이 파일은 게시글 관련 API 엔드포인트(CRUD)를 정의하는 곳입니다.
-from flask import Blueprint, request, jsonify
+import json
+from datetime import datetime, timezone
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from app.models import Post
 from app import db
-from app.utils.decorators import token_required
+from app.repositories import post_repository
+from app.utils.decorators import token_required, mark_principal_deleted
+from app.utils.cache import cached_response, invalidate_post_cache, list_cache_key, detail_cache_key
+from app.utils.conditional import conditional_response, compute_etag, latest_modified
+from app.utils.replica import replica_read, reading_from_replica, use_primary
+from app.utils.pagination import parse_limit, encode_cursor, decode_cursor, encode_search_cursor, decode_search_cursor, MAX_PAGE_SIZE
 
 bp = Blueprint('post_routes', __name__)
 
@@ -18,68 +25,359 @@ def create_post(current_user):
     if not all([title, content]):
         return jsonify({"message": "제목과 내용을 모두 입력해주세요."}), 400
 
-    new_post = Post(title=title, content=content, user_id=current_user.id)
+    # 다른 워커에서 삭제된 사용자의 토큰일 수 있으므로, 게시글 수를 먼저 늘려 사용자 행이 남아 있는지 확인합니다.
+    if not post_repository.adjust_post_count(current_user.id, 1):
+        return _deleted_user_response(current_user)
+    new_post = Post(title=title, content=content, user_id=current_user.id, author_username=current_user.username)
     db.session.add(new_post)
     db.session.commit()
+    invalidate_post_cache(user_id=current_user.id)
 
+    # 커밋 후 만료된 속성을 다시 읽지 않도록 요청에서 받은 값을 그대로 응답합니다. (본문은 지연 로딩 컬럼입니다.)
     return jsonify({
         "postId": new_post.id,
-        "title": new_post.title,
-        "content": new_post.content,
+        "title": title,
+        "content": content,
         "author": current_user.username,
-        "createdAt": new_post.created_at.isoformat()
+        "createdAt": new_post.created_at
     }), 201
 
+def _deleted_user_response(current_user):
+    """토큰은 유효하지만 사용자가 이미 삭제된 경우의 응답"""
+    db.session.rollback()
+    mark_principal_deleted(current_user.id)
+    return jsonify({"message": "유효하지 않은 토큰입니다."}), 401
+
+class _TooManyItems(Exception):
+    pass
+
+def _validate_post_item(item):
+    """일괄 작성 항목 하나를 검사하여 오류 메시지(없으면 None)를 반환합니다."""
+    if not isinstance(item, dict):
+        return "각 항목은 {\"title\", \"content\"} 객체여야 합니다."
+    title, content = item.get('title'), item.get('content')
+    if not (isinstance(title, str) and isinstance(content, str) and title and content):
+        return "제목과 내용을 모두 입력해주세요."
+    if len(title) > 255:
+        return "제목은 255자 이하로 입력해주세요."
+    return None
+
+def _read_bulk_items(max_items):
+    """
+    요청 본문에서 (index, 항목 또는 파싱 오류 메시지, 오류 여부) 목록을 읽습니다.
+    - application/json: 게시글 배열 또는 {"posts": [...]}
+    - application/x-ndjson: 한 줄에 게시글 하나. 본문 전체를 메모리에 올리지 않고 줄 단위로 읽습니다.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        entries = []
+        for raw in request.stream:
+            line = raw.strip()
+            if not line:
+                continue
+            if len(entries) >= max_items:
+                raise _TooManyItems()
+            try:
+                entries.append((len(entries), json.loads(line), False))
+            except ValueError:
+                entries.append((len(entries), "JSON 형식이 올바르지 않습니다.", True))
+        return entries
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('posts')
+    if not isinstance(data, list):
+        raise ValueError("게시글 배열을 보내주세요.")
+    if len(data) > max_items:
+        raise _TooManyItems()
+    return [(index, item, False) for index, item in enumerate(data)]
+
+@bp.route('/bulk', methods=['POST'])
+@token_required
+def create_posts_bulk(current_user):
+    """
+    게시글 일괄 작성 API
+    올바른 항목만 한 트랜잭션에서 다중 행 INSERT 로 저장하고, 잘못된 항목은 index 와 함께 errors 로 알려줍니다.
+    ?atomic=true 이면 하나라도 잘못된 경우 아무것도 저장하지 않습니다.
+    """
+    max_items = current_app.config.get('POSTS_BULK_MAX_ITEMS', 1000)
+    atomic = request.args.get('atomic', '').lower() in ('1', 'true')
+    try:
+        entries = _read_bulk_items(max_items)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except _TooManyItems:
+        return jsonify({"message": f"한 번에 최대 {max_items}개까지 작성할 수 있습니다."}), 413
+
+    valid, errors = [], []
+    for index, item, parse_failed in entries:
+        message = item if parse_failed else _validate_post_item(item)
+        if message:
+            errors.append({"index": index, "message": message})
+        else:
+            valid.append((index, item))
+
+    if not valid or (atomic and errors):
+        return jsonify({"message": "저장할 수 있는 게시글이 없습니다." if not valid else "잘못된 항목이 있어 저장하지 않았습니다.",
+                        "created": [], "errors": errors}), 400
+
+    rows = post_repository.bulk_insert_posts(current_user, [item for _, item in valid])
+    if rows is None:
+        return _deleted_user_response(current_user)
+    db.session.commit()
+    invalidate_post_cache(user_id=current_user.id)
+
+    created = [
+        {"index": index, "postId": row.id, "createdAt": row.created_at}
+        for (index, _), row in zip(valid, rows)
+    ]
+    # 일부만 저장된 경우 207(Multi-Status)로 응답하여 클라이언트가 errors 를 확인하도록 합니다.
+    return jsonify({"created": created, "errors": errors}), 201 if not errors else 207
+
+def _parse_ids(value):
+    """'1,2,3' 형식의 id 목록을 중복 없이 요청 순서대로 반환합니다. 형식이 잘못되면 ValueError를 발생시킵니다."""
+    ids = list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+    if not ids or len(ids) > MAX_PAGE_SIZE:
+        raise ValueError(f"ids 는 1 ~ {MAX_PAGE_SIZE}개까지 지정할 수 있습니다.")
+    return ids
+
 @bp.route('', methods=['GET'])
+@cached_response(list_cache_key)
+@replica_read
 def get_posts():
-    """전체 게시글 목록 조회 API"""
-    # 모든 게시글을 created_at 기준으로 내림차순(최신순)으로 정렬하여 가져옵니다.
-    posts = Post.query.order_by(Post.created_at.desc()).all()
-
-    # 각 post 객체를 JSON 형식에 맞게 가공합니다.
-    results = [
-        {
-            "postId": post.id,
-            "title": post.title,
-            # 'author'는 relationship으로 연결된 User 객체이므로, post.author.username으로 접근합니다.
-            "author": post.author.username,
-            "createdAt": post.created_at.isoformat()
-        } for post in posts
-    ]
+    """
+    게시글 목록 조회 API (cursor 기반 페이지네이션)
+    목록 응답에는 Last-Modified 를 붙이지 않습니다. 게시글이 삭제되어도 남은 게시글의 최근 수정 시각은 그대로라서,
+    If-Modified-Since 로 재검증하면 삭제된 글이 포함된 이전 목록에 304 를 주게 되기 때문입니다. (ETag 로만 재검증)
+    """
+    # ?ids=1,2,3 으로 요청하면 해당 게시글들의 상세 정보를 한 번의 쿼리로 반환합니다.
+    if request.args.get('ids') is not None:
+        try:
+            ids = _parse_ids(request.args['ids'])
+        except ValueError:
+            return jsonify({"message": f"ids 는 쉼표로 구분한 1 ~ {MAX_PAGE_SIZE}개의 게시글 번호여야 합니다."}), 400
+        rows = {row.id: row for row in post_repository.get_posts_with_author(ids)}
+        found = [rows[post_id] for post_id in ids if post_id in rows]
+        return conditional_response(
+            compute_etag((post.id, post.updated_at, post.author) for post in found),
+            None,
+            lambda: jsonify({
+                "posts": [_serialize_post_detail(post, post.author) for post in found],
+                "missing": [post_id for post_id in ids if post_id not in rows]
+            })
+        )
+
+    # ?excerpt=N 이면 본문 앞 N 글자를 DB 에서 잘라 함께 반환합니다. (본문 전체는 읽지 않습니다.)
+    try:
+        excerpt_length = _parse_excerpt_length(request.args.get('excerpt'))
+    except ValueError:
+        max_length = current_app.config.get('POSTS_EXCERPT_MAX_LENGTH', 500)
+        return jsonify({"message": f"excerpt 는 1 ~ {max_length} 사이의 숫자여야 합니다."}), 400
+
+    # 기존 프론트엔드(fetchPosts)를 위해 ?all=true 로 요청하면 전체 목록을 그대로 반환합니다.
+    if request.args.get('all', '').lower() in ('1', 'true'):
+        posts = post_repository.list_post_summaries(excerpt_length=excerpt_length)
+        return conditional_response(
+            compute_etag(((post.id, post.updated_at, post.author) for post in posts), variant=excerpt_length),
+            None,
+            lambda: jsonify([_serialize_post_summary(post) for post in posts])
+        )
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"message": "잘못된 페이지네이션 파라미터입니다."}), 400
+
+    # (created_at, id) 복합 인덱스를 타도록 최신순으로 정렬하고,
+    # 다음 페이지가 있는지 확인하기 위해 limit + 1개를 가져옵니다.
+    posts = post_repository.list_post_summaries(limit=limit + 1, after=after, excerpt_length=excerpt_length)
+
+    # 검증자는 다음 페이지 존재 여부까지 반영되도록 limit + 1개 전체로 계산하고, excerpt 길이에 따라 본문이 다르므로 구분합니다.
+    etag = compute_etag(((post.id, post.updated_at, post.author) for post in posts), variant=excerpt_length)
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+
+    # 클라이언트(또는 CloudFront)가 가진 버전과 같으면 본문 직렬화 없이 304 를 반환합니다.
+    return conditional_response(etag, None, lambda: jsonify({
+        "posts": [_serialize_post_summary(post) for post in posts],
+        "nextCursor": next_cursor
+    }))
 
-    return jsonify(results), 200
+def _parse_excerpt_length(value):
+    """excerpt 쿼리 파라미터를 1 ~ POSTS_EXCERPT_MAX_LENGTH 범위의 정수로 변환합니다. 없으면 None 을 반환합니다."""
+    if value is None or value == '':
+        return None
+    length = int(value)
+    if not 1 <= length <= current_app.config.get('POSTS_EXCERPT_MAX_LENGTH', 500):
+        raise ValueError("excerpt 범위를 벗어났습니다.")
+    return length
+
+def _serialize_post_summary(row):
+    """목록 응답에 사용되는 게시글 요약 정보를 만듭니다. (post_repository 의 Row 를 받습니다.)"""
+    summary = {
+        "postId": row.id,
+        "title": row.title,
+        "author": row.author,
+        "createdAt": row.created_at
+    }
+    if 'excerpt' in row._fields:
+        summary["excerpt"] = row.excerpt
+    return summary
+
+@bp.route('/search', methods=['GET'])
+def search_posts():
+    """게시글 검색 API (관련도순, cursor 기반 페이지네이션)"""
+    text = (request.args.get('q') or '').strip()
+    if not text:
+        return jsonify({"message": "검색어(q)를 입력해주세요."}), 400
+    if len(text) > 200:
+        return jsonify({"message": "검색어는 200자 이하로 입력해주세요."}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        cursor = request.args.get('cursor')
+        after_mode, *after = decode_search_cursor(cursor) if cursor else (None,)
+    except ValueError:
+        return jsonify({"message": "잘못된 페이지네이션 파라미터입니다."}), 400
+
+    # POSTS_SEARCH_MODE 가 'auto' 이면 단어(tsvector) 검색을 먼저 하고, 결과가 없을 때만 부분 문자열(trigram) 검색을 합니다.
+    # 다음 페이지는 첫 페이지와 같은 방식으로 이어서 검색합니다.
+    configured = current_app.config.get('POSTS_SEARCH_MODE', 'auto')
+    modes = [after_mode] if after_mode else (['simple', 'trigram'] if configured == 'auto' else [configured])
+    if any(mode not in post_repository.SEARCH_MODES for mode in modes):
+        return jsonify({"message": "잘못된 페이지네이션 파라미터입니다."}), 400
+
+    for mode in modes:
+        posts = post_repository.search_post_summaries(text, mode=mode, limit=limit + 1, after=after or None)
+        if posts:
+            break
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_search_cursor(mode, posts[-1].rank, posts[-1].id)
+
+    return jsonify({
+        "posts": [dict(_serialize_post_summary(post), rank=round(float(post.rank), 6)) for post in posts],
+        "mode": mode,
+        "nextCursor": next_cursor
+    }), 200
+
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'json': 'application/json'}
+
+@bp.route('/export', methods=['GET'])
+def export_posts():
+    """
+    전체 게시글 내보내기 API (분석용)
+    ?format=ndjson(기본, 한 줄에 게시글 하나) 또는 json(배열)으로, 목록을 메모리에 모으지 않고 chunked 응답으로 흘려보냅니다.
+    ?updated_since=<ISO 8601> 이면 그 시각 이후(같은 시각 포함)에 수정된 게시글만 updatedAt 순서로 보내므로,
+    마지막으로 받은 updatedAt 을 다음 요청의 updated_since 로 넘겨 증분 동기화할 수 있습니다. (경계의 게시글은 postId 로 중복 제거)
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": "format 은 ndjson 또는 json 이어야 합니다."}), 400
+    try:
+        updated_since = _parse_updated_since(request.args.get('updated_since'))
+    except ValueError:
+        return jsonify({"message": "updated_since 는 ISO 8601 형식의 시각이어야 합니다."}), 400
+
+    batch_size = current_app.config.get('POSTS_EXPORT_BATCH_SIZE', 1000)
+    encode = current_app.json.encode
+
+    def generate():
+        # 배치(yield_per 단위)마다 한 번씩 써서 쓰기 횟수를 줄이고, 메모리에는 한 배치만 둡니다.
+        first = True
+        if export_format == 'json':
+            yield b'['
+        for batch in post_repository.iter_post_export_batches(updated_since, batch_size):
+            lines = [encode(_serialize_post_export(row)) for row in batch]
+            if export_format == 'json':
+                yield (b'' if first else b',') + b','.join(lines)
+            else:
+                yield b'\n'.join(lines) + b'\n'
+            first = False
+        if export_format == 'json':
+            yield b']\n'
+
+    # 요청 컨텍스트(DB 세션)를 스트림이 끝날 때까지 유지합니다. 그동안 DB 커넥션 하나를 사용합니다.
+    response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Cache-Control'] = 'no-store'
+    # Nginx 가 응답 전체를 버퍼링하지 않고 바로 흘려보내도록 합니다.
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def _parse_updated_since(value):
+    """updated_since 를 datetime 으로 변환합니다. 시간대가 없으면 UTC 로 간주합니다. 없으면 None 을 반환합니다."""
+    if not value:
+        return None
+    # 쿼리 문자열에서 '+' 가 공백으로 바뀌어 들어온 경우('...T00:00:00 09:00')를 되돌립니다.
+    parsed = datetime.fromisoformat(value.strip().replace(' ', '+').replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def _serialize_post_export(row):
+    """내보내기 응답의 게시글 한 건 (post_repository.iter_post_export_batches 의 Row 를 받습니다.)"""
+    return {
+        "postId": row.id,
+        "title": row.title,
+        "content": row.content,
+        "userId": row.user_id,
+        "author": row.author,
+        "createdAt": row.created_at,
+        "updatedAt": row.updated_at
+    }
 
 @bp.route('/<int:post_id>', methods=['GET'])
+@cached_response(detail_cache_key)
+@replica_read
 def get_post_detail(post_id):
     """특정 게시글 상세 조회 API"""
-    # post_id에 해당하는 게시글을 데이터베이스에서 찾습니다. 없으면 None을 반환합니다.
-    post = Post.query.get(post_id)
+    # post_id에 해당하는 게시글을 작성자 정보와 함께 한 번의 쿼리로 찾습니다. 없으면 None을 반환합니다.
+    post = post_repository.get_post_with_author(post_id)
+    if post is None and reading_from_replica():
+        # 방금 작성되어 복제본에 아직 없는 게시글일 수 있으므로 primary 에서 한 번 더 찾습니다.
+        with use_primary():
+            post = post_repository.get_post_with_author(post_id)
 
     # 게시글이 존재하지 않는 경우, 404 Not Found 오류를 반환합니다.
     if post is None:
         return jsonify({"message": "게시글을 찾을 수 없습니다."}), 404
 
-    return jsonify({
+    # 비정규화 컬럼이 아직 채워지지 않은 게시글이면 작성자를 조회합니다.
+    author = post.author_username or post.author.username
+    return conditional_response(
+        compute_etag([(post.id, post.updated_at, author)]),
+        latest_modified([post.updated_at]),
+        lambda: jsonify(_serialize_post_detail(post, author))
+    )
+
+def _serialize_post_detail(post, author):
+    """상세 응답에 사용되는 게시글 정보를 만듭니다. (ORM 객체와 post_repository 의 Row 모두 받습니다.)"""
+    return {
         "postId": post.id,
         "title": post.title,
         "content": post.content,
-        "author": post.author.username,
-        "createdAt": post.created_at.isoformat(),
-        "updatedAt": post.updated_at.isoformat()
-    }), 200
+        "author": author,
+        "createdAt": post.created_at,
+        "updatedAt": post.updated_at
+    }
 
 @bp.route('/<int:post_id>', methods=['PUT'])
 @token_required
 def update_post(current_user, post_id):
     """특정 게시글 수정 API"""
     # 1. 수정할 게시글을 DB에서 조회
-    post = Post.query.get(post_id)
+    post = post_repository.get_post(post_id)
 
     if post is None:
         return jsonify({"message": "게시글을 찾을 수 없습니다."}), 404
 
     # 2. 게시글 작성자와 현재 로그인한 사용자가 동일한지 확인
-    if post.author.id != current_user.id:
+    # (post.author 를 로딩하지 않도록 외래 키 컬럼으로 비교합니다.)
+    if post.user_id != current_user.id:
         return jsonify({"message": "게시글을 수정할 권한이 없습니다."}), 403
 
     data = request.get_json()
@@ -93,15 +391,17 @@ def update_post(current_user, post_id):
     post.title = title
     post.content = content
     db.session.commit()
+    invalidate_post_cache(post_id)
 
     # API 명세에 따라 수정된 게시글의 전체 정보를 반환합니다.
+    # 작성자는 현재 사용자와 같음을 위에서 확인했으므로 current_user 를 그대로 사용합니다.
     return jsonify({
         "postId": post.id,
-        "title": post.title,
-        "content": post.content,
-        "author": post.author.username,
-        "createdAt": post.created_at.isoformat(),
-        "updatedAt": post.updated_at.isoformat()
+        "title": title,
+        "content": content,
+        "author": current_user.username,
+        "createdAt": post.created_at,
+        "updatedAt": post.updated_at
     }), 200
 
 @bp.route('/<int:post_id>', methods=['DELETE'])
@@ -109,18 +409,20 @@ def update_post(current_user, post_id):
 def delete_post(current_user, post_id):
     """특정 게시글 삭제 API"""
     # 1. 삭제할 게시글을 DB에서 조회
-    post = Post.query.get(post_id)
+    post = post_repository.get_post(post_id)
 
     if post is None:
         return jsonify({"message": "게시글을 찾을 수 없습니다."}), 404
 
     # 2. 게시글 작성자와 현재 로그인한 사용자가 동일한지 확인
-    if post.author.id != current_user.id:
+    if post.user_id != current_user.id:
         return jsonify({"message": "게시글을 삭제할 권한이 없습니다."}), 403
 
     # 3. 게시글 DB에서 삭제
     db.session.delete(post)
+    post_repository.adjust_post_count(current_user.id, -1)
     db.session.commit()
+    invalidate_post_cache(post_id, user_id=current_user.id)
 
     # 204 No Content 응답은 body가 없어야 하므로, 빈 응답을 반환합니다.
     return '', 204
\ No newline at end of file
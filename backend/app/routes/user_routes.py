@@ -1,9 +1,14 @@
 # 이 파일은 사용자 관련 API 엔드포인트(회원가입, 로그인 등)를 정의하는 곳입니다.
 
 from flask import Blueprint, request, jsonify, current_app
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.models import User
 from app import db
+from app.utils.passwords import get_password_hasher, HasherBusyError
+from app.repositories import post_repository
+from app.utils.cache import cached_response, cached_user_post_count, user_posts_cache_key
+from app.utils.conditional import conditional_response, compute_etag
+from app.utils.pagination import parse_limit, encode_cursor, decode_cursor
+from app.utils.replica import replica_read, reading_from_replica, use_primary
 import re
 import jwt
 import datetime
@@ -11,6 +16,13 @@ import datetime
 # '/api/users' 로 시작하는 URL들을 처리할 Blueprint 객체를 생성합니다.
 bp = Blueprint('user_routes', __name__)
 
+@bp.errorhandler(HasherBusyError)
+def handle_hasher_busy(e):
+    """비밀번호 해시 대기열이 가득 찬 경우 잠시 후 다시 시도하도록 503 을 반환합니다."""
+    response = jsonify({"message": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @bp.route('/signup', methods=['POST'])
 def signup():
     """회원가입 API"""
@@ -39,8 +51,8 @@ def signup():
     if User.query.filter_by(username=username).first():
         return jsonify({"message": "이미 사용중인 닉네임입니다."}), 409
 
-    # 3. 비밀번호 암호화 및 사용자 생성
-    hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
+    # 3. 비밀번호 암호화 및 사용자 생성 (해시 방식은 config 의 PASSWORD_HASH_METHOD 를 따릅니다.)
+    hashed_password = get_password_hasher().hash(password)
     new_user = User(email=email, username=username, password=hashed_password)
 
     # 4. DB에 저장
@@ -50,6 +62,7 @@ def signup():
     return jsonify({"userId": new_user.id, "email": new_user.email, "username": new_user.username}), 201
 
 @bp.route('/login', methods=['POST'])
+@replica_read
 def login():
     """로그인 API"""
     data = request.get_json()
@@ -60,18 +73,31 @@ def login():
     if not all([email, password]):
         return jsonify({"message": "이메일과 비밀번호를 모두 입력해주세요."}), 400
 
-    # 1. 이메일로 사용자 조회
+    # 1. 이메일로 사용자 조회 (복제본에 없으면 방금 가입한 사용자일 수 있으므로 primary 에서 다시 찾습니다.)
     user = User.query.filter_by(email=email).first()
+    if user is None and reading_from_replica():
+        with use_primary():
+            user = User.query.filter_by(email=email).first()
 
     # 2. 사용자가 존재하고 비밀번호가 일치하는지 확인
-    if not user or not check_password_hash(user.password, password):
+    hasher = get_password_hasher()
+    if not user or not hasher.verify(user.password, password):
         return jsonify({"message": "이메일 또는 비밀번호가 올바르지 않습니다."}), 401
 
+    # 저장된 해시의 방식/반복 횟수가 현재 설정과 다르면, 평문을 알고 있는 지금 다시 해시하여 저장합니다.
+    if hasher.needs_rehash(user.password):
+        user.password = hasher.hash(password)
+        db.session.commit()
+
     # 3. JWT Access Token 생성
     payload = {
         'userId': user.id,
-        'exp': datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1) # 토큰 만료 시간 (1시간)
+        # 토큰 만료 시간 (기본 1시간)
+        'exp': datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=current_app.config['JWT_ACCESS_TOKEN_HOURS'])
     }
+    # 토큰에 username 을 담아 두면 인증된 요청에서 사용자 조회 없이 작성자 이름을 알 수 있습니다.
+    if current_app.config['JWT_EMBED_USERNAME']:
+        payload['username'] = user.username
     secret_key = current_app.config['JWT_SECRET_KEY']
     token = jwt.encode(payload, secret_key, algorithm='HS256')
 
@@ -80,3 +106,44 @@ def login():
         "userId": user.id,
         "username": user.username
     }), 200
+
+@bp.route('/<int:user_id>/posts', methods=['GET'])
+@cached_response(user_posts_cache_key)
+def get_user_posts(user_id):
+    """사용자별 게시글 목록 조회 API (cursor 기반 페이지네이션, 전체 게시글 수 포함)"""
+    user = db.session.query(User.id, User.username).filter(User.id == user_id).first()
+    if user is None:
+        return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"message": "잘못된 페이지네이션 파라미터입니다."}), 400
+
+    # (user_id, created_at, id) 인덱스를 타도록 최신순으로 정렬하고, 다음 페이지 확인을 위해 limit + 1개를 가져옵니다.
+    posts = post_repository.list_user_post_summaries(user_id, limit=limit + 1, after=after)
+    post_count = cached_user_post_count(user_id, lambda: post_repository.count_user_posts(user_id))
+
+    # 이전 글이 삭제되면 현재 페이지는 그대로여도 게시글 수가 바뀌므로 ETag 에 함께 반영합니다.
+    # 같은 이유로 최근 수정 시각만으로는 삭제를 알 수 없으므로 Last-Modified 는 붙이지 않습니다. (게시글 목록과 같음)
+    # 닉네임은 updated_at 을 바꾸지 않고 바뀌므로 작성자 정보도 ETag 에 넣습니다.
+    etag = f"{compute_etag(((post.id, post.updated_at, post.author) for post in posts), variant=user.username)}-{post_count}"
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+
+    return conditional_response(etag, None, lambda: jsonify({
+        "user": {"userId": user.id, "username": user.username},
+        "postCount": post_count,
+        "posts": [{
+            "postId": post.id,
+            "title": post.title,
+            "author": post.author,
+            "createdAt": post.created_at
+        } for post in posts],
+        "nextCursor": next_cursor
+    }))
@@ -0,0 +1,274 @@
+# 이 파일은 공개 조회 API(게시글 목록/상세)의 응답 캐시를 정의하는 곳입니다.
+# 백엔드는 프로세스 내부 LRU+TTL 캐시(memory)와 Redis 호환 캐시(redis) 중에서 고를 수 있습니다.
+# memory 캐시는 gunicorn 워커마다 따로 있어서, 무효화는 쓰기 요청을 처리한 워커에만 적용됩니다.
+# 다른 워커는 CACHE_DEFAULT_TTL 동안 이전 응답을 돌려줄 수 있으므로, 워커가 여러 개라면 redis 를 사용하세요.
+# (그래서 TTL 이 긴 사용자별 게시글 수는 워커 간에 공유되는 캐시일 때만 저장합니다.)
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request, Response
+from app.utils.conditional import is_not_modified
+from app.utils.replica import reads_pinned_to_primary
+
+class LRUTTLCache:
+    """크기 제한(LRU)과 만료 시간(TTL)을 함께 갖는 스레드 안전한 인메모리 캐시"""
+
+    def __init__(self, max_entries=1024, default_ttl=30):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        """정수 값을 1 증가시킵니다. 세대(generation) 번호는 만료되지 않도록 TTL 없이 저장합니다."""
+        with self._lock:
+            value, _ = self._data.get(key, (0, None))
+            self._data[key] = (value + 1, None)
+            self._data.move_to_end(key)
+            return value + 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class RedisCache:
+    """Redis 호환 클라이언트(redis-py 인터페이스)를 감싸는 캐시 백엔드"""
+
+    def __init__(self, client, default_ttl=30, prefix='webserver:'):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        # redis 패키지는 redis 백엔드를 사용할 때만 필요하므로 여기서 import 합니다.
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis 를 사용하려면 'redis' 패키지를 설치해야 합니다.") from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, value, ex=ttl or None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key):
+        return int(self.client.incr(self.prefix + key))
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+class ResponseCache:
+    """
+    직렬화가 끝난 JSON 응답 본문을 캐시하여, 캐시 적중 시 DB 조회와 jsonify 를 모두 건너뜁니다.
+    목록 캐시는 세대(generation) 번호를 키에 포함시켜, 게시글이 바뀌면 번호만 올려 한 번에 무효화합니다.
+    """
+    LIST_GENERATION_KEY = 'posts:list:generation'
+    # 캐시 적중 시에도 조건부 요청(304)을 처리할 수 있도록 함께 저장하는 헤더
+    STORED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+    def __init__(self, backend):
+        self.backend = backend
+        # 모든 워커가 같은 저장소를 보는지 여부. 프로세스 내부 캐시는 다른 워커의 무효화를 알 수 없습니다.
+        self.shared = not isinstance(backend, LRUTTLCache)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def list_key(self, query_string):
+        generation = self.backend.get(self.LIST_GENERATION_KEY) or 0
+        return f"posts:list:{int(generation)}:{query_string}"
+
+    @staticmethod
+    def detail_key(post_id):
+        return f"posts:detail:{post_id}"
+
+    @staticmethod
+    def user_post_count_key(user_id):
+        return f"users:post_count:{user_id}"
+
+    def get(self, key):
+        raw = self.backend.get(key)
+        with self._stats_lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, response):
+        entry = {
+            "body": response.get_data(as_text=True),
+            "mimetype": response.mimetype,
+            "headers": {name: response.headers[name] for name in self.STORED_HEADERS if name in response.headers}
+        }
+        self.backend.set(key, json.dumps(entry, ensure_ascii=False))
+
+    def get_user_post_count(self, user_id):
+        raw = self.backend.get(self.user_post_count_key(user_id))
+        return None if raw is None else int(raw)
+
+    def set_user_post_count(self, user_id, count, ttl=None):
+        self.backend.set(self.user_post_count_key(user_id), str(count), ttl)
+
+    def invalidate_post(self, post_id=None, user_id=None):
+        """
+        게시글 생성/수정/삭제 후 호출합니다. 목록 캐시 전체와 해당 게시글의 상세 캐시를 무효화하고,
+        user_id 가 주어지면(게시글 수가 바뀌는 생성/삭제) 그 사용자의 게시글 수 캐시도 지웁니다.
+        """
+        self.backend.incr(self.LIST_GENERATION_KEY)
+        if post_id is not None:
+            self.backend.delete(self.detail_key(post_id))
+        if user_id is not None:
+            self.backend.delete(self.user_post_count_key(user_id))
+
+    def invalidate_posts(self, post_ids):
+        """작성자 닉네임이 바뀐 경우처럼 여러 게시글의 응답이 한꺼번에 바뀌었을 때, 목록 캐시와 각 게시글의 상세 캐시를 무효화합니다."""
+        self.backend.incr(self.LIST_GENERATION_KEY)
+        for post_id in post_ids:
+            self.backend.delete(self.detail_key(post_id))
+
+    def metric_samples(self):
+        """/metrics 에 노출할 (이름, 값) 목록"""
+        return [('response_cache_hits_total', self.hits), ('response_cache_misses_total', self.misses)]
+
+    def stats(self):
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "shared": self.shared,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / total, 4) if total else 0.0
+            }
+
+def init_cache(app):
+    """app.config 의 CACHE_* 설정에 따라 응답 캐시를 생성하여 app.extensions 에 등록합니다."""
+    backend_name = app.config.get('CACHE_BACKEND', 'memory')
+    ttl = app.config.get('CACHE_DEFAULT_TTL', 30)
+
+    if backend_name == 'none':
+        return None
+    if backend_name == 'redis':
+        backend = RedisCache.from_url(app.config['CACHE_REDIS_URL'], default_ttl=ttl)
+    elif backend_name == 'memory':
+        backend = LRUTTLCache(max_entries=app.config.get('CACHE_MAX_ENTRIES', 1024), default_ttl=ttl)
+    else:
+        raise ValueError(f"지원하지 않는 CACHE_BACKEND 입니다: {backend_name}")
+
+    cache = ResponseCache(backend)
+    app.extensions['response_cache'] = cache
+    return cache
+
+def get_response_cache():
+    """현재 앱에 등록된 응답 캐시를 반환합니다. 캐시가 꺼져 있으면 None 을 반환합니다."""
+    return current_app.extensions.get('response_cache')
+
+def invalidate_post_cache(post_id=None, user_id=None):
+    """게시글이 변경되었을 때 라우트에서 호출하는 무효화 헬퍼"""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate_post(post_id, user_id)
+
+def invalidate_posts_cache(post_ids):
+    """여러 게시글의 응답이 한꺼번에 바뀌었을 때(작성자 닉네임 변경) 호출하는 무효화 헬퍼"""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate_posts(post_ids)
+
+def cached_user_post_count(user_id, compute):
+    """
+    사용자별 게시글 수를 캐시에서 읽고, 없으면 compute() 로 세어 저장합니다.
+    게시글 생성/삭제 시 invalidate_post_cache(user_id=...) 로 지워지며, 놓친 경우에도 USER_POST_COUNT_TTL 이 지나면 다시 셉니다.
+    워커 간에 공유되지 않는 캐시(memory)에서는 다른 워커의 무효화를 받지 못해 TTL 동안 틀린 값을 보여 줄 수 있으므로 저장하지 않습니다.
+    """
+    cache = get_response_cache()
+    if cache is None or not cache.shared:
+        return compute()
+    count = cache.get_user_post_count(user_id)
+    if count is None:
+        count = compute()
+        cache.set_user_post_count(user_id, count, current_app.config.get('USER_POST_COUNT_TTL', 300))
+    return count
+
+def cached_response(key_func):
+    """
+    GET 응답을 캐시하는 데코레이터.
+    key_func(cache, *args, **kwargs) 로 캐시 키를 만들고, 200 응답만 저장합니다.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            cache = get_response_cache()
+            # 방금 쓰기를 한 클라이언트는 캐시에 남은 이전 응답 대신 primary 에서 새로 읽습니다.
+            if cache is None or reads_pinned_to_primary():
+                return f(*args, **kwargs)
+
+            key = key_func(cache, *args, **kwargs)
+            entry = cache.get(key)
+            if entry is not None:
+                response = Response(entry['body'], status=200, mimetype=entry['mimetype'], headers=entry['headers'])
+                etag, _ = response.get_etag()
+                if is_not_modified(etag, response.last_modified):
+                    response = Response(status=304, headers=entry['headers'])
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                cache.set(key, response)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated
+    return decorator
+
+def list_cache_key(cache):
+    """쿼리 파라미터 순서와 무관하게 같은 목록 요청이 같은 키를 갖도록 정규화합니다."""
+    query_string = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    return cache.list_key(query_string)
+
+def user_posts_cache_key(cache, user_id):
+    """사용자별 목록도 게시글 목록과 같은 세대 번호를 사용하여, 게시글이 바뀌면 함께 무효화됩니다."""
+    query_string = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    return cache.list_key(f"user={user_id}&{query_string}")
+
+def detail_cache_key(cache, post_id):
+    return cache.detail_key(post_id)
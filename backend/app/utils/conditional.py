@@ -0,0 +1,57 @@
+# 이 파일은 ETag / Last-Modified 기반 조건부 요청(304 Not Modified) 처리를 정의하는 곳입니다.
+import hashlib
+from datetime import timezone
+from flask import current_app, request, Response
+
+def compute_etag(rows, variant=None):
+    """
+    (id, updated_at[, 작성자 닉네임 등]) 목록으로 ETag 를 계산합니다.
+    게시글이 추가/삭제되면 id 집합이, 수정되면 updated_at 이 바뀌므로 ETag 도 함께 바뀝니다.
+    닉네임 변경은 updated_at 을 바꾸지 않으므로(sync_author_username), 응답에 작성자가 들어가면 세 번째 값으로 함께 넘깁니다.
+    같은 행으로 다른 본문을 만드는 경우(excerpt 길이 등)는 variant 를 넘겨 ETag 를 구분합니다.
+    """
+    digest = hashlib.sha1()
+    if variant is not None:
+        digest.update(f"{variant}|".encode('utf-8'))
+    for row_id, updated_at, *extra in rows:
+        digest.update(f"{row_id}:{updated_at.isoformat() if updated_at else ''}".encode('ascii'))
+        for value in extra:
+            digest.update(f":{value!r}".encode('utf-8'))
+        digest.update(b';')
+    return digest.hexdigest()
+
+def latest_modified(timestamps):
+    """Last-Modified 헤더에 사용할 가장 최근 수정 시각을 반환합니다. (시간대 정보가 없으면 UTC 로 간주합니다.)"""
+    latest = max((ts for ts in timestamps if ts is not None), default=None)
+    if latest is not None and latest.tzinfo is None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    return latest
+
+def is_not_modified(etag, last_modified):
+    """요청의 If-None-Match / If-Modified-Since 가 현재 리소스와 일치하는지 확인합니다."""
+    # RFC 9110: If-None-Match 가 있으면 If-Modified-Since 는 무시합니다.
+    if request.if_none_match:
+        return etag is not None and request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def apply_validators(response, etag, last_modified):
+    """응답에 ETag, Last-Modified, Cache-Control 헤더를 설정합니다."""
+    if etag is not None:
+        response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = current_app.config.get('POSTS_CACHE_CONTROL', 'public, no-cache')
+    return response
+
+def conditional_response(etag, last_modified, build_body, status=200):
+    """
+    검증자가 일치하면 본문을 만들지 않고 304 를 반환하고,
+    그렇지 않으면 build_body() 로 본문을 만들어 검증자 헤더와 함께 반환합니다.
+    """
+    if is_not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = current_app.make_response((build_body(), status))
+    return apply_validators(response, etag, last_modified)
@@ -0,0 +1,81 @@
+# 이 파일은 DB 커넥션 풀의 사용 현황(체크아웃 수, 오버플로, 대기 시간)을 측정하는 곳입니다.
+# gunicorn 워커 수와 풀 크기를 Postgres max_connections 에 맞춰 조정할 때 근거로 사용합니다.
+import threading
+import time
+from sqlalchemy.pool import QueuePool
+
+class TimedQueuePool(QueuePool):
+    """커넥션을 얻기까지 기다린 시간과 타임아웃 횟수를 함께 기록하는 QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "poolSize": self.size(),
+                "checkedOut": self.checkedout(),
+                "checkedIn": self.checkedin(),
+                "overflow": self.overflow(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avgWaitMs": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "maxWaitMs": round(self.max_wait * 1000, 3)
+            }
+
+def configure_engine_options(app):
+    """
+    Postgres 를 사용할 때, 별도의 풀이 지정되지 않았다면 통계를 기록하는 TimedQueuePool 을 사용하도록 합니다.
+    엔진 옵션을 따로 지정하지 않은 설정(개발 등)에서도 새 커넥션을 맺을 때 DB_CONNECT_TIMEOUT 초까지만 기다리게 합니다.
+    """
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI') or ''
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if uri.startswith('postgresql') and 'poolclass' not in options:
+        options['poolclass'] = TimedQueuePool
+    if uri.startswith('postgresql'):
+        connect_args = dict(options.get('connect_args') or {})
+        connect_args.setdefault('connect_timeout', app.config.get('DB_CONNECT_TIMEOUT', 3))
+        options['connect_args'] = connect_args
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+def pool_stats(engine):
+    """엔진 풀의 현재 상태를 반환합니다. TimedQueuePool 이 아니면 SQLAlchemy 기본 상태 문자열만 반환합니다."""
+    pool = engine.pool
+    if isinstance(pool, TimedQueuePool):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
+
+def pool_metric_samples(engine):
+    """/metrics 에 노출할 커넥션 풀 (이름, 값) 목록"""
+    pool = engine.pool
+    if not isinstance(pool, TimedQueuePool):
+        return []
+    stats = pool.stats()
+    return [
+        ('db_pool_size', stats['poolSize']),
+        ('db_pool_checked_out', stats['checkedOut']),
+        ('db_pool_overflow', stats['overflow']),
+        ('db_pool_checkouts_total', stats['checkouts']),
+        ('db_pool_timeouts_total', stats['timeouts']),
+        ('db_pool_wait_seconds_max', stats['maxWaitMs'] / 1000),
+    ]
@@ -1,7 +1,102 @@
+from collections import namedtuple
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 import jwt
+from app import db
 from app.models import User
+from app.utils.cache import LRUTTLCache
+
+# 라우트에 전달되는 인증된 사용자 정보. 라우트는 current_user.id / current_user.username 만 사용하므로
+# User ORM 객체 대신 이 가벼운 객체를 캐시해 두고 재사용합니다.
+Principal = namedtuple('Principal', ['id', 'username'])
+
+# 삭제된 사용자를 표시하는 값. 캐시에 남아 있는 동안 해당 사용자의 토큰은 DB 조회 없이 거부됩니다.
+# 이 표시는 삭제를 처리한 워커의 캐시에만 남으므로, 다른 워커는 캐시된 Principal 이 만료될 때까지
+# (최대 AUTH_PRINCIPAL_CACHE_TTL 초, JWT_EMBED_USERNAME 이면 토큰 만료 시각까지) 삭제된 사용자의 토큰을 받아들입니다.
+# 조회 요청은 문제가 없고, 게시글 작성처럼 사용자 행이 필요한 쓰기는 라우트에서 사용자가 남아 있는지 확인한 뒤
+# 없으면 mark_principal_deleted 로 이 워커의 캐시에도 표시하고 401 을 반환합니다.
+_DELETED = object()
+
+def init_principal_cache(app):
+    """토큰 검증 후 조회한 사용자 정보를 user id 기준으로 캐시하는 LRU+TTL 캐시를 등록합니다."""
+    ttl = app.config.get('AUTH_PRINCIPAL_CACHE_TTL', 60)
+    if not ttl:
+        return None
+    cache = LRUTTLCache(max_entries=app.config.get('AUTH_PRINCIPAL_CACHE_SIZE', 4096), default_ttl=ttl)
+    app.extensions['principal_cache'] = cache
+    return cache
+
+def _get_principal_cache():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('principal_cache')
+
+def _load_principal(payload):
+    """토큰 페이로드로부터 Principal 을 얻습니다. 사용자가 없거나 삭제되었으면 None 을 반환합니다."""
+    user_id = payload['userId']
+    cache = _get_principal_cache()
+
+    if cache is not None:
+        cached = cache.get(user_id)
+        if cached is _DELETED:
+            return None
+        if cached is not None:
+            return cached
+
+    # JWT_EMBED_USERNAME 이 켜져 있으면 토큰에 담긴 username 을 믿고 DB 조회를 생략합니다.
+    # (이 경우 다른 워커 프로세스에서 삭제된 사용자의 토큰은 만료 시각까지 유효합니다.)
+    if current_app.config.get('JWT_EMBED_USERNAME') and 'username' in payload:
+        principal = Principal(user_id, payload['username'])
+    else:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        principal = Principal(user.id, user.username)
+
+    if cache is not None:
+        cache.set(user_id, principal)
+    return principal
+
+def mark_principal_deleted(user_id):
+    """쓰기 중에 사용자가 이미 삭제된 것을 확인했을 때, 이 워커의 캐시에도 토큰 수명 동안 거부 표시를 남깁니다."""
+    cache = _get_principal_cache()
+    if cache is not None:
+        cache.set(user_id, _DELETED, ttl=int(current_app.config.get('JWT_ACCESS_TOKEN_HOURS', 1) * 3600))
+
+@event.listens_for(User, 'after_delete')
+def _remember_deleted_user(mapper, connection, target):
+    # 커밋 전에 롤백될 수 있으므로 세션에 기록만 해 두고, 실제 무효화는 커밋 이후에 합니다.
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('deleted_user_ids', set()).add(target.id)
+
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_update')
+def _remember_updated_user(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('updated_user_ids', set()).add(target.id)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_principals(session):
+    deleted = session.info.pop('deleted_user_ids', set())
+    updated = session.info.pop('updated_user_ids', set())
+    cache = _get_principal_cache()
+    if cache is None:
+        return
+    # 삭제된 사용자는 토큰 수명 동안 거부 표시를 남기고, 수정된 사용자는 다음 요청에서 다시 읽도록 제거합니다.
+    tombstone_ttl = int(current_app.config.get('JWT_ACCESS_TOKEN_HOURS', 1) * 3600)
+    for user_id in deleted:
+        cache.set(user_id, _DELETED, ttl=tombstone_ttl)
+    for user_id in updated - deleted:
+        cache.delete(user_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_user_changes(session):
+    session.info.pop('deleted_user_ids', None)
+    session.info.pop('updated_user_ids', None)
 
 def token_required(f):
     """JWT 토큰을 검증하는 데코레이터"""
@@ -25,8 +120,8 @@ def token_required(f):
             secret_key = current_app.config['JWT_SECRET_KEY']
             payload = jwt.decode(token, secret_key, algorithms=['HS256'])
             
-            # 3. 토큰 페이로드에서 사용자 ID를 가져와 DB에서 사용자 조회
-            current_user = User.query.get(payload['userId'])
+            # 3. 토큰 페이로드의 사용자 ID로 사용자 정보를 가져옵니다. (캐시에 있으면 DB를 조회하지 않습니다.)
+            current_user = _load_principal(payload)
             if current_user is None:
                 return jsonify({'message': '유효하지 않은 토큰입니다.'}), 401
 
@@ -37,4 +132,4 @@ def token_required(f):
 
         # 4. 원래 호출하려던 함수(API 로직)를 실행. current_user 객체를 전달.
         return f(current_user, *args, **kwargs)
-    return decorated
\ No newline at end of file
+    return decorated
@@ -0,0 +1,113 @@
+# 이 파일은 liveness(/healthz)와 readiness(/readyz) 확인 엔드포인트를 정의하는 곳입니다.
+# - /healthz : 프로세스가 요청을 처리할 수 있는지만 확인합니다. (I/O 없음)
+# - /readyz  : 커넥션 풀 포화 여부, 풀을 통한 DB ping(짧은 statement_timeout), 마이그레이션 head 일치 여부를 확인합니다.
+#              외부 상태 확인이 자주 호출되어도 DB 부하가 늘지 않도록 결과를 HEALTH_CACHE_SECONDS 동안 재사용합니다.
+import os
+import threading
+import time
+from flask import jsonify
+from sqlalchemy import text
+from app.utils.db_pool import TimedQueuePool
+
+class ReadinessChecker:
+    """readiness 확인 결과를 짧은 시간 캐시하며, 동시에 들어온 확인 요청은 한 번만 DB 를 조회합니다."""
+
+    def __init__(self, app, db):
+        self.app = app
+        self.db = db
+        self.cache_seconds = app.config.get('HEALTH_CACHE_SECONDS', 2.0)
+        self.db_timeout_ms = app.config.get('HEALTH_DB_TIMEOUT_MS', 500)
+        self.pool_saturation = app.config.get('HEALTH_POOL_SATURATION', 0.9)
+        self._expected_heads = None
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def expected_heads(self):
+        """migrations 디렉토리의 head revision 목록 (코드가 바뀌지 않으므로 한 번만 읽습니다.)"""
+        if self._expected_heads is None:
+            from alembic.script import ScriptDirectory
+            directory = self.app.extensions['migrate'].directory
+            if not os.path.isabs(directory):
+                # 'migrations' 는 backend 디렉토리 기준 경로이므로, 실행 위치와 관계없이 찾을 수 있게 합니다.
+                directory = os.path.join(os.path.dirname(self.app.root_path), directory)
+            self._expected_heads = sorted(ScriptDirectory(directory).get_heads())
+        return self._expected_heads
+
+    def _check_pool(self):
+        pool = self.db.engine.pool
+        if not isinstance(pool, TimedQueuePool):
+            return {"ok": True, "pool": type(pool).__name__}
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        saturation = checked_out / capacity if capacity else 0.0
+        return {"ok": saturation < self.pool_saturation, "checkedOut": checked_out,
+                "capacity": capacity, "saturation": round(saturation, 3)}
+
+    def _check_database(self):
+        """
+        DB ping 과 마이그레이션 버전을 커넥션 하나로 확인합니다.
+        풀에 커넥션이 없어 새로 맺는 경우는 엔진의 connect_timeout(DB_CONNECT_TIMEOUT)까지만 기다리고,
+        풀이 가득 찬 경우는 run_checks 에서 미리 생략하므로 pool_timeout 만큼 기다리지 않습니다.
+        """
+        started = time.perf_counter()
+        with self.db.engine.connect() as conn:
+            if conn.dialect.name == 'postgresql':
+                # 트랜잭션 안에서만 적용되므로 풀로 돌아간 커넥션에는 영향이 없습니다.
+                conn.execute(text(f"SET LOCAL statement_timeout = {int(self.db_timeout_ms)}"))
+            conn.execute(text("SELECT 1"))
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
+            current_heads = sorted(row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version")))
+            conn.rollback()
+
+        expected_heads = self.expected_heads()
+        return (
+            {"ok": True, "latencyMs": latency_ms},
+            {"ok": current_heads == expected_heads, "current": current_heads, "expected": expected_heads}
+        )
+
+    def run_checks(self):
+        checks = {"pool": self._check_pool()}
+        if not checks["pool"]["ok"]:
+            # 풀이 가득 찬 상태에서 ping 까지 커넥션을 기다리면 확인 요청이 pool_timeout 만큼 묶이므로 생략합니다.
+            checks["database"] = {"ok": False, "error": "skipped: pool saturated"}
+            checks["migrations"] = {"ok": False, "error": "skipped: pool saturated"}
+        else:
+            try:
+                checks["database"], checks["migrations"] = self._check_database()
+            except Exception as e:
+                checks["database"] = {"ok": False, "error": f"{type(e).__name__}: {e}".splitlines()[0]}
+                checks["migrations"] = {"ok": False, "error": "skipped: database unavailable"}
+        return {"status": "ok" if all(c["ok"] for c in checks.values()) else "unavailable", "checks": checks}
+
+    def check(self):
+        """캐시된 결과가 유효하면 그대로, 아니면 새로 확인하여 (결과, 캐시 사용 여부) 를 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            if self._result is not None and now - self._checked_at < self.cache_seconds:
+                return self._result, True
+            self._result = self.run_checks()
+            self._checked_at = time.monotonic()
+            return self._result, False
+
+def init_health(app, db):
+    """/healthz 와 /readyz 를 등록합니다. 요청 측정 대상에서는 REQUEST_METRICS_EXCLUDED_PATHS 로 제외합니다."""
+    checker = ReadinessChecker(app, db)
+    app.extensions['readiness_checker'] = checker
+
+    @app.route('/healthz', methods=['GET'])
+    def healthz():
+        """liveness 확인 API"""
+        response = jsonify({"status": "ok"})
+        response.headers['Cache-Control'] = 'no-store'
+        return response, 200
+
+    @app.route('/readyz', methods=['GET'])
+    def readyz():
+        """readiness 확인 API. 하나라도 실패하면 503 으로 응답합니다."""
+        result, cached = checker.check()
+        response = jsonify(dict(result, cached=cached))
+        response.headers['Cache-Control'] = 'no-store'
+        return response, 200 if result["status"] == "ok" else 503
+
+    return checker
@@ -0,0 +1,214 @@
+# 이 파일은 요청별 처리 시간과 SQL 사용량을 측정하는 미들웨어와 /metrics 엔드포인트를 정의하는 곳입니다.
+# 측정 항목: 전체 처리 시간(wall), DB 시간, 쿼리 수, JSON 직렬화 시간
+#   - 응답 헤더 Server-Timing 으로 브라우저 개발자 도구에서 바로 볼 수 있고,
+#   - Nginx json_analytics 로그와 같은 이름(request_time 등, 초 단위)의 구조화 로그로 남기며,
+#   - Prometheus 형식의 라우트별 히스토그램으로 /metrics 에 노출합니다. (워커 프로세스별 값)
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request, has_request_context, Response
+from sqlalchemy import event
+from app.utils.internal import internal_only
+from app.utils.json_provider import FastJSONProvider
+
+logger = logging.getLogger('app.metrics')
+
+# 요청 처리 시간 히스토그램 구간(초)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class TimedJSONProvider(FastJSONProvider):
+    """jsonify 의 직렬화 시간을 요청 단위로 누적하는 JSON provider"""
+
+    def _timed(self, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if has_request_context() and 'metrics_started' in g:
+                g.serialize_time += time.perf_counter() - started
+
+    def encode(self, obj):
+        return self._timed(super().encode, obj)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return self._timed(super().dumps, obj, **kwargs)
+        # 인자가 없으면 encode 를 거치므로 거기서 측정합니다.
+        return super().dumps(obj)
+
+class Histogram:
+    """라벨 조합별 누적 히스토그램 (Prometheus 텍스트 형식으로 출력)"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {count}')
+                lines.append(f'{self.name}_sum{{{label_text}}} {total:.6f}')
+                lines.append(f'{self.name}_count{{{label_text}}} {count}')
+        return lines
+
+class Counter:
+    """라벨 조합별 단조 증가 카운터"""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f'{self.name}{{{label_text}}} {value}')
+        return lines
+
+class RequestMetrics:
+    """요청 측정값을 모아 두는 프로세스 단위 레지스트리"""
+
+    def __init__(self):
+        self.requests = Counter('http_requests_total', 'HTTP requests by route and status.')
+        self.duration = Histogram('http_request_duration_seconds', 'Wall time per request.', DURATION_BUCKETS)
+        self.db_duration = Histogram('http_request_db_seconds', 'DB time per request.', DURATION_BUCKETS)
+        self.serialize_duration = Histogram('http_request_serialize_seconds', 'JSON serialization time per request.', DURATION_BUCKETS)
+        self.queries = Counter('http_request_db_queries_total', 'SQL statements executed, by route.')
+        # /metrics 출력 시 추가로 붙일 수치(캐시 적중률, 커넥션 풀 등)를 돌려주는 함수 목록
+        self.collectors = []
+
+    def render(self):
+        lines = []
+        for metric in (self.requests, self.duration, self.db_duration, self.serialize_duration, self.queries):
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for name, value in collector():
+                lines.append(f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'metrics_started' in g:
+        conn.info.setdefault('metrics_query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'metrics_started' in g:
+        started_stack = conn.info.get('metrics_query_started')
+        if started_stack:
+            g.db_time += time.perf_counter() - started_stack.pop()
+            g.query_count += 1
+
+def _route_label():
+    # 실제 경로(/posts/123) 대신 URL 규칙(/posts/<int:post_id>)을 라벨로 사용해 시계열 수를 제한합니다.
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+def init_instrumentation(app, db):
+    """REQUEST_METRICS_ENABLED 가 켜져 있으면 측정 훅과 /metrics 엔드포인트를 등록합니다."""
+    if not app.config.get('REQUEST_METRICS_ENABLED', True):
+        return None
+
+    metrics = RequestMetrics()
+    app.extensions['request_metrics'] = metrics
+    # gunicorn 에서도 구조화 로그가 stdout 으로 한 줄씩 출력되도록 전용 핸들러를 둡니다.
+    log_enabled = app.config.get('REQUEST_METRICS_LOG', True)
+    if log_enabled and not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    excluded_paths = set(app.config.get('REQUEST_METRICS_EXCLUDED_PATHS', ('/metrics',)))
+
+    # jsonify 직렬화 시간을 측정할 수 있도록 JSON provider 를 교체합니다. (기존 설정은 유지)
+    timed_json = TimedJSONProvider(app, getattr(app.json, 'backend', 'auto'))
+    timed_json.ensure_ascii = app.json.ensure_ascii
+    app.json = timed_json
+
+    # 복제본 등 SQLALCHEMY_BINDS 의 엔진에서 실행한 쿼리도 함께 측정합니다.
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_request_metrics():
+        if request.path in excluded_paths:
+            return
+        g.metrics_started = time.perf_counter()
+        g.db_time = 0.0
+        g.serialize_time = 0.0
+        g.query_count = 0
+
+    @app.after_request
+    def record_request_metrics(response):
+        if 'metrics_started' not in g:
+            return response
+        wall = time.perf_counter() - g.metrics_started
+        route = _route_label()
+        labels = (('method', request.method), ('route', route))
+
+        metrics.requests.inc(labels + (('status', str(response.status_code)),))
+        metrics.duration.observe(labels, wall)
+        metrics.db_duration.observe(labels, g.db_time)
+        metrics.serialize_duration.observe(labels, g.serialize_time)
+        metrics.queries.inc(labels, g.query_count)
+
+        app_time = max(wall - g.db_time - g.serialize_time, 0.0)
+        response.headers['Server-Timing'] = ', '.join([
+            f'db;dur={g.db_time * 1000:.2f};desc="{g.query_count} queries"',
+            f'ser;dur={g.serialize_time * 1000:.2f}',
+            f'app;dur={app_time * 1000:.2f}',
+            f'total;dur={wall * 1000:.2f}',
+        ])
+
+        # Nginx json_analytics 와 같은 키 이름/단위(초, 소수점 3자리 문자열)를 사용하여 두 로그를 맞춰 볼 수 있게 합니다.
+        # Nginx 의 upstream_response_time 은 이 request_time 에 네트워크 시간이 더해진 값입니다.
+        if not log_enabled:
+            return response
+        logger.info(json.dumps({
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "request_method": request.method,
+            "request_uri": request.full_path if request.query_string else request.path,
+            "route": route,
+            "status": str(response.status_code),
+            "request_time": f"{wall:.3f}",
+            "db_time": f"{g.db_time:.3f}",
+            "db_queries": g.query_count,
+            "serialize_time": f"{g.serialize_time:.3f}",
+            "x_forwarded_for": request.headers.get('X-Forwarded-For', ''),
+        }, ensure_ascii=False))
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    @internal_only
+    def prometheus_metrics():
+        """Prometheus 형식의 요청 측정값 (워커 프로세스별 값입니다. 내부 요청만 허용합니다.)"""
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    return metrics
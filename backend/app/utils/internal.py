@@ -0,0 +1,37 @@
+# 이 파일은 운영용 엔드포인트(/metrics, /cache/stats, /db/pool, /db/replicas)를 내부에서만 호출할 수 있도록 제한하는 곳입니다.
+# 다음 중 하나를 만족하는 요청만 허용합니다.
+#   - X-Internal-Token 헤더가 INTERNAL_API_TOKEN 과 같은 요청
+#   - Nginx 를 거치지 않은(X-Forwarded-For 가 없는) 요청이면서 접속 주소가 INTERNAL_NETWORKS 에 속하는 요청
+#     (같은 docker 네트워크의 Prometheus 등. Nginx 를 거친 외부 요청은 Nginx 의 사설 주소로 접속하므로 주소만으로는 구분할 수 없습니다.)
+import hmac
+import ipaddress
+from functools import wraps
+from flask import current_app, jsonify, request
+
+INTERNAL_TOKEN_HEADER = 'X-Internal-Token'
+
+def parse_networks(value):
+    """쉼표로 구분한 CIDR 목록을 ip_network 목록으로 바꿉니다."""
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in value.split(',') if item.strip()]
+
+def is_internal_request():
+    token = current_app.config.get('INTERNAL_API_TOKEN')
+    supplied = request.headers.get(INTERNAL_TOKEN_HEADER)
+    if token and supplied and hmac.compare_digest(supplied.encode(), token.encode()):
+        return True
+    if 'X-Forwarded-For' in request.headers or not request.remote_addr:
+        return False
+    try:
+        address = ipaddress.ip_address(request.remote_addr)
+    except ValueError:
+        return False
+    return any(address in network for network in parse_networks(current_app.config.get('INTERNAL_NETWORKS', '')))
+
+def internal_only(f):
+    """내부 요청이 아니면 404 를 반환하는 데코레이터. (엔드포인트가 있다는 것도 드러내지 않습니다.)"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not is_internal_request():
+            return jsonify({"message": "요청한 리소스를 찾을 수 없습니다."}), 404
+        return f(*args, **kwargs)
+    return decorated
@@ -0,0 +1,144 @@
+# 이 파일은 API 응답의 JSON 직렬화(app.json)와 큰 응답 본문의 압축을 정의하는 곳입니다.
+# - JSON_BACKEND: 'auto'(orjson -> msgspec -> 표준 json 순으로 설치된 것), 'orjson', 'msgspec', 'stdlib'
+#   라우트는 datetime 을 .isoformat() 하지 않고 그대로 넘기면 인코더가 ISO 8601 문자열로 바꿉니다.
+#   (orjson/표준 json 은 isoformat() 과 같은 문자열, msgspec 은 UTC 를 '+00:00' 대신 'Z' 로 씁니다.)
+# - RESPONSE_COMPRESSION: 'auto'(br 을 지원하면 br, 아니면 gzip), 'gzip', 'br', 'off'
+#   RESPONSE_COMPRESSION_MIN_SIZE 바이트 이상인 JSON 응답만 압축합니다.
+import gzip
+import json
+from datetime import date, datetime
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_BACKENDS = ('orjson', 'msgspec', 'stdlib')
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson')
+
+def resolve_json_backend(name):
+    """설정 값을 실제로 사용할 수 있는 인코더 이름으로 바꿉니다. 지정한 패키지가 없으면 RuntimeError 를 발생시킵니다."""
+    if name == 'auto':
+        return 'orjson' if orjson else ('msgspec' if msgspec else 'stdlib')
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"지원하지 않는 JSON_BACKEND 입니다: {name}")
+    if (name == 'orjson' and orjson is None) or (name == 'msgspec' and msgspec is None):
+        raise RuntimeError(f"JSON_BACKEND={name} 를 사용하려면 '{name}' 패키지를 설치해야 합니다.")
+    return name
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    jsonify/app.json 이 사용하는 JSON provider.
+    응답 본문은 str 을 거치지 않고 인코더가 만든 UTF-8 바이트로 바로 만듭니다.
+    sort_keys, ensure_ascii 등 Flask 의 설정 속성은 그대로 따르며, 들여쓰기가 필요한 경우(DEBUG 등)만 기본 provider 를 사용합니다.
+    """
+
+    def __init__(self, app, backend='auto'):
+        super().__init__(app)
+        self.backend = resolve_json_backend(backend)
+        self._msgspec_encoders = {}
+
+    def _fallback(self, obj):
+        """인코더가 모르는 타입의 변환. datetime/date 는 Flask 기본값(HTTP 날짜) 대신 ISO 8601 로 씁니다."""
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return self.default(obj)
+
+    def encode(self, obj):
+        """obj 를 UTF-8 JSON 바이트로 직렬화합니다."""
+        if self.backend == 'orjson' and not self.ensure_ascii:
+            option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+            return orjson.dumps(obj, default=self._fallback, option=option)
+        if self.backend == 'msgspec' and not self.ensure_ascii:
+            encoder = self._msgspec_encoders.get(self.sort_keys)
+            if encoder is None:
+                encoder = self._msgspec_encoders[self.sort_keys] = msgspec.json.Encoder(
+                    enc_hook=self._fallback, order='sorted' if self.sort_keys else None
+                )
+            return encoder.encode(obj)
+        # orjson/msgspec 은 항상 UTF-8 로 쓰므로 ensure_ascii 가 켜져 있으면 표준 json 을 사용합니다.
+        return json.dumps(
+            obj, default=self._fallback, ensure_ascii=self.ensure_ascii,
+            sort_keys=self.sort_keys, separators=(',', ':')
+        ).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault('default', self._fallback)
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encode(obj) + b'\n', mimetype=self.mimetype)
+
+def choose_encoding(accept_encoding, mode):
+    """Accept-Encoding 과 설정에 따라 사용할 압축 방식('br'/'gzip')을 고릅니다. 압축하지 않으면 None 을 반환합니다."""
+    if mode == 'off':
+        return None
+    if mode in ('auto', 'br') and brotli is not None and accept_encoding['br']:
+        return 'br'
+    if mode in ('auto', 'gzip') and accept_encoding['gzip']:
+        return 'gzip'
+    return None
+
+def compress_body(data, encoding, gzip_level=6, brotli_quality=4):
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 으로 같은 본문은 항상 같은 바이트가 되게 합니다.
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+def init_json(app):
+    """JSON_BACKEND 설정에 따른 FastJSONProvider 로 app.json 을 교체합니다."""
+    provider = FastJSONProvider(app, app.config.get('JSON_BACKEND', 'auto'))
+    # JSON 응답에서 한글이 유니코드 이스케이프되지 않도록 설정합니다.
+    provider.ensure_ascii = False
+    app.json = provider
+    return provider
+
+def init_compression(app):
+    """
+    큰 JSON 응답을 gzip/brotli 로 압축하는 after_request 훅을 등록합니다.
+    요청 측정(Server-Timing)에 압축 시간이 포함되도록 init_instrumentation 다음에 호출합니다.
+    """
+    mode = app.config.get('RESPONSE_COMPRESSION', 'off')
+    if mode == 'off':
+        return
+    if mode == 'br' and brotli is None:
+        raise RuntimeError("RESPONSE_COMPRESSION=br 을 사용하려면 'brotli' 패키지를 설치해야 합니다.")
+    min_size = app.config.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+    gzip_level = app.config.get('RESPONSE_COMPRESSION_GZIP_LEVEL', 6)
+    brotli_quality = app.config.get('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4)
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings, mode)
+        data = response.get_data()
+        if encoding is None or len(data) < min_size:
+            return response
+
+        response.set_data(compress_body(data, encoding, gzip_level, brotli_quality))
+        response.headers['Content-Encoding'] = encoding
+        # 압축된 표현은 바이트가 다르므로 Nginx 의 gzip 처럼 강한 ETag 를 약한 ETag 로 바꿉니다.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
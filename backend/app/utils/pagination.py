@@ -0,0 +1,44 @@
+# 이 파일은 keyset(cursor) 페이지네이션에 필요한 공통 함수를 정의하는 곳입니다.
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(created_at, row_id):
+    """(created_at, id) 쌍을 클라이언트에 전달할 불투명(opaque) 커서 문자열로 인코딩합니다."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """커서 문자열을 (created_at, id) 쌍으로 디코딩합니다. 형식이 잘못되면 ValueError를 발생시킵니다."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """쿼리 파라미터로 전달된 limit 값을 1 ~ maximum 범위의 정수로 변환합니다."""
+    if value is None or value == '':
+        return default
+    limit = int(value)
+    if limit < 1:
+        raise ValueError("limit은 1 이상이어야 합니다.")
+    return min(limit, maximum)
+
+def encode_search_cursor(mode, rank, row_id):
+    """검색 결과의 (검색 방식, 점수, id) 를 커서 문자열로 인코딩합니다. 다음 페이지도 같은 방식으로 검색하기 위해 방식을 함께 담습니다."""
+    raw = json.dumps([mode, float(rank), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_search_cursor(cursor):
+    """검색 커서를 (mode, rank, id) 로 디코딩합니다. 형식이 잘못되면 ValueError를 발생시킵니다."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        mode, rank, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return str(mode), float(rank), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
@@ -0,0 +1,101 @@
+# 이 파일은 비밀번호 해시 생성/검증을 전용 프로세스 풀에서 실행하는 곳입니다.
+# pbkdf2 해시는 CPU 를 오래 점유하므로, 요청 처리 워커에서 직접 계산하면 로그인 요청이 몰릴 때
+# 게시글 API 까지 함께 느려집니다. 풀의 크기와 대기열을 제한하고, 가득 차면 503 으로 응답하게 합니다.
+# 요청 워커는 결과를 future.result() 로 기다리므로, sync 워커에서는 해시 중 그 워커가 여전히 멈춰 있습니다.
+# 다른 요청이 계속 처리되는 효과는 gthread/gevent 워커에서만 있으므로, PASSWORD_HASH_WORKERS='auto'(기본값)는
+# 그 두 워커에서만 풀을 켭니다. (config.default_password_hash_workers)
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+class HasherBusyError(Exception):
+    """해시 작업 대기열이 가득 찼을 때 발생합니다. 라우트는 503 으로 응답합니다."""
+
+def canonical_method(method):
+    """
+    werkzeug 해시 방식 문자열을 저장된 해시와 비교할 수 있도록 기본값을 채운 형태로 바꿉니다.
+    예) 'pbkdf2:sha256' -> 'pbkdf2:sha256:1000000'
+    """
+    name, *args = method.split(':')
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    if name == 'scrypt':
+        n, r, p = map(int, args) if args else (2 ** 15, 8, 1)
+        return f"scrypt:{n}:{r}:{p}"
+    return method
+
+class PasswordHasher:
+    """
+    비밀번호 해시 작업을 프로세스 풀에 넘기는 실행기.
+    workers 가 0 이면 풀 없이 현재 스레드에서 바로 계산합니다. (sync 워커/개발/테스트용)
+    """
+
+    def __init__(self, method, workers=0, queue_size=16, timeout=10):
+        self.method = canonical_method(method)
+        self.workers = workers
+        self.timeout = timeout
+        # 실행 중(workers) + 대기 중(queue_size) 작업 수를 넘으면 즉시 거절합니다.
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        # gunicorn 워커가 fork 된 이후에 풀을 만들도록 첫 사용 시점에 생성합니다.
+        # DB 커넥션 등을 물려받지 않도록 spawn 방식으로 자식 프로세스를 띄웁니다.
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                    atexit.register(self._executor.shutdown, wait=False, cancel_futures=True)
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusyError()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeoutError as e:
+            raise HasherBusyError() from e
+
+    def hash(self, password):
+        """설정된 방식(PASSWORD_HASH_METHOD)으로 비밀번호 해시를 만듭니다."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        """저장된 해시와 비밀번호가 일치하는지 확인합니다."""
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """저장된 해시의 방식/반복 횟수가 현재 설정과 다르면 True 를 반환합니다."""
+        stored_method = pwhash.split('$', 1)[0]
+        return canonical_method(stored_method) != self.method
+
+def init_password_hasher(app):
+    """app.config 의 PASSWORD_HASH_* 설정으로 PasswordHasher 를 만들어 app.extensions 에 등록합니다."""
+    hasher = PasswordHasher(
+        method=app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256'),
+        workers=app.config.get('PASSWORD_HASH_WORKERS', 0),
+        queue_size=app.config.get('PASSWORD_HASH_QUEUE_SIZE', 16),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+    )
+    app.extensions['password_hasher'] = hasher
+    return hasher
+
+def get_password_hasher():
+    return current_app.extensions['password_hasher']
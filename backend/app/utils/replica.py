@@ -0,0 +1,241 @@
+# 이 파일은 읽기 전용 복제본(read replica)으로 조회 쿼리를 보내는 라우팅을 정의하는 곳입니다.
+# - DB_REPLICA_URIS 로 지정한 복제본은 SQLALCHEMY_BINDS 의 'replica0', 'replica1', ... 엔진이 됩니다.
+# - @replica_read 를 붙인 라우트의 SELECT 만 복제본으로 보내고, 쓰기(flush/INSERT/UPDATE/DELETE)와
+#   같은 요청에서 쓰기 이후의 조회는 항상 primary 로 보냅니다.
+# - 복제본의 복제 지연(lag)을 주기적으로 확인하여 DB_REPLICA_MAX_LAG_SECONDS 를 넘거나 연결에 실패한 복제본은 잠시 제외하고,
+#   사용할 수 있는 복제본이 없으면 primary 에서 읽습니다.
+# - 복제본에서 실행한 쿼리가 실패하면(handle_error 로 구분) 그 복제본을 제외하고 primary 에서 다시 실행합니다.
+# - 쓰기 요청에 성공하면 응답 쿠키(DB_REPLICA_STICKY_COOKIE)를 남겨, 그 클라이언트의 조회는 DB_REPLICA_STICKY_SECONDS 동안
+#   primary 에서 읽습니다. (방금 쓴 글이 목록에 보이지 않는 문제 방지)
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+REPLICA_BIND_PREFIX = 'replica'
+
+class ReplicationStopped(Exception):
+    """복제본의 WAL receiver 가 primary 에서 WAL 을 받고 있지 않음 (지연을 알 수 없음)"""
+
+# 복제본이 primary 보다 얼마나 뒤처졌는지(초). 받은 WAL 을 모두 적용했다면 primary 가 한가해도 0 으로 봅니다.
+# 다만 WAL receiver 가 끊겨 있으면 받은 WAL 과 적용한 WAL 이 같아도 뒤처졌을 수 있으므로 NULL 을 반환합니다.
+# (pg_stat_wal_receiver.status 를 읽으려면 접속 역할에 pg_monitor 또는 pg_read_all_stats 권한이 필요합니다.)
+POSTGRES_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+def measure_replica_lag(engine):
+    """
+    복제 지연(초)을 반환합니다. Postgres 가 아닌 DB(로컬 SQLite 대역 등)는 지연을 알 수 없으므로 0 으로 봅니다.
+    WAL receiver 가 스트리밍 중이 아니면 ReplicationStopped 를 발생시킵니다.
+    """
+    with engine.connect() as conn:
+        if conn.dialect.name != 'postgresql':
+            conn.execute(text("SELECT 1"))
+            return 0.0
+        lag = conn.execute(text(POSTGRES_LAG_QUERY)).scalar()
+    if lag is None:
+        raise ReplicationStopped()
+    return float(lag)
+
+class ReplicaRouter:
+    """복제본 목록과 상태(지연, 사용 가능 여부)를 관리하고, 조회에 사용할 복제본을 번갈아 고릅니다."""
+
+    def __init__(self, engines, max_lag=5.0, check_interval=5.0, lag_probe=measure_replica_lag):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self.replicas = [
+            {"name": name, "engine": engine, "healthy": False, "lag": None, "error": None,
+             "checkedAt": None, "reads": 0, "failures": 0}
+            for name, engine in engines
+        ]
+        self.primary_fallbacks = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _probe(self, replica):
+        """복제본의 지연을 재서 (healthy, lag, error) 를 반환합니다. 잠금 밖에서 호출합니다."""
+        try:
+            lag = self.lag_probe(replica["engine"])
+        except Exception as e:
+            return False, None, type(e).__name__
+        if lag > self.max_lag:
+            return False, lag, "ReplicationLag"
+        return True, lag, None
+
+    def choose(self):
+        """
+        사용할 복제본 엔진을 반환합니다. 확인한 지 check_interval 이 지난 복제본은 지연을 다시 잽니다. 없으면 None.
+        지연 확인은 잠금 밖에서 하고, 확인 중인 복제본은 다른 요청이 다시 확인하지 않도록 먼저 checkedAt 을 갱신해 둡니다.
+        (그동안 다른 요청은 마지막으로 확인한 상태를 사용합니다.)
+        """
+        now = time.monotonic()
+        with self._lock:
+            stale = [replica for replica in self.replicas
+                     if replica["checkedAt"] is None or now - replica["checkedAt"] >= self.check_interval]
+            for replica in stale:
+                replica["checkedAt"] = now
+
+        results = [(replica, self._probe(replica)) for replica in stale]
+
+        with self._lock:
+            for replica, (healthy, lag, error) in results:
+                replica["healthy"], replica["lag"], replica["error"] = healthy, lag, error
+            healthy = [replica for replica in self.replicas if replica["healthy"]]
+            if not healthy:
+                self.primary_fallbacks += 1
+                return None
+            replica = healthy[self._next % len(healthy)]
+            self._next += 1
+            replica["reads"] += 1
+            return replica["engine"]
+
+    def mark_failed(self, engine, error):
+        """쿼리 도중 실패한 복제본을 다음 확인 때까지 제외합니다."""
+        with self._lock:
+            for replica in self.replicas:
+                if replica["engine"] is engine:
+                    replica["healthy"] = False
+                    replica["failures"] += 1
+                    # 연결 정보가 담길 수 있는 오류 메시지 대신 예외 클래스 이름만 남깁니다.
+                    replica["error"] = type(error).__name__
+                    replica["checkedAt"] = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "maxLagSeconds": self.max_lag,
+                "primaryFallbacks": self.primary_fallbacks,
+                "replicas": [
+                    {key: replica[key] for key in ("name", "healthy", "lag", "error", "reads", "failures")}
+                    for replica in self.replicas
+                ]
+            }
+
+    def metric_samples(self):
+        """/metrics 에 노출할 (이름, 값) 목록"""
+        samples = [('db_replica_primary_fallbacks_total', self.primary_fallbacks)]
+        for replica in self.replicas:
+            label = f'{{replica="{replica["name"]}"}}'
+            samples.append((f'db_replica_healthy{label}', int(replica["healthy"])))
+            samples.append((f'db_replica_lag_seconds{label}', replica["lag"] if replica["lag"] is not None else -1))
+            samples.append((f'db_replica_reads_total{label}', replica["reads"]))
+        return samples
+
+class RoutingSession(Session):
+    """
+    요청에서 복제본을 고른 경우(g.db_replica) SELECT 를 그 복제본으로 보내는 세션.
+    세션이 한 번이라도 쓰기를 하면 이후 조회는 primary 로 보내 방금 쓴 내용을 읽을 수 있게 합니다.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or getattr(clause, 'is_dml', False):
+                self.info['wrote'] = True
+            elif (has_app_context() and g.get('db_replica') is not None and not self.info.get('wrote')
+                    and getattr(clause, 'is_select', False)):
+                return g.db_replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def get_replica_router():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('replica_router')
+
+def reads_pinned_to_primary():
+    """최근에 쓰기를 한 클라이언트(쿠키)의 요청이면 True 를 반환합니다."""
+    if not has_request_context():
+        return False
+    value = request.cookies.get(current_app.config.get('DB_REPLICA_STICKY_COOKIE', 'db_primary_until'))
+    try:
+        return value is not None and float(value) > time.time()
+    except ValueError:
+        return False
+
+def reading_from_replica():
+    return has_app_context() and g.get('db_replica') is not None
+
+@contextmanager
+def use_primary():
+    """이 블록 안의 조회는 복제본 대신 primary 에서 읽습니다. (복제본에 아직 없는 행을 다시 찾을 때 사용)"""
+    replica = g.pop('db_replica', None)
+    try:
+        yield
+    finally:
+        if replica is not None:
+            g.db_replica = replica
+
+def replica_read(f):
+    """
+    라우트의 조회 쿼리를 복제본에서 읽도록 하는 데코레이터. (GET 라우트나 조회 위주 라우트에 사용합니다.)
+    복제본 연결/쿼리가 실패하면 그 복제본을 제외하고 primary 에서 라우트를 한 번 더 실행합니다.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        router = get_replica_router()
+        if router is None or reads_pinned_to_primary():
+            return f(*args, **kwargs)
+        replica = router.choose()
+        if replica is None:
+            return f(*args, **kwargs)
+
+        g.db_replica = replica
+        try:
+            return f(*args, **kwargs)
+        except OperationalError as e:
+            if g.get('db_replica_error') is not e or current_app.extensions['sqlalchemy'].session.info.get('wrote'):
+                # primary 에서 난 오류(use_primary 블록 안의 조회 등)이거나 이미 쓰기를 한 요청은 다시 실행하지 않습니다.
+                raise
+            router.mark_failed(replica, e)
+            current_app.extensions['sqlalchemy'].session.rollback()
+            g.pop('db_replica', None)
+            return f(*args, **kwargs)
+        finally:
+            g.pop('db_replica', None)
+            g.pop('db_replica_error', None)
+    return decorated
+
+def _remember_replica_error(context):
+    """복제본 엔진에서 난 오류를 기록하여, replica_read 가 그 오류일 때만 복제본을 제외하게 합니다."""
+    if has_app_context():
+        g.db_replica_error = context.sqlalchemy_exception
+
+def init_replicas(app, db):
+    """SQLALCHEMY_BINDS 의 복제본 엔진으로 ReplicaRouter 를 만들어 등록하고, 쓰기 후 primary 고정 쿠키를 설정하는 훅을 등록합니다."""
+    with app.app_context():
+        engines = sorted(
+            (key, engine) for key, engine in db.engines.items()
+            if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)
+        )
+    if not engines:
+        return None
+    for _, engine in engines:
+        event.listen(engine, 'handle_error', _remember_replica_error)
+
+    router = ReplicaRouter(
+        [(key, engine) for key, engine in engines],
+        max_lag=app.config.get('DB_REPLICA_MAX_LAG_SECONDS', 5.0),
+        check_interval=app.config.get('DB_REPLICA_CHECK_INTERVAL', 5.0),
+    )
+    app.extensions['replica_router'] = router
+    cookie_name = app.config.get('DB_REPLICA_STICKY_COOKIE', 'db_primary_until')
+    sticky_seconds = app.config.get('DB_REPLICA_STICKY_SECONDS', 10)
+
+    @app.after_request
+    def pin_reads_after_write(response):
+        if sticky_seconds and response.status_code < 400 and db.session.info.get('wrote'):
+            response.set_cookie(cookie_name, str(int(time.time() + sticky_seconds)),
+                                max_age=sticky_seconds, httponly=True, samesite='Lax')
+        return response
+
+    return router
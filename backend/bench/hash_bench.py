@@ -0,0 +1,52 @@
+# 비밀번호 해시 처리량 벤치마크
+# 사용법: python bench/hash_bench.py --method pbkdf2:sha256:600000 --workers 1 2 4 --requests 32
+# 같은 방식으로 여러 번 실행해 코어당 로그인 처리량(verify/s)을 비교합니다.
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from werkzeug.security import generate_password_hash
+from app.utils.passwords import PasswordHasher, canonical_method
+
+def run(method, workers, requests, concurrency):
+    """concurrency 개의 스레드가 동시에 verify 를 호출하는 로그인 폭주 상황을 흉내 냅니다."""
+    hasher = PasswordHasher(method, workers=workers, queue_size=requests)
+    stored = generate_password_hash('password123', canonical_method(method))
+    # 프로세스 풀 기동 시간은 측정에서 제외합니다.
+    hasher.verify(stored, 'password123')
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: hasher.verify(stored, 'password123'), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    assert all(results)
+    cores = max(workers, 1)
+    return {
+        "method": canonical_method(method),
+        "workers": workers,
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "verifyPerSec": round(requests / elapsed, 2),
+        "verifyPerSecPerCore": round(requests / elapsed / cores, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="비밀번호 해시 처리량 벤치마크")
+    parser.add_argument('--method', default='pbkdf2:sha256:1000000')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, os.cpu_count() or 1],
+                        help="해시 프로세스 풀 크기 목록 (0 = 요청 스레드에서 직접 계산)")
+    parser.add_argument('--requests', type=int, default=16)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    results = [run(args.method, w, args.requests, args.concurrency) for w in args.workers]
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# JSON 직렬화/압축 마이크로벤치마크
+# 게시글 목록 응답과 같은 모양의 dict N 개를 만들어, 응답 본문(bytes)을 만드는 시간과 압축 시간/크기를 비교합니다.
+#   - flask_default : 기존 방식 (라우트에서 행마다 .isoformat() + Flask 기본 provider)
+#   - <backend>     : FastJSONProvider (datetime 을 그대로 넘김), 설치된 인코더별
+#
+# 사용법: python bench/json_bench.py --rows 1000 --repeat 50 [--excerpt 200]
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def make_rows(count, excerpt_length):
+    base = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    rows = []
+    for i in range(count):
+        row = {
+            "postId": i + 1,
+            "title": f"벤치마크 게시글 {i}",
+            "author": f"bench{i % 100}",
+            "createdAt": base + datetime.timedelta(seconds=i, microseconds=i % 1000)
+        }
+        if excerpt_length:
+            row["excerpt"] = (f"본문 {i} " * 40)[:excerpt_length]
+        rows.append(row)
+    return rows
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 직렬화/압축 마이크로벤치마크")
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--excerpt', type=int, default=0, help="행마다 넣을 본문 미리보기 길이")
+    args = parser.parse_args()
+
+    from flask import Flask
+    from flask.json.provider import DefaultJSONProvider
+    from app.utils import json_provider
+    from app.utils.json_provider import FastJSONProvider, compress_body
+
+    app = Flask(__name__)
+    rows = make_rows(args.rows, args.excerpt)
+
+    default = DefaultJSONProvider(app)
+    default.ensure_ascii = False
+    def flask_default():
+        # 기존 라우트처럼 datetime 을 먼저 문자열로 바꾼 뒤 직렬화합니다.
+        payload = {"posts": [dict(row, createdAt=row["createdAt"].isoformat()) for row in rows], "nextCursor": None}
+        return default.dumps(payload).encode('utf-8') + b'\n'
+
+    candidates = [("flask_default", flask_default)]
+    for backend in json_provider.JSON_BACKENDS:
+        try:
+            provider = FastJSONProvider(app, backend)
+        except RuntimeError:
+            print(f"({backend} 미설치, 건너뜀)")
+            continue
+        provider.ensure_ascii = False
+        for sort_keys in (True, False):
+            def encode(provider=provider, sort_keys=sort_keys):
+                provider.sort_keys = sort_keys
+                return provider.encode({"posts": rows, "nextCursor": None}) + b'\n'
+            candidates.append((f"{backend}{'' if sort_keys else ' (unsorted)'}", encode))
+
+    print(f"rows={args.rows} excerpt={args.excerpt} repeat={args.repeat} (best of)")
+    print(f"{'encoder':<22} {'ms':>8} {'us/row':>8} {'bytes':>10} {'speedup':>8}")
+    baseline = None
+    body = None
+    for name, fn in candidates:
+        elapsed, result = best_of(fn, args.repeat)
+        baseline = baseline or elapsed
+        body = body or result
+        print(f"{name:<22} {elapsed * 1000:>8.2f} {elapsed / args.rows * 1e6:>8.2f} {len(result):>10} {baseline / elapsed:>7.1f}x")
+
+    print()
+    print(f"{'compression':<22} {'ms':>8} {'bytes':>10} {'ratio':>8}")
+    methods = [("gzip level 1", 'gzip', {"gzip_level": 1}), ("gzip level 6", 'gzip', {"gzip_level": 6})]
+    if json_provider.brotli is not None:
+        methods += [("br quality 4", 'br', {"brotli_quality": 4}), ("br quality 11", 'br', {"brotli_quality": 11})]
+    else:
+        print("(brotli 미설치, br 건너뜀)")
+    for name, encoding, options in methods:
+        elapsed, compressed = best_of(lambda: compress_body(body, encoding, **options), max(args.repeat // 5, 1))
+        print(f"{name:<22} {elapsed * 1000:>8.2f} {len(compressed):>10} {len(body) / len(compressed):>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# gunicorn 워커 종류(sync / gthread / gevent)별 부하 테스트 비교
+# 사용법: python bench/load_compare.py --modes sync gthread gevent --concurrency 32 --duration 10
+# 각 모드마다 gunicorn 을 띄우고 /posts, /users/login 에 동시 요청을 보낸 뒤 처리량과 지연 시간을 JSON 으로 출력합니다.
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from bench.seed import seed, bench_email, PASSWORD
+from bench.run import percentile
+
+SCENARIOS = {
+    'list': ('GET', '/posts?limit=20', None),
+    'login': ('POST', '/users/login', lambda i: {"email": bench_email(i % 10), "password": PASSWORD}),
+}
+
+def summarize(latencies, errors, elapsed):
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50Ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95Ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99Ms": round(percentile(latencies, 99) * 1000, 2)
+    }
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn 이 {timeout}초 안에 {port} 포트에서 응답하지 않았습니다.")
+
+def drive(port, scenario, concurrency, duration):
+    """concurrency 개의 클라이언트 스레드가 duration 초 동안 keep-alive 연결로 요청을 반복합니다."""
+    method, path, body_factory = SCENARIOS[scenario]
+    latencies, lock = [], threading.Lock()
+    errors = [0]
+    deadline = time.monotonic() + duration
+
+    def client(worker_id):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        i = worker_id
+        while time.monotonic() < deadline:
+            body = json.dumps(body_factory(i)) if body_factory else None
+            headers = {'Content-Type': 'application/json'} if body else {}
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+            i += concurrency
+        conn.close()
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies, errors[0], time.monotonic() - started)
+
+def run_mode(mode, args, port):
+    env = dict(os.environ, FLASK_ENV='bench', GUNICORN_WORKER_CLASS=mode, GUNICORN_BIND=f'127.0.0.1:{port}')
+    if args.workers:
+        env['GUNICORN_WORKERS'] = str(args.workers)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'run:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(port)
+        return {scenario: drive(port, scenario, args.concurrency, args.duration) for scenario in args.scenarios}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description="gunicorn 워커 종류별 부하 테스트 비교")
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=0, help="0 이면 gunicorn.conf.py 의 기본값을 사용합니다.")
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--no-seed', action='store_true', help="이미 시드된 DB 를 그대로 사용합니다.")
+    args = parser.parse_args()
+
+    os.environ['FLASK_ENV'] = 'bench'
+    if not args.no_seed:
+        from app import create_app
+        seed(create_app(), users=10, posts=args.posts)
+
+    results = {mode: run_mode(mode, args, args.port) for mode in args.modes}
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# 목록 조회 방식별 메모리 사용량 측정
+# 게시글 N 개(기본 1만, 본문 약 4KB)를 시드한 뒤, 같은 목록을 여러 방식으로 읽을 때
+# 결과를 만드는 동안의 최대 Python 메모리 할당량(tracemalloc)과 소요 시간을 비교합니다.
+#
+# 사용법:
+#   python bench/memory_bench.py --posts 10000 --content-size 4096
+#   BENCH_DATABASE_URI=postgresql://... python bench/memory_bench.py   # Postgres 로 측정
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+def strategies():
+    """(이름, 설명, 목록을 읽어 응답용 dict 목록을 만드는 함수)"""
+    from sqlalchemy.orm import undefer, joinedload
+    from app import db
+    from app.models import Post
+    from app.repositories import post_repository
+
+    def full_entities():
+        # 변경 전 방식: 본문까지 포함한 Post 엔티티 전체 + 작성자 JOIN
+        posts = (db.session.query(Post).options(undefer(Post.content), joinedload(Post.author))
+                 .order_by(Post.created_at.desc(), Post.id.desc()).all())
+        return [{"postId": p.id, "title": p.title, "author": p.author.username,
+                 "createdAt": p.created_at.isoformat()} for p in posts]
+
+    def deferred_entities():
+        # 엔티티는 만들지만 본문은 읽지 않는 방식 (Post.content 가 지연 로딩 컬럼)
+        posts = (db.session.query(Post).options(joinedload(Post.author))
+                 .order_by(Post.created_at.desc(), Post.id.desc()).all())
+        return [{"postId": p.id, "title": p.title, "author": p.author.username,
+                 "createdAt": p.created_at.isoformat()} for p in posts]
+
+    def projection():
+        # 현재 목록 API 방식: 필요한 컬럼만 Row 로 가져오고 identity map 을 거치지 않음
+        rows = post_repository.list_post_summaries()
+        return [{"postId": r.id, "title": r.title, "author": r.author,
+                 "createdAt": r.created_at.isoformat()} for r in rows]
+
+    def projection_excerpt():
+        rows = post_repository.list_post_summaries(excerpt_length=200)
+        return [{"postId": r.id, "title": r.title, "author": r.author,
+                 "createdAt": r.created_at.isoformat(), "excerpt": r.excerpt} for r in rows]
+
+    return [
+        ("full_entities", "Post 엔티티 + content", full_entities),
+        ("deferred_entities", "Post 엔티티, content 지연", deferred_entities),
+        ("projection", "컬럼 projection Row", projection),
+        ("projection_excerpt", "projection + excerpt(200)", projection_excerpt),
+    ]
+
+def measure(app, fn, repeat):
+    from app import db
+    peaks, times = [], []
+    for _ in range(repeat):
+        with app.app_context():
+            gc.collect()
+            tracemalloc.start()
+            started = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows = len(result)
+            del result
+            db.session.remove()
+        peaks.append(peak)
+        times.append(elapsed)
+    return rows, min(peaks), min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 조회 방식별 메모리 사용량 측정")
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--content-size', type=int, default=4096, help="게시글 본문 길이(글자)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ['FLASK_ENV'] = 'bench'
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+    os.environ['REQUEST_METRICS_LOG'] = 'false'
+
+    from app import create_app, db
+    from app.models import Post
+    from bench.seed import seed
+
+    app = create_app()
+    seed(app, args.users, args.posts)
+    with app.app_context():
+        # seed 의 짧은 본문을 지정한 길이로 늘립니다.
+        db.session.query(Post).update({Post.content: Post.content + 'x' * args.content_size},
+                                      synchronize_session=False)
+        db.session.commit()
+
+    print(f"{'strategy':<20} {'설명':<26} {'rows':>7} {'peak MB':>9} {'MB/10k':>8} {'ms':>8}")
+    for name, description, fn in strategies():
+        rows, peak, elapsed = measure(app, fn, args.repeat)
+        per_10k = peak / rows * 10000 / 1024 / 1024 if rows else 0.0
+        print(f"{name:<20} {description:<26} {rows:>7} {peak / 1024 / 1024:>9.2f} {per_10k:>8.2f} {elapsed * 1000:>8.1f}")
+
+if __name__ == '__main__':
+    main()
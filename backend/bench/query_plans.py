@@ -0,0 +1,86 @@
+# 게시글 조회 쿼리의 실행 계획 비교
+# 목록(get_posts)/상세(get_post_detail)/사용자별 목록이 실제로 실행하는 SQL 을 그대로 잡아
+# users JOIN 방식(POSTS_DENORMALIZED_AUTHOR=false)과 비정규화 컬럼 방식(true)의 실행 계획을 출력합니다.
+#
+# 사용법:
+#   python bench/query_plans.py                                          # SQLite: EXPLAIN QUERY PLAN
+#   BENCH_DATABASE_URI=postgresql://... python bench/query_plans.py      # Postgres: EXPLAIN (ANALYZE, BUFFERS)
+#   ... --skip-seed    # 이미 시드된 DB 를 재사용
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def capture_statements(app, fn):
+    """fn() 이 실행하는 SQL 과 파라미터를 실행 순서대로 모읍니다."""
+    from sqlalchemy import event
+    from app import db
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+            db.session.remove()
+    return statements
+
+def explain(app, statement, parameters):
+    from app import db
+    with app.app_context():
+        raw = db.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            if db.engine.dialect.name == 'postgresql':
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                lines = [row[0] for row in cursor.fetchall()]
+            else:
+                cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                lines = [row[-1] for row in cursor.fetchall()]
+            raw.rollback()
+        finally:
+            raw.close()
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="게시글 조회 쿼리 실행 계획 비교 (JOIN vs 비정규화 컬럼)")
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--skip-seed', action='store_true', help="이미 시드된 DB 를 그대로 사용합니다.")
+    args = parser.parse_args()
+
+    os.environ['FLASK_ENV'] = 'bench'
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+    os.environ['REQUEST_METRICS_LOG'] = 'false'
+
+    from app import create_app
+    from app.repositories import post_repository
+    from bench.seed import seed
+
+    app = create_app()
+    if not args.skip_seed:
+        seed(app, args.users, args.posts)
+
+    post_id = args.posts // 2
+    cases = (
+        ("get_posts", lambda: post_repository.list_post_summaries(limit=21)),
+        ("get_post_detail", lambda: post_repository.get_post_with_author(post_id)),
+        ("get_user_posts", lambda: (post_repository.list_user_post_summaries(1, limit=21),
+                                    post_repository.count_user_posts(1))),
+    )
+    for denormalized in (False, True):
+        app.config['POSTS_DENORMALIZED_AUTHOR'] = denormalized
+        print(f"===== POSTS_DENORMALIZED_AUTHOR={str(denormalized).lower()} =====")
+        for name, fn in cases:
+            for statement, parameters in capture_statements(app, fn):
+                print(f"--- {name}")
+                print(' '.join(statement.split()))
+                for line in explain(app, statement, parameters):
+                    print(f"    {line}")
+        print()
+
+if __name__ == '__main__':
+    main()
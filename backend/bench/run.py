@@ -0,0 +1,231 @@
+# API 벤치마크 하네스
+# create_app() 으로 만든 앱에 test client 로 읽기/쓰기 요청을 섞어 보내고,
+# 작업별 처리량, p50/p95/p99 지연 시간, 요청당 SQL 문 수를 JSON 으로 출력합니다.
+#
+# 사용법:
+#   python bench/run.py --users 100 --posts 10000 --mix mixed --requests 2000 --output bench/results/HEAD.json
+#   python bench/run.py ... --compare bench/results/main.json    # 이전 결과와 비교
+#
+# 기본값은 SQLite 파일(bench/bench.db)이며, BENCH_DATABASE_URI 로 로컬 Postgres 를 지정할 수 있습니다.
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+# 작업 이름 -> 비율(가중치)
+MIXES = {
+    'read': {'list': 60, 'detail': 40},
+    'mixed': {'list': 40, 'detail': 30, 'login': 5, 'create': 10, 'update': 10, 'delete': 5},
+    'write': {'create': 50, 'update': 35, 'delete': 15},
+}
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class Harness:
+    """시드된 DB 위에서 작업을 실행하고 작업별 지연 시간과 SQL 문 수를 기록합니다."""
+
+    def __init__(self, app, users, posts, rng):
+        from sqlalchemy import event
+        from app import db
+        from bench.seed import bench_email, PASSWORD
+
+        self.app = app
+        self.client = app.test_client()
+        self.users = users
+        self.rng = rng
+        self.statements = 0
+        self.latencies = defaultdict(list)
+        self.sql_counts = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bench_email = bench_email
+        self.password = PASSWORD
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._count_statement)
+
+        # 시드 규칙상 게시글 (i + 1) 의 작성자는 사용자 (i % users) + 1 입니다.
+        self.owned = defaultdict(list)
+        for i in range(posts):
+            self.owned[(i % users) + 1].append(i + 1)
+        self.post_ids = list(range(1, posts + 1))
+        self.tokens = {}
+
+    def _count_statement(self, *args, **kwargs):
+        self.statements += 1
+
+    def _auth(self, user_id):
+        if user_id not in self.tokens:
+            response = self.client.post('/users/login', json={
+                "email": self.bench_email(user_id - 1), "password": self.password
+            })
+            self.tokens[user_id] = response.get_json()['accessToken']
+        return {'Authorization': f"Bearer {self.tokens[user_id]}"}
+
+    # --- 작업 정의: (method, url, kwargs) 를 반환하거나, 실행할 대상이 없으면 None ---
+    def op_list(self):
+        return self.client.get, '/posts?limit=20', {}
+
+    def op_detail(self):
+        if not self.post_ids:
+            return None
+        return self.client.get, f"/posts/{self.rng.choice(self.post_ids)}", {}
+
+    def op_login(self):
+        user_index = self.rng.randrange(self.users)
+        return self.client.post, '/users/login', {"json": {
+            "email": self.bench_email(user_index), "password": self.password
+        }}
+
+    def op_create(self):
+        user_id = self.rng.randrange(self.users) + 1
+        return self.client.post, '/posts', {
+            "json": {"title": "bench create", "content": "본문 " * 50},
+            "headers": self._auth(user_id),
+            "_owner": user_id
+        }
+
+    def op_update(self):
+        user_id = self.rng.randrange(self.users) + 1
+        if not self.owned[user_id]:
+            return None
+        post_id = self.rng.choice(self.owned[user_id])
+        return self.client.put, f"/posts/{post_id}", {
+            "json": {"title": "bench update", "content": "수정된 본문 " * 50},
+            "headers": self._auth(user_id)
+        }
+
+    def op_delete(self):
+        user_id = self.rng.randrange(self.users) + 1
+        if not self.owned[user_id]:
+            return None
+        post_id = self.owned[user_id].pop(self.rng.randrange(len(self.owned[user_id])))
+        self.post_ids.remove(post_id)
+        return self.client.delete, f"/posts/{post_id}", {"headers": self._auth(user_id)}
+
+    def run_one(self, name):
+        planned = getattr(self, f"op_{name}")()
+        if planned is None:
+            return
+        call, url, kwargs = planned
+        owner = kwargs.pop('_owner', None)
+
+        before = self.statements
+        started = time.perf_counter()
+        response = call(url, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            return
+        self.latencies[name].append(elapsed)
+        self.sql_counts[name].append(self.statements - before)
+        if owner is not None:
+            post_id = response.get_json()['postId']
+            self.owned[owner].append(post_id)
+            self.post_ids.append(post_id)
+
+    def report(self, wall_time):
+        operations = {}
+        total = 0
+        for name, values in sorted(self.latencies.items()):
+            values.sort()
+            total += len(values)
+            operations[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "p50Ms": round(percentile(values, 50) * 1000, 3),
+                "p95Ms": round(percentile(values, 95) * 1000, 3),
+                "p99Ms": round(percentile(values, 99) * 1000, 3),
+                "sqlPerRequest": round(sum(self.sql_counts[name]) / len(self.sql_counts[name]), 2)
+            }
+        return {"requests": total, "seconds": round(wall_time, 3),
+                "rps": round(total / wall_time, 2) if wall_time else 0.0, "operations": operations}
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current, baseline):
+    """두 결과의 작업별 p50/p99/SQL 문 수 변화를 출력합니다. (음수가 개선)"""
+    lines = [f"{'operation':<10} {'p50 Δ%':>9} {'p99 Δ%':>9} {'sql Δ':>7}"]
+    for name, now in current['operations'].items():
+        before = baseline['operations'].get(name)
+        if not before:
+            continue
+        def pct(key):
+            return (now[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        lines.append(f"{name:<10} {pct('p50Ms'):>+9.1f} {pct('p99Ms'):>+9.1f} "
+                     f"{now['sqlPerRequest'] - before['sqlPerRequest']:>+7.2f}")
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="API 벤치마크 하네스")
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--mix', choices=list(MIXES), default='mixed')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42, help="작업 순서를 결정하는 난수 시드")
+    parser.add_argument('--cache', default='none', help="CACHE_BACKEND 값 (기본: 캐시 끔)")
+    parser.add_argument('--hash-method', default='pbkdf2:sha256:1000',
+                        help="PASSWORD_HASH_METHOD 값. 기본값은 login 이 결과를 지배하지 않도록 낮춰 둡니다.")
+    parser.add_argument('--output', help="결과 JSON 을 저장할 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    # config 는 import 시점에 환경 변수를 읽으므로 앱을 import 하기 전에 설정합니다.
+    os.environ['FLASK_ENV'] = 'bench'
+    os.environ['CACHE_BACKEND'] = args.cache
+    os.environ['PASSWORD_HASH_METHOD'] = args.hash_method
+    # 요청마다 남는 구조화 로그가 측정에 섞이지 않도록 끕니다. (Server-Timing/히스토그램은 유지)
+    os.environ['REQUEST_METRICS_LOG'] = 'false'
+
+    from app import create_app
+    from bench.seed import seed
+
+    app = create_app()
+    seed(app, args.users, args.posts)
+
+    rng = random.Random(args.seed)
+    harness = Harness(app, args.users, args.posts, rng)
+    mix = MIXES[args.mix]
+    names, weights = list(mix), list(mix.values())
+    plan = rng.choices(names, weights=weights, k=args.requests)
+
+    started = time.perf_counter()
+    for name in plan:
+        harness.run_one(name)
+    result = harness.report(time.perf_counter() - started)
+    result["meta"] = {
+        "revision": git_revision(),
+        "database": app.config['SQLALCHEMY_DATABASE_URI'].split('://', 1)[0],
+        "mix": args.mix, "users": args.users, "posts": args.posts, "seed": args.seed,
+        "cache": args.cache, "hashMethod": args.hash_method
+    }
+
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(result, json.load(f)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+# 게시글 검색(/posts/search) 벤치마크
+# Postgres 에 게시글 N 개(기본 100만)를 넣고, 검색 방식(simple/trigram)별 응답 시간과 실행 계획을 측정합니다.
+# 비교 기준으로 검색 API 도입 전처럼 전체 목록을 받아 클라이언트에서 거르는 방식(?all=true)도 측정할 수 있습니다.
+#
+# 사용법 (tsvector/pg_trgm 은 Postgres 전용이므로 BENCH_DATABASE_URI 가 필요합니다):
+#   BENCH_DATABASE_URI=postgresql://user:pw@localhost/bench python bench/search_bench.py --posts 1000000
+#   ... --skip-seed             # 이미 시드된 DB 를 재사용
+#   ... --baseline --explain    # 전체 목록 방식 비교, EXPLAIN (ANALYZE, BUFFERS) 출력
+import argparse
+import datetime
+import io
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from bench.run import percentile
+
+# 한국어 글처럼 단어 뒤에 조사가 붙은 형태를 만들기 위한 음절/조사 목록
+SYLLABLES = "가나다라마바사아자차카타파하게시글검색서버배포로그플라스크데이터베이스인덱스성능캐시요청응답"
+PARTICLES = ("", "", "", "을", "를", "이", "가", "에서", "으로", "의", "은", "는")
+VOCABULARY_SIZE = 5000
+
+# (이름, 검색어) - 흔한 단어, 드문 단어, 두 단어, 조사가 붙은 단어의 일부, 영어
+QUERIES = (
+    ("common", None),     # 가장 흔한 단어 (시드 후 결정)
+    ("rare", None),       # 드문 단어 (시드 후 결정)
+    ("two_words", None),
+    ("substring", None),  # 단어 중간 부분 (trigram 만 찾을 수 있음)
+    ("english", "flask"),
+)
+
+def build_vocabulary(rng):
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words) + ["flask", "postgres", "gunicorn", "nginx"]
+
+def zipf_choice(rng, vocabulary):
+    # 앞쪽 단어일수록 자주 나오도록(지프 분포와 비슷하게) 선택합니다.
+    index = min(int(rng.paretovariate(1.1)) - 1, len(vocabulary) - 1)
+    return vocabulary[index]
+
+def make_text(rng, vocabulary, words):
+    return ' '.join(zipf_choice(rng, vocabulary) + rng.choice(PARTICLES) for _ in range(words))
+
+def seed(app, posts, users, rng, vocabulary, batch_size=50000):
+    """스키마를 마이그레이션으로 새로 만들고(검색 컬럼/인덱스 포함) COPY 로 게시글을 넣습니다."""
+    from flask_migrate import upgrade
+    from sqlalchemy import text
+    from app import db
+    from app.utils.passwords import get_password_hasher
+    from bench.seed import bench_email, PASSWORD
+
+    with app.app_context():
+        db.drop_all()
+        db.session.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        db.session.commit()
+        upgrade(directory=os.path.join(BACKEND_DIR, 'migrations'))
+
+        password_hash = get_password_hasher().hash(PASSWORD)
+        db.session.execute(text(
+            "INSERT INTO users (email, username, password) VALUES (:email, :username, :password)"
+        ), [{"email": bench_email(i), "username": f"bench{i}", "password": password_hash} for i in range(users)])
+        db.session.commit()
+
+        raw = db.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            base = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+            started = time.perf_counter()
+            for start in range(0, posts, batch_size):
+                buffer = io.StringIO()
+                for i in range(start, min(start + batch_size, posts)):
+                    title = make_text(rng, vocabulary, 5)
+                    content = make_text(rng, vocabulary, 60)
+                    created_at = (base + datetime.timedelta(seconds=i)).isoformat()
+                    buffer.write(f"{title}\t{content}\t{(i % users) + 1}\t{created_at}\t{created_at}\n")
+                buffer.seek(0)
+                cursor.copy_expert("COPY posts (title, content, user_id, created_at, updated_at) FROM STDIN", buffer)
+                raw.commit()
+                print(f"  {min(start + batch_size, posts)}/{posts} posts ({time.perf_counter() - started:.0f}s)",
+                      file=sys.stderr)
+            cursor.execute("ANALYZE posts")
+            raw.commit()
+        finally:
+            raw.close()
+
+def pick_queries(vocabulary):
+    """시드된 데이터에서 흔한 단어/드문 단어를 골라 검색어를 정합니다."""
+    common = vocabulary[0]
+    rare = vocabulary[VOCABULARY_SIZE // 2]
+    queries = dict(QUERIES)
+    queries.update({
+        "common": common,
+        "rare": rare,
+        "two_words": f"{vocabulary[1]} {vocabulary[3]}",
+        # 자주 나오는 4글자 단어의 뒤 3글자 (단어 단위 검색으로는 찾을 수 없는 부분 문자열)
+        "substring": next(word for word in vocabulary if len(word) >= 4)[1:],
+    })
+    return queries
+
+def explain(app, sql_text, params):
+    from sqlalchemy import text
+    from app import db
+    with app.app_context():
+        rows = db.session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql_text}"), params).scalars().all()
+        db.session.rollback()
+    return '\n'.join(rows)
+
+def measure(client, url, repeat):
+    latencies = []
+    body = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - started)
+        body = response.get_json()
+    latencies.sort()
+    return latencies, body
+
+def main():
+    parser = argparse.ArgumentParser(description="게시글 검색 벤치마크 (Postgres)")
+    parser.add_argument('--posts', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20, help="검색어/방식별 반복 횟수")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-seed', action='store_true', help="이미 시드된 DB 를 그대로 사용합니다.")
+    parser.add_argument('--baseline', action='store_true', help="전체 목록(?all=true) + 클라이언트 필터 방식도 측정합니다.")
+    parser.add_argument('--explain', action='store_true', help="방식별 EXPLAIN (ANALYZE, BUFFERS) 를 출력합니다.")
+    parser.add_argument('--output', help="결과 JSON 을 저장할 경로")
+    args = parser.parse_args()
+
+    if not os.environ.get('BENCH_DATABASE_URI', '').startswith('postgresql'):
+        print("BENCH_DATABASE_URI 에 Postgres 주소를 지정하세요. (tsvector/pg_trgm 은 Postgres 전용입니다.)")
+        sys.exit(1)
+    os.environ['FLASK_ENV'] = 'bench'
+    os.environ['CACHE_BACKEND'] = 'none'
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+    os.environ['REQUEST_METRICS_LOG'] = 'false'
+
+    from app import create_app
+    app = create_app()
+    rng = random.Random(args.seed)
+    vocabulary = build_vocabulary(rng)
+    if not args.skip_seed:
+        seed(app, args.posts, args.users, rng, vocabulary)
+
+    client = app.test_client()
+    queries = pick_queries(vocabulary)
+    results = {}
+    for mode in ('simple', 'trigram'):
+        app.config['POSTS_SEARCH_MODE'] = mode
+        for name, q in queries.items():
+            latencies, body = measure(client, f"/posts/search?q={q}&limit=20", args.repeat)
+            results[f"{mode}/{name}"] = {
+                "q": q,
+                "hits": len(body["posts"]),
+                "hasNext": body["nextCursor"] is not None,
+                "p50Ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95Ms": round(percentile(latencies, 95) * 1000, 2),
+            }
+            print(f"{mode:<8} {name:<10} q={q!r:<16} hits={len(body['posts']):>3} "
+                  f"p50={results[f'{mode}/{name}']['p50Ms']:>8.2f}ms p95={results[f'{mode}/{name}']['p95Ms']:>8.2f}ms")
+
+    if args.baseline:
+        # 검색 API 가 없을 때처럼 전체 목록을 받아 클라이언트에서 거르는 비용 (한 번만 측정)
+        q = queries["common"]
+        started = time.perf_counter()
+        posts = client.get('/posts?all=true').get_json()
+        hits = [post for post in posts if q in post["title"]]
+        elapsed = time.perf_counter() - started
+        results["baseline/all"] = {"q": q, "hits": len(hits), "p50Ms": round(elapsed * 1000, 2)}
+        print(f"baseline all=true q={q!r} hits={len(hits)} {elapsed * 1000:.0f}ms (제목만 비교)")
+
+    if args.explain:
+        print(explain(app, """
+            SELECT id, ts_rank(search_vector, q) AS rank FROM posts, to_tsquery('simple', :tsq) q
+            WHERE search_vector @@ q ORDER BY rank DESC, id DESC LIMIT 21
+        """, {"tsq": f"'{queries['rare']}':*"}))
+        print(explain(app, """
+            SELECT id FROM posts WHERE title ILIKE :pattern OR content ILIKE :pattern ORDER BY id DESC LIMIT 21
+        """, {"pattern": f"%{queries['substring']}%"}))
+
+    output = {"posts": args.posts, "repeat": args.repeat, "results": results}
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+
+if __name__ == '__main__':
+    main()
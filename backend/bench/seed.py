@@ -0,0 +1,62 @@
+# 벤치마크용 데이터 시드
+# 사용법: FLASK_ENV=bench python bench/seed.py --users 100 --posts 10000
+# 비밀번호는 모두 'password123' 이며, 사용자 이메일은 bench{i}@example.com 입니다.
+import argparse
+import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, db
+from app.models import User, Post
+from app.utils.passwords import get_password_hasher
+
+PASSWORD = 'password123'
+
+def bench_email(i):
+    return f"bench{i}@example.com"
+
+def seed(app, users, posts, batch_size=5000):
+    """테이블을 새로 만들고 users 명의 사용자와 posts 개의 게시글을 일괄 삽입합니다."""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        # 해시는 한 번만 계산해서 모든 사용자에게 같은 값을 씁니다. (시드 시간을 줄이기 위함)
+        password_hash = get_password_hasher().hash(PASSWORD)
+        db.session.execute(db.insert(User), [
+            {"email": bench_email(i), "username": f"bench{i}", "password": password_hash,
+             # 게시글은 사용자에게 차례로 돌아가며 배정되므로 사용자별 게시글 수를 미리 계산할 수 있습니다.
+             "post_count": posts // users + (1 if i < posts % users else 0)}
+            for i in range(users)
+        ])
+
+        # created_at 을 명시적으로 1초씩 다르게 넣어 페이지네이션 순서가 결정적이 되도록 합니다.
+        base = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        for start in range(0, posts, batch_size):
+            db.session.execute(db.insert(Post), [
+                {
+                    "title": f"벤치마크 게시글 {i}",
+                    "content": f"본문 {i} " * 20,
+                    "user_id": (i % users) + 1,
+                    "author_username": f"bench{i % users}",
+                    "created_at": base + datetime.timedelta(seconds=i),
+                    "updated_at": base + datetime.timedelta(seconds=i)
+                }
+                for i in range(start, min(start + batch_size, posts))
+            ])
+        db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 사용자/게시글 시드")
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=10000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('FLASK_ENV', 'bench')
+    seed(create_app(), args.users, args.posts)
+    print(f"seeded {args.users} users, {args.posts} posts")
+
+if __name__ == '__main__':
+    main()
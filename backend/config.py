@@ -1,4 +1,58 @@
 import os
+from sqlalchemy.pool import NullPool
+
+def build_engine_options():
+    """
+    DB_* 환경 변수로 SQLAlchemy 엔진(커넥션 풀) 옵션을 만듭니다.
+    gunicorn 워커 수 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) 가 Postgres 의 max_connections 를 넘지 않도록 설정하세요.
+    """
+    # PgBouncer(transaction pooling) 뒤에서 동작할 때는 풀링을 PgBouncer 에 맡기고,
+    # PgBouncer 가 거부하는 startup 파라미터(options)와 세션 단위 상태를 사용하지 않습니다.
+    # (psycopg2 는 서버 측 prepared statement 를 사용하지 않으므로 별도 설정이 필요 없습니다.)
+    # 이 모드에서 statement_timeout 은 DB 역할(ALTER ROLE ... SET statement_timeout)로 지정합니다.
+    # connect_timeout(초)은 libpq 가 새 커넥션을 맺을 때 기다리는 최대 시간입니다. DB 에 닿지 않을 때 요청과 /readyz 가
+    # TCP 연결 제한 시간(수 분) 동안 멈추지 않게 합니다. (libpq 는 2초 미만 값을 2초로 처리합니다.)
+    connect_timeout = int(os.environ.get('DB_CONNECT_TIMEOUT', 3))
+    if os.environ.get('DB_PGBOUNCER', 'false').lower() == 'true':
+        return {'poolclass': NullPool, 'connect_args': {'connect_timeout': connect_timeout}}
+
+    options = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        # DB/네트워크 장비가 유휴 커넥션을 끊기 전에 재연결하도록 재활용 주기(초)를 둡니다.
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+    options['connect_args'] = {'connect_timeout': connect_timeout}
+    statement_timeout_ms = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 5000))
+    if statement_timeout_ms:
+        options['connect_args']['options'] = f'-c statement_timeout={statement_timeout_ms}'
+    return options
+
+def build_replica_binds():
+    """
+    DB_REPLICA_URIS(쉼표로 구분한 복제본 DB URI 목록)로 SQLALCHEMY_BINDS 를 만듭니다. ('replica0', 'replica1', ...)
+    SQLALCHEMY_ENGINE_OPTIONS 는 bind 엔진에 적용되지 않으므로 Postgres 복제본에는 build_engine_options() 를 직접 넣고,
+    응답하지 않는 복제본 때문에 요청이 오래 멈추지 않도록 짧은 연결 제한 시간(DB_REPLICA_CONNECT_TIMEOUT, 초)을 둡니다.
+    """
+    uris = [uri.strip() for uri in os.environ.get('DB_REPLICA_URIS', '').split(',') if uri.strip()]
+    options = build_engine_options()
+    connect_timeout = int(os.environ.get('DB_REPLICA_CONNECT_TIMEOUT', 2))
+    binds = {}
+    for i, uri in enumerate(uris):
+        if not uri.startswith('postgresql'):
+            binds[f'replica{i}'] = uri
+            continue
+        connect_args = dict(options.get('connect_args', {}), connect_timeout=connect_timeout)
+        binds[f'replica{i}'] = dict(options, url=uri, connect_args=connect_args)
+    return binds
+
+def default_password_hash_workers(value):
+    """PASSWORD_HASH_WORKERS 값. 'auto' 이면 gunicorn 워커 종류(GUNICORN_WORKER_CLASS)에 따라 정합니다."""
+    if value != 'auto':
+        return int(value)
+    return 2 if os.environ.get('GUNICORN_WORKER_CLASS', 'sync') in ('gthread', 'gevent') else 0
 
 class Config:
     """기본 설정"""
@@ -6,6 +60,91 @@ class Config:
     # os.environ.get()을 사용하면 해당 환경 변수가 없을 때 None을 반환합니다.
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'default-super-secret-key-for-dev')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Access Token 유효 시간(시간 단위)
+    JWT_ACCESS_TOKEN_HOURS = 1
+    # True 이면 토큰에 username 을 함께 담아, 인증된 요청에서 users 테이블 조회를 생략합니다.
+    JWT_EMBED_USERNAME = os.environ.get('JWT_EMBED_USERNAME', 'false').lower() == 'true'
+    # 토큰 검증 후 사용자 정보를 캐시하는 시간(초)과 최대 개수. TTL 을 0 으로 두면 캐시를 사용하지 않습니다.
+    AUTH_PRINCIPAL_CACHE_TTL = int(os.environ.get('AUTH_PRINCIPAL_CACHE_TTL', 60))
+    AUTH_PRINCIPAL_CACHE_SIZE = int(os.environ.get('AUTH_PRINCIPAL_CACHE_SIZE', 4096))
+
+    # 비밀번호 해시 설정 (werkzeug 형식: 'pbkdf2:<hash>:<iterations>' 또는 'scrypt:<n>:<r>:<p>')
+    # 방식이나 반복 횟수를 바꾸면 기존 사용자는 다음 로그인 때 새 설정으로 다시 해시됩니다.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000000')
+    # 해시 전용 프로세스 풀 크기(0 이면 요청 워커에서 직접 계산), 대기열 크기, 작업 대기 시간(초)
+    # 요청 워커는 해시가 끝날 때까지 future.result() 에서 기다리므로, 풀은 그동안 같은 워커의 다른 스레드/greenlet 이
+    # 요청을 처리할 수 있는 gthread/gevent 워커에서만 효과가 있습니다. 그래서 'auto'(기본값)는 GUNICORN_WORKER_CLASS 가
+    # gthread/gevent 이면 워커마다 2개, sync 이면 0 으로 정합니다. (풀은 gunicorn 워커마다 따로 만들어집니다.)
+    PASSWORD_HASH_WORKERS = default_password_hash_workers(os.environ.get('PASSWORD_HASH_WORKERS') or 'auto')
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 16))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+
+    # 공개 조회 API 응답 캐시 설정
+    # CACHE_BACKEND: 'memory'(프로세스 내부 LRU+TTL), 'redis', 'none'(캐시 사용 안 함)
+    # memory 는 워커마다 따로 저장하므로, 다른 워커에서 수정/삭제된 게시글이 최대 CACHE_DEFAULT_TTL 초 동안 이전 내용으로 보입니다.
+    # gunicorn 워커가 여러 개인 운영 환경에서는 redis 를 사용하세요.
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 30))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+
+    # 게시글 조회 응답의 Cache-Control 헤더
+    # 기본값 'public, no-cache'는 CloudFront/브라우저가 저장은 하되 매번 ETag 로 재검증하게 합니다.
+    POSTS_CACHE_CONTROL = os.environ.get('POSTS_CACHE_CONTROL', 'public, no-cache')
+
+    # 게시글 검색(/posts/search) 방식: 'simple'(tsvector 단어 검색), 'trigram'(부분 문자열 검색),
+    # 'auto'(단어 검색 결과가 없으면 부분 문자열 검색). 한국어는 조사가 붙어 단어가 나뉘지 않으므로 'auto' 를 기본으로 합니다.
+    POSTS_SEARCH_MODE = os.environ.get('POSTS_SEARCH_MODE', 'auto')
+    # 게시글 일괄 작성(/posts/bulk) 한 번에 받을 최대 항목 수
+    POSTS_BULK_MAX_ITEMS = int(os.environ.get('POSTS_BULK_MAX_ITEMS', 1000))
+    # 목록 조회의 ?excerpt=N 으로 요청할 수 있는 본문 미리보기 최대 글자 수
+    POSTS_EXCERPT_MAX_LENGTH = int(os.environ.get('POSTS_EXCERPT_MAX_LENGTH', 500))
+    # 게시글 내보내기(/posts/export)에서 DB 커서로 한 번에 가져와 응답에 쓰는 행 수
+    POSTS_EXPORT_BATCH_SIZE = int(os.environ.get('POSTS_EXPORT_BATCH_SIZE', 1000))
+    # 사용자별 게시글 수 캐시 시간(초). 게시글 생성/삭제 시에는 바로 지워집니다. (CACHE_BACKEND=redis 일 때만 캐시합니다.)
+    USER_POST_COUNT_TTL = int(os.environ.get('USER_POST_COUNT_TTL', 300))
+    # true 이면 게시글 조회 시 users 와 JOIN 하지 않고 posts.author_username, users.post_count 를 읽습니다.
+    # 쓰기 경로는 설정과 관계없이 항상 두 컬럼을 갱신하므로, 마이그레이션(d2b6f0a47c91)을 적용하고 모든 서버를 새 버전으로 바꾼 뒤
+    # `flask backfill-denormalized` 로 값을 맞춘 다음에 켜세요.
+    POSTS_DENORMALIZED_AUTHOR = os.environ.get('POSTS_DENORMALIZED_AUTHOR', 'false').lower() == 'true'
+
+    # JSON 인코더: 'auto'(orjson -> msgspec -> 표준 json 중 설치된 것), 'orjson', 'msgspec', 'stdlib'
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+    # JSON 응답 압축: 'off', 'auto'(br 을 지원하면 br, 아니면 gzip), 'gzip', 'br'.
+    # Nginx/CloudFront 에서 압축한다면 'off' 로 두세요. MIN_SIZE(바이트)보다 작은 응답은 압축하지 않습니다.
+    RESPONSE_COMPRESSION = os.environ.get('RESPONSE_COMPRESSION', 'off')
+    RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
+    RESPONSE_COMPRESSION_GZIP_LEVEL = int(os.environ.get('RESPONSE_COMPRESSION_GZIP_LEVEL', 6))
+    RESPONSE_COMPRESSION_BROTLI_QUALITY = int(os.environ.get('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4))
+
+    # 요청별 처리 시간/SQL 측정(Server-Timing 헤더, 구조화 로그, /metrics). 로그만 끄려면 REQUEST_METRICS_LOG=false
+    REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', 'true').lower() == 'true'
+    REQUEST_METRICS_LOG = os.environ.get('REQUEST_METRICS_LOG', 'true').lower() == 'true'
+    # 측정에서 제외할 경로. 상태 확인 요청이 라우트별 지연 시간/요청 수를 왜곡하지 않도록 제외합니다.
+    REQUEST_METRICS_EXCLUDED_PATHS = ('/metrics', '/healthz', '/readyz')
+
+    # 운영용 엔드포인트(/metrics, /cache/stats, /db/pool, /db/replicas) 접근 제한.
+    # X-Internal-Token 헤더가 INTERNAL_API_TOKEN 과 같거나, Nginx 를 거치지 않고 INTERNAL_NETWORKS(CIDR 목록)에서 온 요청만 허용합니다.
+    INTERNAL_API_TOKEN = os.environ.get('INTERNAL_API_TOKEN')
+    INTERNAL_NETWORKS = os.environ.get('INTERNAL_NETWORKS', '127.0.0.0/8,::1/128,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16')
+
+    # 읽기 복제본 설정. DB_REPLICA_URIS 가 비어 있으면 모든 쿼리를 primary 로 보냅니다.
+    # 복제 지연이 MAX_LAG_SECONDS 를 넘는 복제본은 제외하고(CHECK_INTERVAL 초마다 다시 확인),
+    # 쓰기를 한 클라이언트의 조회는 STICKY_SECONDS 동안 primary 에서 읽습니다.
+    # 복제본에서 읽은 목록도 응답 캐시에 저장되므로, 다른 클라이언트에게는 최대 (복제 지연 + CACHE_DEFAULT_TTL) 만큼 늦게 보일 수 있습니다.
+    SQLALCHEMY_BINDS = build_replica_binds()
+    DB_REPLICA_MAX_LAG_SECONDS = float(os.environ.get('DB_REPLICA_MAX_LAG_SECONDS', 5))
+    DB_REPLICA_CHECK_INTERVAL = float(os.environ.get('DB_REPLICA_CHECK_INTERVAL', 5))
+    DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 10))
+    DB_REPLICA_STICKY_COOKIE = 'db_primary_until'
+
+    # 새 DB 커넥션을 맺을 때 기다리는 최대 시간(초). build_engine_options 와 같은 환경 변수를 사용합니다.
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 3))
+
+    # /readyz 설정: 결과 재사용 시간(초), DB ping 의 statement_timeout(ms), 준비되지 않음으로 볼 풀 사용률
+    HEALTH_CACHE_SECONDS = float(os.environ.get('HEALTH_CACHE_SECONDS', 2))
+    HEALTH_DB_TIMEOUT_MS = int(os.environ.get('HEALTH_DB_TIMEOUT_MS', 500))
+    HEALTH_POOL_SATURATION = float(os.environ.get('HEALTH_POOL_SATURATION', 0.9))
 
 class DevelopmentConfig(Config):
     """개발 환경 설정"""
@@ -33,10 +172,22 @@ class ProductionConfig(Config):
     DB_PORT = '5432' # 컨테이너 내부 포트
 
     SQLALCHEMY_DATABASE_URI = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{DB_HOST}:{DB_PORT}/{POSTGRES_DB}"
+    # 커넥션 풀 크기, 오버플로, pre-ping, 재활용 주기, statement timeout 등을 환경 변수로 설정합니다.
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options()
+
+class BenchmarkConfig(Config):
+    """벤치마크/CI 설정 (bench/ 디렉토리의 스크립트가 사용합니다.)"""
+    DEBUG = False
+    # 로컬 Postgres 를 지정하지 않으면 SQLite 파일을 사용합니다.
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        'BENCH_DATABASE_URI',
+        'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench', 'bench.db')
+    )
 
 # 사용할 설정을 지정합니다. (예: 'development', 'production')
 # 이 값도 환경 변수로 관리하여 실행 환경에 따라 설정을 바꿀 수 있습니다.
 config_by_name = dict(
     dev=DevelopmentConfig,
-    prod=ProductionConfig
+    prod=ProductionConfig,
+    bench=BenchmarkConfig
 )
\ No newline at end of file
@@ -0,0 +1,64 @@
+# Gunicorn 설정 파일
+# gunicorn 은 실행 디렉토리의 gunicorn.conf.py 를 자동으로 읽습니다. (Dockerfile 의 CMD 참고)
+# 모든 값은 환경 변수로 덮어쓸 수 있습니다.
+#
+# GUNICORN_WORKER_CLASS
+#   - sync    : 요청 하나당 워커 하나. 기존 방식과 같습니다.
+#   - gthread : 워커마다 스레드 풀을 둡니다. 추가 의존성이 필요 없습니다.
+#   - gevent  : 워커마다 수많은 greenlet 으로 요청을 동시에 처리합니다. (DB/Slack 등 I/O 대기가 많은 경우)
+#   gthread/gevent 에서는 PASSWORD_HASH_WORKERS=auto(기본값)가 워커마다 비밀번호 해시 전용 프로세스를 2개 띄웁니다.
+import multiprocessing
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# CPU 를 쓰는 sync/gthread 워커는 (2 x 코어 + 1), greenlet 이 동시성을 담당하는 gevent 는 코어 수만큼 띄웁니다.
+_default_workers = cpu_count if worker_class == 'gevent' else cpu_count * 2 + 1
+workers = int(os.environ.get('GUNICORN_WORKERS', _default_workers))
+threads = int(os.environ.get('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1))
+# gevent 워커 하나가 동시에 처리할 최대 요청 수
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# 요청 처리 제한 시간과, 재시작/종료 시 처리 중인 요청을 마무리할 시간(초)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+# Nginx 와의 keep-alive 연결 유지 시간(초)
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# 메모리 누수에 대비해 일정 요청 수마다 워커를 교체합니다. (동시에 교체되지 않도록 jitter 를 둡니다.)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', None)
+errorlog = '-'
+
+def _patch_psycopg_for_gevent():
+    """
+    psycopg2 는 C 확장이라 gevent 의 monkey patch 만으로는 DB 응답을 기다리는 동안 워커 전체가 멈춥니다.
+    비동기 wait callback 을 등록하여 대기 중에는 다른 greenlet 이 실행되도록 합니다. (psycogreen 과 같은 방식)
+    """
+    import psycopg2
+    from psycopg2 import extensions
+    from gevent.socket import wait_read, wait_write
+
+    def gevent_wait_callback(conn, timeout=None):
+        while True:
+            state = conn.poll()
+            if state == extensions.POLL_OK:
+                break
+            elif state == extensions.POLL_READ:
+                wait_read(conn.fileno(), timeout=timeout)
+            elif state == extensions.POLL_WRITE:
+                wait_write(conn.fileno(), timeout=timeout)
+            else:
+                raise psycopg2.OperationalError(f"Bad result from poll: {state!r}")
+
+    extensions.set_wait_callback(gevent_wait_callback)
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        _patch_psycopg_for_gevent()
+        server.log.info("psycopg2 gevent wait callback installed (pid: %s)", worker.pid)
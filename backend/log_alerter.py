@@ -0,0 +1,202 @@
+# backend/log_alerter.py
+# 5xx 로그를 바로 Slack 으로 보내지 않고, (상태 코드, 메서드, 정규화된 URI) 별로 일정 시간 모아서
+# 요약 메시지 한 건으로 보냅니다. 장애 중에 수천 건의 알림이 직렬로 전송되어 tailer 가 멈추거나
+# Slack 의 rate limit(429)에 걸리는 것을 막기 위함입니다.
+
+import os
+import queue
+import re
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- 설정 --- #
+# 알림을 모으는 시간(초). 이 시간 동안 쌓인 에러를 한 메시지로 보냅니다.
+ALERT_WINDOW_SECONDS = float(os.getenv("ALERT_WINDOW_SECONDS", 60))
+# tailer 와 전송 스레드 사이 대기열 크기. 가득 차면 tailer 를 막지 않고 버린 뒤 개수만 셉니다.
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", 10000))
+# 한 메시지에 표시할 최대 그룹 수와 그룹별 샘플 IP 수
+ALERT_MAX_GROUPS = int(os.getenv("ALERT_MAX_GROUPS", 20))
+ALERT_SAMPLE_IPS = 5
+# Slack 전송 재시도 설정
+SLACK_MAX_RETRIES = 5
+SLACK_BACKOFF_BASE = 1.0
+SLACK_BACKOFF_MAX = 60.0
+SLACK_REQUEST_TIMEOUT = 10.0
+
+_NUMERIC_SEGMENT = re.compile(r'^\d+$')
+_HEX_SEGMENT = re.compile(r'^[0-9a-fA-F]{16,}$')
+
+def normalize_uri(uri):
+    """쿼리 문자열을 제거하고 숫자/긴 16진수 경로 조각을 ':id' 로 바꿉니다. 예) /api/posts/12?x=1 -> /api/posts/:id"""
+    path = (uri or '').split('?', 1)[0]
+    segments = [
+        ':id' if _NUMERIC_SEGMENT.match(seg) or _HEX_SEGMENT.match(seg) else seg
+        for seg in path.split('/')
+    ]
+    return '/'.join(segments) or '/'
+
+class SlackSender:
+    """커넥션을 재사용하는 requests.Session 으로 Slack Webhook 에 전송하고, 429/5xx 는 지수 백오프로 재시도합니다."""
+
+    def __init__(self, webhook_url, max_retries=SLACK_MAX_RETRIES, backoff_base=SLACK_BACKOFF_BASE,
+                 backoff_max=SLACK_BACKOFF_MAX, timeout=SLACK_REQUEST_TIMEOUT, sleep=time.sleep):
+        self.webhook_url = webhook_url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.sleep = sleep
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+
+    def max_send_seconds(self):
+        """
+        send() 한 번이 걸릴 수 있는 최대 시간(초). 모든 시도가 요청 제한 시간까지 걸리고,
+        재시도마다 429 의 Retry-After 로 최대 backoff_max 만큼 기다리는 경우입니다.
+        """
+        return self.max_retries * self.backoff_max + (self.max_retries + 1) * self.timeout
+
+    def send(self, message):
+        """전송에 성공하면 True, 재시도 횟수를 모두 쓰면 False 를 반환합니다."""
+        for attempt in range(self.max_retries + 1):
+            delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+            try:
+                response = self.session.post(self.webhook_url, json=message, timeout=self.timeout)
+                if response.status_code == 429:
+                    # Slack 이 알려준 대기 시간이 있으면 그만큼 기다립니다.
+                    retry_after = response.headers.get('Retry-After')
+                    if retry_after and retry_after.isdigit():
+                        delay = min(float(retry_after), self.backoff_max)
+                    print(f"[알림 지연] Slack rate limit(429). {delay:.1f}초 후 재시도합니다.")
+                elif response.status_code >= 500:
+                    print(f"[알림 지연] Slack 응답 {response.status_code}. {delay:.1f}초 후 재시도합니다.")
+                else:
+                    response.raise_for_status()
+                    return True
+            except requests.exceptions.RequestException as e:
+                if getattr(e, 'response', None) is not None and e.response.status_code < 500:
+                    print(f"[알림 실패] Slack 이 요청을 거부했습니다: {e}")
+                    return False
+                print(f"[알림 지연] Slack 전송 오류: {e}. {delay:.1f}초 후 재시도합니다.")
+            if attempt < self.max_retries:
+                self.sleep(delay)
+        print("[알림 실패] 재시도 횟수를 초과하여 Slack 알림을 보내지 못했습니다.")
+        return False
+
+class AlertGroup:
+    """같은 (status, method, route) 로 묶인 에러들의 요약"""
+
+    def __init__(self, first_seen):
+        self.count = 0
+        self.first_seen = first_seen
+        self.last_seen = first_seen
+        self.sample_ips = []
+
+    def add(self, log_entry):
+        self.count += 1
+        self.last_seen = log_entry.get('timestamp') or self.last_seen
+        ip = log_entry.get('client_ip')
+        if ip and ip not in self.sample_ips and len(self.sample_ips) < ALERT_SAMPLE_IPS:
+            self.sample_ips.append(ip)
+
+def build_summary_message(groups, dropped, window_seconds, title=":alert: 5xx 서버 에러 발생!"):
+    """그룹별 건수가 많은 순으로 정렬된 Slack Block Kit 요약 메시지를 만듭니다."""
+    ordered = sorted(groups.items(), key=lambda item: item[1].count, reverse=True)
+    total = sum(group.count for _, group in ordered)
+    lines = []
+    for (status, method, route), group in ordered[:ALERT_MAX_GROUPS]:
+        lines.append(
+            f"`{status}` `{method} {route}` × *{group.count}*  "
+            f"({group.first_seen} ~ {group.last_seen})  IP: {', '.join(group.sample_ips) or '-'}"
+        )
+    if len(ordered) > ALERT_MAX_GROUPS:
+        lines.append(f"… 외 {len(ordered) - ALERT_MAX_GROUPS}개 그룹")
+
+    context = f"최근 {int(window_seconds)}초 동안 {total}건"
+    if dropped:
+        context += f" (대기열 초과로 {dropped}건 누락)"
+
+    return {
+        "blocks": [
+            {"type": "header", "text": {"type": "plain_text", "text": title}},
+            {"type": "section", "text": {"type": "mrkdwn", "text": '\n'.join(lines) or '-'}},
+            {"type": "context", "elements": [{"type": "mrkdwn", "text": context}]}
+        ]
+    }
+
+class AlertBatcher:
+    """
+    tailer 가 submit() 으로 넘긴 5xx 로그를 백그라운드 스레드에서 모아 window 마다 한 번 전송합니다.
+    submit() 은 대기열이 가득 차도 막히지 않습니다.
+    """
+
+    def __init__(self, sender, window_seconds=ALERT_WINDOW_SECONDS, queue_size=ALERT_QUEUE_SIZE):
+        self.sender = sender
+        self.window_seconds = window_seconds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='alert-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, log_entry):
+        try:
+            self._queue.put_nowait(log_entry)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def _collect(self, groups, deadline):
+        """deadline 까지 대기열에서 꺼내 그룹에 더합니다."""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                log_entry = self._queue.get(timeout=min(remaining, 0.5))
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            key = (str(log_entry.get('status')), log_entry.get('request_method', '-'),
+                   normalize_uri(log_entry.get('request_uri')))
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = AlertGroup(log_entry.get('timestamp'))
+            group.add(log_entry)
+
+    def _flush(self, groups):
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        if not groups and not dropped:
+            return
+        message = build_summary_message(groups, dropped, self.window_seconds)
+        if self.sender.send(message):
+            print(f"[알림 성공] 5xx 에러 {sum(g.count for g in groups.values())}건을 요약하여 전송했습니다.")
+
+    def _run(self):
+        groups = {}
+        while not self._stop.is_set():
+            self._collect(groups, time.monotonic() + self.window_seconds)
+            if self._stop.is_set():
+                break
+            self._flush(groups)
+            groups = {}
+        # 종료 시 남은 항목을 모으던 요약에 더해 마지막으로 한 번에 보냅니다.
+        while not self._queue.empty():
+            self._collect(groups, time.monotonic() + 0.1)
+        self._flush(groups)
+
+    def close(self, timeout=None):
+        """
+        남은 알림을 보내고 전송 스레드를 멈춥니다. timeout 을 주지 않으면 전송 중이던 요약과 마지막 요약,
+        두 번의 send() 가 재시도를 모두 쓰는 시간만큼 기다립니다. (그보다 짧으면 대기 중인 요약을 버리게 됩니다.)
+        """
+        if timeout is None:
+            timeout = 2 * self.sender.max_send_seconds() + 1
+        self._stop.set()
+        self._thread.join(timeout=timeout)
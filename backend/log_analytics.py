@@ -0,0 +1,298 @@
+# backend/log_analytics.py
+# Nginx json_analytics 로그로 라우트별(정규화된 URI) 지연 시간 분위수와 에러율을 최근 구간 기준으로 계산하고,
+# p99 지연 시간이나 에러율이 SLO 를 넘으면 Slack 으로 알립니다.
+# 개별 5xx 알림(log_alerter.AlertBatcher)과 달리, 에러가 없어도 느려진 라우트를 잡아낼 수 있습니다.
+#
+# 메모리 사용량은 (라우트 수 x 구간 슬롯 수 x 스케치 버킷 수) 로 제한됩니다.
+
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from log_alerter import normalize_uri
+
+# --- 설정 --- #
+# 분위수/에러율을 계산하는 최근 구간 길이(초)와, 그 구간을 나누는 슬롯 수
+ANALYTICS_WINDOW_SECONDS = int(os.getenv("ANALYTICS_WINDOW_SECONDS", 300))
+ANALYTICS_WINDOW_SLOTS = int(os.getenv("ANALYTICS_WINDOW_SLOTS", 10))
+# 추적할 최대 라우트 수. 넘치는 라우트(스캐너의 임의 경로 등)는 OTHER_ROUTE 하나로 합칩니다.
+ANALYTICS_MAX_ROUTES = int(os.getenv("ANALYTICS_MAX_ROUTES", 200))
+# SLO 기준
+SLO_P99_MS = float(os.getenv("SLO_P99_MS", 1000))
+SLO_ERROR_RATE = float(os.getenv("SLO_ERROR_RATE", 0.01))
+# 표본이 너무 적은 라우트는 판정하지 않습니다. (요청 몇 건으로 p99 가 튀는 것을 방지)
+SLO_MIN_REQUESTS = int(os.getenv("SLO_MIN_REQUESTS", 50))
+# SLO 판정 주기와, 같은 라우트/항목에 대해 다시 알리기까지의 최소 간격(초)
+SLO_EVAL_INTERVAL = float(os.getenv("SLO_EVAL_INTERVAL", 30))
+SLO_ALERT_COOLDOWN = float(os.getenv("SLO_ALERT_COOLDOWN", 600))
+
+OTHER_ROUTE = '_other_'
+
+class QuantileSketch:
+    """
+    상대 오차가 보장되는 로그 버킷 분위수 스케치 (DDSketch 방식).
+    값 x 를 gamma^(i-1) < x <= gamma^i 인 버킷 i 에 세므로, 반환되는 분위수는 실제 값과 relative_accuracy 이내로 다릅니다.
+    버킷 수가 max_bins 를 넘으면 가장 작은 버킷들을 합쳐서 메모리를 제한합니다. (상위 분위수의 정확도는 유지)
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_bins=512, min_value=1e-4):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        self.count += count
+        if value <= self.min_value:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        merged = sum(self.bins.pop(key) for key in keys[:excess + 1])
+        self.bins[keys[excess]] = merged
+
+    def merge(self, other):
+        """같은 설정의 다른 스케치를 더합니다."""
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q):
+        """0 <= q <= 1 분위수. 값이 없으면 None 을 반환합니다."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+class _Slot:
+    """라우트 하나의 시간 슬롯 하나에 해당하는 집계"""
+    __slots__ = ('epoch', 'sketch', 'requests', 'errors')
+
+    def __init__(self, epoch):
+        self.epoch = epoch
+        self.sketch = QuantileSketch()
+        self.requests = 0
+        self.errors = 0
+
+class RollingRouteStats:
+    """
+    라우트별로 window_seconds 를 slots 개로 나눈 링 버퍼를 유지합니다.
+    로그의 timestamp(이벤트 시간)로 슬롯을 정하므로, 지난 로그를 다시 읽어도 같은 결과가 나옵니다.
+    구간은 로그가 들어올 때만 앞으로 가므로, 요청이 끊기면 advance() 로 현재 시각까지 옮겨 오래된 슬롯을 비웁니다.
+    """
+
+    def __init__(self, window_seconds=ANALYTICS_WINDOW_SECONDS, slots=ANALYTICS_WINDOW_SLOTS,
+                 max_routes=ANALYTICS_MAX_ROUTES):
+        self.slots = slots
+        self.slot_seconds = max(window_seconds / slots, 1)
+        self.max_routes = max_routes
+        self._routes = {}
+        self._latest_epoch = 0
+        self._lock = threading.Lock()
+
+    def observe(self, route, timestamp, latency, is_error):
+        epoch = int(timestamp // self.slot_seconds)
+        with self._lock:
+            self._latest_epoch = max(self._latest_epoch, epoch)
+            if epoch <= self._latest_epoch - self.slots:
+                return  # 구간을 벗어난 늦은 로그
+            ring = self._routes.get(route)
+            if ring is None:
+                if len(self._routes) >= self.max_routes:
+                    route = OTHER_ROUTE
+                ring = self._routes.setdefault(route, [None] * self.slots)
+            position = epoch % self.slots
+            slot = ring[position]
+            if slot is None or slot.epoch != epoch:
+                slot = ring[position] = _Slot(epoch)
+            slot.requests += 1
+            if is_error:
+                slot.errors += 1
+            if latency is not None:
+                slot.sketch.add(latency)
+
+    def advance(self, timestamp):
+        """
+        구간 끝을 timestamp 까지 옮깁니다. 새 로그가 없는 동안에도 오래된 슬롯이 구간에서 빠지게 하고,
+        모든 슬롯이 구간을 벗어난 라우트는 지웁니다. (tailer 가 새 로그를 다 읽어 쉬는 동안 호출합니다.)
+        """
+        epoch = int(timestamp // self.slot_seconds)
+        with self._lock:
+            if epoch <= self._latest_epoch:
+                return
+            self._latest_epoch = epoch
+            oldest = epoch - self.slots + 1
+            for route in [route for route, ring in self._routes.items()
+                          if all(slot is None or slot.epoch < oldest for slot in ring)]:
+                del self._routes[route]
+
+    def snapshot(self):
+        """
+        최근 구간의 라우트별 요약을 반환합니다.
+        {route: {"requests", "errors", "errorRate", "p50", "p95", "p99"}} (지연 시간 단위는 초)
+        """
+        result = {}
+        with self._lock:
+            oldest = self._latest_epoch - self.slots + 1
+            for route, ring in self._routes.items():
+                sketch = QuantileSketch()
+                requests = errors = 0
+                for slot in ring:
+                    if slot is None or slot.epoch < oldest:
+                        continue
+                    sketch.merge(slot.sketch)
+                    requests += slot.requests
+                    errors += slot.errors
+                if not requests:
+                    continue
+                result[route] = {
+                    "requests": requests,
+                    "errors": errors,
+                    "errorRate": errors / requests,
+                    "p50": sketch.quantile(0.5),
+                    "p95": sketch.quantile(0.95),
+                    "p99": sketch.quantile(0.99),
+                }
+        return result
+
+def parse_timestamp(value):
+    """$time_iso8601 (예: 2025-01-01T12:00:00+09:00) 을 epoch 초로 바꿉니다. 실패하면 현재 시각을 사용합니다."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+def parse_latency(value):
+    """request_time 문자열("0.012")을 초 단위 float 로 바꿉니다. 값이 없으면('-') None 을 반환합니다."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def find_breaches(snapshot, p99_ms=SLO_P99_MS, error_rate=SLO_ERROR_RATE, min_requests=SLO_MIN_REQUESTS):
+    """SLO 를 넘은 (route, kind, stats) 목록을 반환합니다. kind 는 'latency' 또는 'errors' 입니다."""
+    breaches = []
+    for route, stats in snapshot.items():
+        if stats["requests"] < min_requests:
+            continue
+        if stats["p99"] is not None and stats["p99"] * 1000 > p99_ms:
+            breaches.append((route, 'latency', stats))
+        if stats["errorRate"] > error_rate:
+            breaches.append((route, 'errors', stats))
+    return breaches
+
+def build_slo_message(breaches, recovered, window_seconds):
+    """SLO 위반/회복 라우트 목록으로 Slack Block Kit 메시지를 만듭니다."""
+    lines = []
+    for route, kind, stats in breaches:
+        reason = (f"p99 *{stats['p99'] * 1000:.0f}ms* > {SLO_P99_MS:.0f}ms" if kind == 'latency'
+                  else f"에러율 *{stats['errorRate'] * 100:.2f}%* > {SLO_ERROR_RATE * 100:.2f}%")
+        lines.append(
+            f"`{route}` {reason}  "
+            f"(요청 {stats['requests']}건, 5xx {stats['errors']}건, "
+            f"p50 {stats['p50'] * 1000:.0f}ms / p95 {stats['p95'] * 1000:.0f}ms)"
+        )
+    for route, kind in recovered:
+        label = 'p99 지연 시간' if kind == 'latency' else '에러율'
+        lines.append(f":white_check_mark: `{route}` {label} 정상화")
+
+    return {
+        "blocks": [
+            {"type": "header", "text": {"type": "plain_text", "text": ":warning: SLO 위반 감지"
+                                        if breaches else ":white_check_mark: SLO 회복"}},
+            {"type": "section", "text": {"type": "mrkdwn", "text": '\n'.join(lines)}},
+            {"type": "context", "elements": [
+                {"type": "mrkdwn", "text": f"최근 {int(window_seconds)}초 기준, 라우트별 요청 {SLO_MIN_REQUESTS}건 이상만 판정"}
+            ]}
+        ]
+    }
+
+class SLOMonitor:
+    """
+    tailer 가 observe() 로 넘긴 로그를 RollingRouteStats 에 더하고,
+    백그라운드 스레드에서 eval_interval 마다 SLO 를 판정하여 위반/회복을 알립니다.
+    같은 (라우트, 항목) 위반은 cooldown 동안 다시 알리지 않습니다.
+    """
+
+    def __init__(self, sender, stats=None, eval_interval=SLO_EVAL_INTERVAL, cooldown=SLO_ALERT_COOLDOWN):
+        self.sender = sender
+        self.stats = stats or RollingRouteStats()
+        self.eval_interval = eval_interval
+        self.cooldown = cooldown
+        # (route, kind) -> 마지막으로 알린 시각(monotonic)
+        self._active = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='slo-monitor', daemon=True)
+        self._thread.start()
+
+    def observe(self, log_entry):
+        try:
+            status = int(log_entry.get('status', 0))
+        except ValueError:
+            return
+        self.stats.observe(
+            normalize_uri(log_entry.get('request_uri')),
+            parse_timestamp(log_entry.get('timestamp')),
+            parse_latency(log_entry.get('request_time')),
+            status >= 500
+        )
+
+    def tick(self, timestamp=None):
+        """새 로그가 없을 때 tailer 가 호출합니다. 집계 구간을 현재 시각까지 옮겨, 요청이 끊긴 라우트도 회복으로 판정되게 합니다."""
+        self.stats.advance(time.time() if timestamp is None else timestamp)
+
+    def evaluate(self, now=None):
+        """한 번 판정하여 보낼 메시지가 있으면 전송합니다. 보낸 메시지(dict) 또는 None 을 반환합니다."""
+        now = time.monotonic() if now is None else now
+        breaches = find_breaches(self.stats.snapshot())
+        current = {(route, kind) for route, kind, _ in breaches}
+
+        to_alert = [b for b in breaches
+                    if now - self._active.get((b[0], b[1]), -math.inf) >= self.cooldown]
+        recovered = sorted(key for key in self._active if key not in current)
+        for key in recovered:
+            del self._active[key]
+        for route, kind, _ in to_alert:
+            self._active[(route, kind)] = now
+
+        if not to_alert and not recovered:
+            return None
+        message = build_slo_message(to_alert, recovered, self.stats.slot_seconds * self.stats.slots)
+        if self.sender.send(message):
+            print(f"[SLO] 위반 {len(to_alert)}건, 회복 {len(recovered)}건을 알렸습니다.")
+        return message
+
+    def _run(self):
+        while not self._stop.wait(self.eval_interval):
+            try:
+                self.evaluate()
+            except Exception as e:
+                print(f"[SLO] 판정 중 오류 발생: {e}")
+
+    def close(self, timeout=None):
+        """판정 스레드를 멈춥니다. timeout 을 주지 않으면 전송 중인 메시지가 재시도를 모두 쓰는 시간만큼 기다립니다."""
+        if timeout is None:
+            timeout = self.sender.max_send_seconds() + 1
+        self._stop.set()
+        self._thread.join(timeout=timeout)
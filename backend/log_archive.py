@@ -0,0 +1,359 @@
+# backend/log_archive.py
+# 하루치 access 로그(JSON 줄)를 압축된 컬럼형 파일(.lca)로 변환하고, 시간/라우트 인덱스로 필요한 블록만 읽어 조회합니다.
+#
+# 파일 구조:
+#   MAGIC | 블록 0 의 컬럼들 | 블록 1 의 컬럼들 | ... | footer(zlib JSON) | footer 오프셋(<Q) | MAGIC
+#   - 블록은 BLOCK_ROWS 줄 단위이며, 컬럼마다 따로 zlib 압축하므로 조회에 필요한 컬럼만 읽습니다.
+#   - 정수 컬럼: ts(블록 최소 시각과의 차이, 초), status, latency_ms, upstream_ms, bytes
+#   - 사전 인코딩 컬럼: method, uri, route, ip, ua, referer, xff (파일 단위 사전의 id 를 저장)
+#   - footer 에는 사전과 블록 인덱스(오프셋, ts 최소/최대, 등장한 route id, 상태 코드 종류)가 들어갑니다.
+#
+# 사용법:
+#   python log_archive.py build --start 2025-01-01 --end 2025-01-20
+#   python log_archive.py query --date 2025-01-20 --from 10:00 --to 11:00 --route /api/posts --status 5xx
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from log_alerter import normalize_uri
+from log_analytics import parse_latency
+
+MAGIC = b'LCA1'
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'log', 'nginx', 'archive')
+# 블록당 줄 수. 작을수록 조회 시 건너뛸 수 있는 범위가 정밀해지고, 클수록 압축률이 좋아집니다.
+BLOCK_ROWS = int(os.getenv("LOG_ARCHIVE_BLOCK_ROWS", 8192))
+ZLIB_LEVEL = 6
+# 값이 없는 지연 시간('-')을 나타내는 값
+MISSING = 0xFFFFFFFF
+
+# (컬럼 이름, array typecode)
+INT_COLUMNS = (('ts', 'I'), ('status', 'H'), ('latency_ms', 'I'), ('upstream_ms', 'I'), ('bytes', 'I'))
+# (컬럼 이름, 로그 필드 이름)
+DICT_COLUMNS = (('method', 'request_method'), ('uri', 'request_uri'), ('route', None), ('ip', 'client_ip'),
+                ('ua', 'user_agent'), ('referer', 'http_referer'), ('xff', 'x_forwarded_for'))
+COLUMN_TYPES = dict(INT_COLUMNS, **{name: 'I' for name, _ in DICT_COLUMNS})
+
+def archive_path_for(date_str, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, f"access-{date_str}.lca")
+
+def _to_ms(value):
+    seconds = parse_latency(value)
+    return MISSING if seconds is None else min(int(round(seconds * 1000)), MISSING - 1)
+
+def _upstream_ms(value):
+    # 여러 upstream 을 거치면 "0.010, 0.020" 처럼 기록되므로 합산합니다.
+    if not value or value == '-':
+        return MISSING
+    total = 0.0
+    for part in value.replace(':', ',').split(','):
+        seconds = parse_latency(part.strip())
+        if seconds is not None:
+            total += seconds
+    return min(int(round(total * 1000)), MISSING - 1)
+
+def _int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+class _Dictionary:
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def encode(self, value):
+        value = value if value is not None else ''
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+class ArchiveWriter:
+    """JSON 로그 항목을 add() 로 받아 블록 단위로 압축하여 파일에 씁니다. close() 시 footer 를 씁니다."""
+
+    def __init__(self, path, block_rows=BLOCK_ROWS):
+        self.path = path
+        self.block_rows = block_rows
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(MAGIC)
+        self._dicts = {name: _Dictionary() for name, _ in DICT_COLUMNS}
+        self._blocks = []
+        self._rows = 0
+        self._utc_offset = None
+        self._reset_buffers()
+
+    def _reset_buffers(self):
+        self._buffers = {name: array(typecode) for name, typecode in COLUMN_TYPES.items()}
+        self._timestamps = []
+
+    def add(self, entry):
+        try:
+            moment = datetime.fromisoformat(entry.get('timestamp'))
+        except (TypeError, ValueError):
+            return False
+        if self._utc_offset is None and moment.utcoffset() is not None:
+            self._utc_offset = int(moment.utcoffset().total_seconds())
+
+        buffers = self._buffers
+        self._timestamps.append(int(moment.timestamp()))
+        buffers['status'].append(_int(entry.get('status')))
+        buffers['latency_ms'].append(_to_ms(entry.get('request_time')))
+        buffers['upstream_ms'].append(_upstream_ms(entry.get('upstream_response_time')))
+        buffers['bytes'].append(min(_int(entry.get('body_bytes_sent')), MISSING))
+        for name, field in DICT_COLUMNS:
+            value = normalize_uri(entry.get('request_uri')) if name == 'route' else entry.get(field)
+            buffers[name].append(self._dicts[name].encode(value))
+
+        self._rows += 1
+        if len(self._timestamps) >= self.block_rows:
+            self._flush_block()
+        return True
+
+    def _flush_block(self):
+        if not self._timestamps:
+            return
+        ts_min, ts_max = min(self._timestamps), max(self._timestamps)
+        self._buffers['ts'] = array('I', (ts - ts_min for ts in self._timestamps))
+
+        columns = {}
+        for name, values in self._buffers.items():
+            data = zlib.compress(values.tobytes(), ZLIB_LEVEL)
+            columns[name] = [self._file.tell(), len(data)]
+            self._file.write(data)
+
+        self._blocks.append({
+            "rows": len(self._timestamps),
+            "tsMin": ts_min,
+            "tsMax": ts_max,
+            "routes": sorted(set(self._buffers['route'])),
+            "statusClasses": sorted({status // 100 for status in self._buffers['status']}),
+            "columns": columns,
+        })
+        self._reset_buffers()
+
+    def close(self):
+        """남은 블록과 footer 를 쓰고 임시 파일을 최종 경로로 교체합니다. 기록한 줄 수를 반환합니다."""
+        self._flush_block()
+        footer = zlib.compress(json.dumps({
+            "version": 1,
+            "rows": self._rows,
+            "utcOffset": self._utc_offset or 0,
+            "byteOrder": sys.byteorder,
+            "dictionaries": {name: d.values for name, d in self._dicts.items()},
+            "blocks": self._blocks,
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), ZLIB_LEVEL)
+        footer_offset = self._file.tell()
+        self._file.write(footer)
+        self._file.write(struct.pack('<Q', footer_offset))
+        self._file.write(MAGIC)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return self._rows
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+def archive_log_file(log_path, archive_path, delete_source=False):
+    """
+    JSON 로그 파일 하나를 컬럼형 파일로 변환합니다. (줄 수, 파싱 실패 줄 수)를 반환합니다.
+    delete_source 가 True 이면 변환 결과를 다시 열어 줄 수를 확인한 뒤 원본을 삭제합니다.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(archive_path)), exist_ok=True)
+    writer = ArchiveWriter(archive_path)
+    skipped = 0
+    try:
+        with open(log_path, 'rb') as f:
+            for raw in f:
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if not writer.add(entry):
+                    skipped += 1
+        rows = writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
+    if delete_source:
+        if ArchiveReader(archive_path).rows == rows:
+            os.remove(log_path)
+        else:
+            print(f"[아카이브] 줄 수가 일치하지 않아 원본을 유지합니다: {log_path}")
+    return rows, skipped
+
+class ArchiveReader:
+    """footer 의 블록 인덱스로 조건에 맞는 블록만 골라, 필요한 컬럼만 읽어 복원합니다."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(4) != MAGIC:
+                raise ValueError(f"컬럼형 로그 파일이 아닙니다: {path}")
+            f.seek(-12, os.SEEK_END)
+            footer_offset, = struct.unpack('<Q', f.read(8))
+            if f.read(4) != MAGIC:
+                raise ValueError(f"파일 끝이 손상되었습니다: {path}")
+            end = f.seek(0, os.SEEK_END) - 12
+            f.seek(footer_offset)
+            footer = json.loads(zlib.decompress(f.read(end - footer_offset)))
+        self.rows = footer["rows"]
+        self.utc_offset = footer["utcOffset"]
+        self.byte_order = footer["byteOrder"]
+        self.dictionaries = footer["dictionaries"]
+        self.blocks = footer["blocks"]
+        self._route_ids = {route: i for i, route in enumerate(self.dictionaries["route"])}
+
+    def select_blocks(self, ts_from=None, ts_to=None, route=None, status_class=None):
+        """시간 범위 [ts_from, ts_to), 라우트, 상태 코드 종류(예: 5) 조건과 겹치는 블록만 반환합니다."""
+        route_id = None
+        if route is not None:
+            route_id = self._route_ids.get(route)
+            if route_id is None:
+                return []
+        selected = []
+        for block in self.blocks:
+            if ts_from is not None and block["tsMax"] < ts_from:
+                continue
+            if ts_to is not None and block["tsMin"] >= ts_to:
+                continue
+            if route_id is not None and route_id not in block["routes"]:
+                continue
+            if status_class is not None and status_class not in block["statusClasses"]:
+                continue
+            selected.append(block)
+        return selected
+
+    def read_columns(self, f, block, names):
+        columns = {}
+        for name in names:
+            offset, length = block["columns"][name]
+            f.seek(offset)
+            values = array(COLUMN_TYPES[name])
+            values.frombytes(zlib.decompress(f.read(length)))
+            if self.byte_order != sys.byteorder:
+                values.byteswap()
+            columns[name] = values
+        return columns
+
+    def query(self, ts_from=None, ts_to=None, route=None, status_class=None, stats=None):
+        """조건에 맞는 줄을 dict 로 하나씩 반환합니다. stats(dict)를 넘기면 읽은 블록 수를 기록합니다."""
+        blocks = self.select_blocks(ts_from, ts_to, route, status_class)
+        if stats is not None:
+            stats["blocksTotal"] = stats.get("blocksTotal", 0) + len(self.blocks)
+            stats["blocksRead"] = stats.get("blocksRead", 0) + len(blocks)
+        route_id = self._route_ids.get(route) if route is not None else None
+        filter_names = ('ts', 'route', 'status')
+        other_names = [name for name in COLUMN_TYPES if name not in filter_names]
+
+        with open(self.path, 'rb') as f:
+            for block in blocks:
+                # 조건 판정에 필요한 컬럼만 먼저 읽고, 맞는 줄이 있을 때만 나머지 컬럼을 읽습니다.
+                columns = self.read_columns(f, block, filter_names)
+                matches = []
+                for i in range(block["rows"]):
+                    ts = block["tsMin"] + columns['ts'][i]
+                    if ts_from is not None and ts < ts_from or ts_to is not None and ts >= ts_to:
+                        continue
+                    if route_id is not None and columns['route'][i] != route_id:
+                        continue
+                    if status_class is not None and columns['status'][i] // 100 != status_class:
+                        continue
+                    matches.append(i)
+                if not matches:
+                    continue
+                columns.update(self.read_columns(f, block, other_names))
+                for i in matches:
+                    ts = block["tsMin"] + columns['ts'][i]
+                    status = columns['status'][i]
+                    row = {
+                        "timestamp": datetime.fromtimestamp(ts, timezone(timedelta(seconds=self.utc_offset))).isoformat(),
+                        "status": status,
+                        "latency_ms": None if columns['latency_ms'][i] == MISSING else columns['latency_ms'][i],
+                        "upstream_ms": None if columns['upstream_ms'][i] == MISSING else columns['upstream_ms'][i],
+                        "bytes": columns['bytes'][i],
+                    }
+                    for name, _ in DICT_COLUMNS:
+                        row[name] = self.dictionaries[name][columns[name][i]]
+                    yield row
+
+def _parse_status(value):
+    """'5xx' -> (5, None), '503' -> (5, 503)"""
+    if value is None:
+        return None, None
+    if value.lower().endswith('xx'):
+        return int(value[0]), None
+    return int(value) // 100, int(value)
+
+def main():
+    from log_processor import LOG_DIR, log_file_name_for
+
+    parser = argparse.ArgumentParser(description="access 로그를 컬럼형 파일로 보관하고 조회합니다.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="지난 날짜의 JSON 로그를 컬럼형 파일로 변환합니다.")
+    build.add_argument('--start', required=True, type=date.fromisoformat)
+    build.add_argument('--end', type=date.fromisoformat)
+    build.add_argument('--delete-source', action='store_true', help="변환을 확인한 뒤 원본 JSON 로그를 삭제합니다.")
+
+    query = commands.add_parser('query', help="컬럼형 파일에서 조건에 맞는 줄을 JSON 줄로 출력합니다.")
+    query.add_argument('--date', required=True, type=date.fromisoformat)
+    query.add_argument('--from', dest='time_from', help="시작 시각 (HH:MM, 로그의 로컬 시간)")
+    query.add_argument('--to', dest='time_to', help="끝 시각 (HH:MM, 포함하지 않음)")
+    query.add_argument('--route', help="정규화된 라우트 (예: /api/posts/:id)")
+    query.add_argument('--status', help="상태 코드 또는 종류 (예: 503, 5xx)")
+    query.add_argument('--count', action='store_true', help="줄 대신 건수만 출력합니다.")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        day = args.start
+        while day <= (args.end or args.start):
+            log_path = os.path.join(LOG_DIR, log_file_name_for(day.isoformat()))
+            if os.path.exists(log_path):
+                started = time.perf_counter()
+                rows, skipped = archive_log_file(log_path, archive_path_for(day.isoformat()), args.delete_source)
+                archived_size = os.path.getsize(archive_path_for(day.isoformat()))
+                print(f"{day}: {rows}줄 (건너뜀 {skipped}) -> {archived_size / 1024:.0f}KB, "
+                      f"{time.perf_counter() - started:.2f}초")
+            day += timedelta(days=1)
+        return
+
+    reader = ArchiveReader(archive_path_for(args.date.isoformat()))
+    tz = timezone(timedelta(seconds=reader.utc_offset))
+
+    def to_ts(value, default):
+        if value is None:
+            return default
+        hour, minute = map(int, value.split(':'))
+        return int(datetime(args.date.year, args.date.month, args.date.day, hour, minute, tzinfo=tz).timestamp())
+
+    status_class, exact_status = _parse_status(args.status)
+    stats = {}
+    count = 0
+    for row in reader.query(to_ts(args.time_from, None), to_ts(args.time_to, None), args.route, status_class, stats):
+        if exact_status is not None and row["status"] != exact_status:
+            continue
+        count += 1
+        if not args.count:
+            print(json.dumps(row, ensure_ascii=False))
+    print(f"{count}건 (읽은 블록 {stats['blocksRead']}/{stats['blocksTotal']})", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
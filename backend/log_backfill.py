@@ -0,0 +1,292 @@
+# backend/log_backfill.py
+# 지난 access 로그(access-YYYY-MM-DD.log)를 날짜 범위로 한꺼번에 읽어 집계하는 CLI 입니다.
+# 장애 조사 시 몇 주치 로그를 빠르게 훑어보기 위한 용도이며, 알림은 보내지 않습니다.
+#
+# - 파일을 READ_CHUNK_BYTES 단위의 줄 경계 구간으로 나누어 프로세스 풀에서 병렬로 처리합니다.
+# - 큰 파일은 mmap 으로 읽어 복사를 줄입니다. (--mmap auto|always|never)
+# - orjson 이 설치되어 있으면 더 빠른 JSON 디코더로 사용합니다. (없으면 표준 json)
+# - 상태 코드/라우트/IP/지연 시간 표를 출력하고, 이후 조회용 컬럼형 요약 파일(gzip JSON)을 저장합니다.
+#
+# 사용법:
+#   python log_backfill.py --start 2025-01-01 --end 2025-01-21 --workers 8 --output log/summary/2025-01.json.gz
+
+import argparse
+import gzip
+import json
+import mmap
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from log_alerter import normalize_uri
+from log_analytics import QuantileSketch, parse_latency, OTHER_ROUTE
+from log_processor import LOG_DIR, log_file_name_for
+
+try:
+    import orjson
+    _loads = orjson.loads
+    JSON_DECODER = 'orjson'
+    _JSON_ERRORS = (orjson.JSONDecodeError, ValueError)
+except ImportError:
+    _loads = json.loads
+    JSON_DECODER = 'json'
+    _JSON_ERRORS = (ValueError,)
+
+# 병렬 처리 단위(바이트). 파일 하나가 이보다 크면 여러 구간으로 나눕니다.
+READ_CHUNK_BYTES = 64 * 1024 * 1024
+# --mmap auto 일 때 mmap 을 사용할 최소 파일 크기
+MMAP_MIN_BYTES = 16 * 1024 * 1024
+# 구간 하나에서 추적할 최대 라우트 수. 넘치는 라우트는 OTHER_ROUTE 로 합칩니다.
+MAX_ROUTES_PER_CHUNK = 2000
+
+def date_range(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+def plan_chunks(paths, chunk_bytes=READ_CHUNK_BYTES):
+    """(path, start, end) 구간 목록을 만듭니다. 구간 경계는 처리 시점에 줄 경계로 맞춥니다."""
+    chunks = []
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_bytes):
+            chunks.append((path, start, min(start + chunk_bytes, size)))
+    return chunks
+
+def iter_lines_mmap(path, start, end):
+    """시작 위치가 [start, end) 안에 있는 줄을 mmap 으로 읽습니다. (앞 구간과 겹치지 않도록 첫 조각은 건너뜀)"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pos = 0 if start == 0 else mm.find(b'\n', start - 1) + 1
+            if pos == 0 and start != 0:
+                return
+            while pos < end and pos < size:
+                newline = mm.find(b'\n', pos)
+                if newline == -1:
+                    newline = size
+                yield mm[pos:newline]
+                pos = newline + 1
+
+def iter_lines_buffered(path, start, end):
+    """iter_lines_mmap 과 같은 구간 규칙으로 일반 버퍼 읽기를 사용합니다."""
+    with open(path, 'rb') as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line
+
+class Aggregate:
+    """구간별 집계 결과. 워커에서 만들어 pickle 로 돌려받은 뒤 merge 로 합칩니다."""
+
+    def __init__(self):
+        self.lines = 0
+        self.bad_lines = 0
+        self.bytes = 0
+        self.status = Counter()
+        self.ips = Counter()
+        self.latency = QuantileSketch()
+        # route -> [requests, errors, QuantileSketch]
+        self.routes = {}
+        # (date, hour, route, status) -> [requests, latency_sum, latency_max]
+        self.hourly = {}
+
+    def add(self, entry):
+        status = str(entry.get('status', '-'))
+        route = normalize_uri(entry.get('request_uri'))
+        if route not in self.routes and len(self.routes) >= MAX_ROUTES_PER_CHUNK:
+            route = OTHER_ROUTE
+        latency = parse_latency(entry.get('request_time'))
+        is_error = status.startswith('5')
+
+        self.status[status] += 1
+        self.ips[entry.get('client_ip', '-')] += 1
+
+        route_stats = self.routes.get(route)
+        if route_stats is None:
+            route_stats = self.routes[route] = [0, 0, QuantileSketch()]
+        route_stats[0] += 1
+        if is_error:
+            route_stats[1] += 1
+
+        # $time_iso8601 형식(2025-01-01T12:34:56+09:00)이므로 잘라서 날짜/시간을 얻습니다. (datetime 파싱보다 빠름)
+        timestamp = entry.get('timestamp') or ''
+        key = (timestamp[:10], timestamp[11:13], route, status)
+        hourly = self.hourly.get(key)
+        if hourly is None:
+            hourly = self.hourly[key] = [0, 0.0, 0.0]
+        hourly[0] += 1
+
+        if latency is not None:
+            self.latency.add(latency)
+            route_stats[2].add(latency)
+            hourly[1] += latency
+            hourly[2] = max(hourly[2], latency)
+
+    def merge(self, other):
+        self.lines += other.lines
+        self.bad_lines += other.bad_lines
+        self.bytes += other.bytes
+        self.status.update(other.status)
+        self.ips.update(other.ips)
+        self.latency.merge(other.latency)
+        for route, (requests, errors, sketch) in other.routes.items():
+            mine = self.routes.get(route)
+            if mine is None:
+                self.routes[route] = [requests, errors, sketch]
+            else:
+                mine[0] += requests
+                mine[1] += errors
+                mine[2].merge(sketch)
+        for key, (requests, latency_sum, latency_max) in other.hourly.items():
+            mine = self.hourly.get(key)
+            if mine is None:
+                self.hourly[key] = [requests, latency_sum, latency_max]
+            else:
+                mine[0] += requests
+                mine[1] += latency_sum
+                mine[2] = max(mine[2], latency_max)
+
+def scan_chunk(path, start, end, mmap_mode='auto'):
+    """프로세스 풀 워커: 구간 하나를 읽어 Aggregate 를 반환합니다."""
+    use_mmap = mmap_mode == 'always' or (mmap_mode == 'auto' and os.path.getsize(path) >= MMAP_MIN_BYTES)
+    reader = iter_lines_mmap if use_mmap else iter_lines_buffered
+    aggregate = Aggregate()
+    for raw in reader(path, start, end):
+        aggregate.bytes += len(raw)
+        raw = raw.strip()
+        if not raw:
+            continue
+        aggregate.lines += 1
+        try:
+            entry = _loads(raw)
+        except _JSON_ERRORS:
+            aggregate.bad_lines += 1
+            continue
+        aggregate.add(entry)
+    return aggregate
+
+def run_backfill(paths, workers=None, mmap_mode='auto', chunk_bytes=READ_CHUNK_BYTES):
+    total = Aggregate()
+    chunks = plan_chunks(paths, chunk_bytes)
+    if workers == 1:
+        for path, start, end in chunks:
+            total.merge(scan_chunk(path, start, end, mmap_mode))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(scan_chunk, path, start, end, mmap_mode) for path, start, end in chunks]
+        for future in futures:
+            total.merge(future.result())
+    return total
+
+def _ms(seconds):
+    return '-' if seconds is None else f"{seconds * 1000:.0f}"
+
+def format_tables(aggregate, top=20):
+    """집계 결과를 사람이 읽을 수 있는 표 문자열로 만듭니다."""
+    lines = ["== 상태 코드 ==", f"{'status':<8} {'requests':>10} {'share':>7}"]
+    for status, count in sorted(aggregate.status.items()):
+        lines.append(f"{status:<8} {count:>10} {count / max(aggregate.lines, 1) * 100:>6.2f}%")
+
+    lines += ["", f"== 라우트 (요청 수 상위 {top}) ==",
+              f"{'route':<40} {'requests':>10} {'5xx':>7} {'err%':>7} {'p50ms':>7} {'p95ms':>7} {'p99ms':>7}"]
+    ordered = sorted(aggregate.routes.items(), key=lambda item: item[1][0], reverse=True)
+    for route, (requests, errors, sketch) in ordered[:top]:
+        lines.append(f"{route[:40]:<40} {requests:>10} {errors:>7} {errors / requests * 100:>6.2f}% "
+                     f"{_ms(sketch.quantile(0.5)):>7} {_ms(sketch.quantile(0.95)):>7} {_ms(sketch.quantile(0.99)):>7}")
+
+    lines += ["", f"== 클라이언트 IP (상위 {top}) ==", f"{'client_ip':<40} {'requests':>10}"]
+    for ip, count in aggregate.ips.most_common(top):
+        lines.append(f"{ip:<40} {count:>10}")
+
+    sketch = aggregate.latency
+    lines += ["", "== 전체 지연 시간(request_time) ==",
+              f"p50 {_ms(sketch.quantile(0.5))}ms / p90 {_ms(sketch.quantile(0.9))}ms / "
+              f"p99 {_ms(sketch.quantile(0.99))}ms / p99.9 {_ms(sketch.quantile(0.999))}ms"]
+    return '\n'.join(lines)
+
+def build_columnar_summary(aggregate, start, end):
+    """
+    이후 조회용 컬럼형 요약. 행 대신 컬럼별 배열로 저장하여 gzip 압축률이 높고,
+    pandas.DataFrame(summary["hourly"]) 처럼 바로 표로 불러올 수 있습니다.
+    """
+    hourly_keys = sorted(aggregate.hourly)
+    hourly = {"date": [], "hour": [], "route": [], "status": [], "requests": [], "latencySum": [], "latencyMax": []}
+    for key in hourly_keys:
+        requests, latency_sum, latency_max = aggregate.hourly[key]
+        for column, value in zip(("date", "hour", "route", "status"), key):
+            hourly[column].append(value)
+        hourly["requests"].append(requests)
+        hourly["latencySum"].append(round(latency_sum, 3))
+        hourly["latencyMax"].append(latency_max)
+
+    routes = {"route": [], "requests": [], "errors": [], "p50": [], "p95": [], "p99": []}
+    for route, (requests, errors, sketch) in sorted(aggregate.routes.items()):
+        routes["route"].append(route)
+        routes["requests"].append(requests)
+        routes["errors"].append(errors)
+        for q, column in ((0.5, "p50"), (0.95, "p95"), (0.99, "p99")):
+            value = sketch.quantile(q)
+            routes[column].append(None if value is None else round(value, 4))
+
+    return {
+        "version": 1,
+        "range": {"start": start.isoformat(), "end": end.isoformat()},
+        "lines": aggregate.lines,
+        "badLines": aggregate.bad_lines,
+        "hourly": hourly,
+        "routes": routes,
+        "status": dict(aggregate.status),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="지난 Nginx access 로그를 날짜 범위로 병렬 집계합니다.")
+    parser.add_argument('--start', required=True, type=date.fromisoformat, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--end', type=date.fromisoformat, help="끝 날짜 (포함, 기본: 시작 날짜)")
+    parser.add_argument('--log-dir', default=LOG_DIR)
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수, 1 이면 풀 없이 실행)")
+    parser.add_argument('--mmap', choices=['auto', 'always', 'never'], default='auto')
+    parser.add_argument('--top', type=int, default=20, help="표에 출력할 상위 항목 수")
+    parser.add_argument('--output', help="컬럼형 요약 파일 경로 (.json.gz)")
+    args = parser.parse_args()
+    end = args.end or args.start
+
+    paths = []
+    for day in date_range(args.start, end):
+        path = os.path.join(args.log_dir, log_file_name_for(day.isoformat()))
+        if os.path.exists(path):
+            paths.append(path)
+        else:
+            print(f"로그 파일이 없어 건너뜁니다: {path}")
+    if not paths:
+        print("처리할 로그 파일이 없습니다.")
+        return
+
+    started = time.perf_counter()
+    aggregate = run_backfill(paths, workers=args.workers, mmap_mode=args.mmap)
+    elapsed = time.perf_counter() - started
+
+    print(format_tables(aggregate, top=args.top))
+    print()
+    print(f"파일 {len(paths)}개, {aggregate.lines}줄 (파싱 실패 {aggregate.bad_lines}줄), "
+          f"{aggregate.bytes / 1024 / 1024:.1f}MB 를 {elapsed:.2f}초에 처리 "
+          f"-> {aggregate.lines / elapsed if elapsed else 0:,.0f} lines/sec (JSON: {JSON_DECODER})")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with gzip.open(args.output, 'wt', encoding='utf-8') as f:
+            json.dump(build_columnar_summary(aggregate, args.start, end), f, ensure_ascii=False, separators=(',', ':'))
+        print(f"요약 파일 저장: {args.output}")
+
+if __name__ == '__main__':
+    main()
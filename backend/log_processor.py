@@ -1,124 +1,356 @@
 # backend/log_processor.py
 
+import argparse
 import json
 import os
-import requests
-from datetime import datetime
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from log_alerter import AlertBatcher, SlackSender
+from log_analytics import SLOMonitor
+from log_archive import archive_log_file, archive_path_for
 
 # --- 설정 --- #
 LOG_DIR = os.path.join(os.path.dirname(__file__), 'log', 'nginx')
-STATE_FILE_PATH = os.path.join(LOG_DIR, 'last_processed_position.txt')
+STATE_FILE_PATH = os.path.join(LOG_DIR, 'last_processed_position.json')
+# 이전 버전이 오프셋만 저장하던 상태 파일. 처음 실행 시 한 번 읽어서 이어서 처리합니다.
+LEGACY_STATE_FILE_PATH = os.path.join(LOG_DIR, 'last_processed_position.txt')
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
+# 새 로그가 없을 때 다시 확인하기까지 기다리는 시간(초). inotify 를 사용할 수 있으면 변경 즉시 깨어납니다.
+POLL_INTERVAL = float(os.getenv("LOG_POLL_INTERVAL", 1.0))
+# 한 번에 읽는 바이트 수. 파일 전체를 메모리에 올리지 않고 이 크기 단위로 스트리밍합니다.
+READ_CHUNK_SIZE = 64 * 1024
+# 날짜가 바뀌어 더 이상 기록되지 않는 로그 파일을 컬럼형 파일(log_archive.py)로 변환할지 여부와,
+# 변환을 확인한 뒤 원본 JSON 로그를 삭제할지 여부
+LOG_ARCHIVE_ENABLED = os.getenv("LOG_ARCHIVE_ENABLED", "true").lower() == "true"
+LOG_ARCHIVE_DELETE_SOURCE = os.getenv("LOG_ARCHIVE_DELETE_SOURCE", "false").lower() == "true"
 
-def send_notification(log_data):
-    """주어진 로그 데이터를 기반으로 Slack 알림을 전송합니다."""
-    if not SLACK_WEBHOOK_URL:
-        print("[에러] SLACK_WEBHOOK_URL 환경 변수가 설정되지 않았습니다.")
-        return
+def log_file_name_for(date_str):
+    return f"access-{date_str}.log"
 
-    message = {
-        "blocks": [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": ":alert: 5xx 서버 에러 발생!"
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {"type": "mrkdwn", "text": f"*Timestamp:*
-`{log_data.get('timestamp')}`"},
-                    {"type": "mrkdwn", "text": f"*Status Code:*
-`{log_data.get('status')}`"},
-                    {"type": "mrkdwn", "text": f"*Client IP:*
-`{log_data.get('client_ip')}`"},
-                    {"type": "mrkdwn", "text": f"*Request:*
-`{log_data.get('request_method')} {log_data.get('request_uri')}`"}
-                ]
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"User Agent: `{log_data.get('user_agent')}`"
-                    }
-                ]
-            }
-        ]
-    }
+def date_str_for(file_name):
+    """log_file_name_for 의 반대. 날짜별 로그 파일 이름이 아니면 None 을 반환합니다."""
+    if not (file_name.startswith('access-') and file_name.endswith('.log')):
+        return None
+    return file_name[len('access-'):-len('.log')]
 
-    try:
-        response = requests.post(SLACK_WEBHOOK_URL, json=message)
-        response.raise_for_status()
-        print(f"[알림 성공] 5xx 에러 로그를 Slack으로 전송했습니다.")
-    except requests.exceptions.RequestException as e:
-        print(f"[알림 실패] Slack으로 알림을 보내는 중 오류가 발생했습니다: {e}")
-
-def get_last_position():
-    """상태 파일에서 마지막으로 처리한 파일 위치를 읽어옵니다."""
-    if not os.path.exists(STATE_FILE_PATH):
-        return 0
-    with open(STATE_FILE_PATH, 'r') as f:
+def today_str():
+    # Nginx 의 $time_iso8601 과 같은 (컨테이너) 로컬 시간 기준 날짜를 사용합니다.
+    return datetime.now().strftime('%Y-%m-%d')
+
+def make_line_handler(alerter, monitor=None):
+    """
+    완성된 로그 한 줄을 파싱하여 5xx 응답이면 alerter 에 넘기는 핸들러를 만듭니다.
+    monitor(SLOMonitor)가 주어지면 모든 줄을 라우트별 지연 시간/에러율 집계에도 더합니다.
+    """
+    def handle_log_line(line):
+        try:
+            log_entry = json.loads(line)
+
+            if monitor is not None:
+                monitor.observe(log_entry)
+
+            if 'status' in log_entry and 500 <= int(log_entry['status']) < 600:
+                # Slack 전송은 alerter 의 백그라운드 스레드가 모아서 처리하므로 여기서는 막히지 않습니다.
+                alerter.submit(log_entry)
+
+        except (json.JSONDecodeError, ValueError):
+            print(f"로그 라인 처리 오류: {line}")
+        except Exception as e:
+            print(f"알 수 없는 오류 발생: {e}")
+    return handle_log_line
+
+class TailState:
+    """
+    어떤 파일(이름 + inode)의 어디까지(바이트 오프셋) 처리했는지를 나타냅니다.
+    inode 를 함께 저장하므로 같은 이름의 파일이 새로 만들어졌는지(로테이션) 알 수 있습니다.
+    """
+
+    def __init__(self, file_name=None, inode=None, offset=0):
+        self.file_name = file_name
+        self.inode = inode
+        self.offset = offset
+
+    @classmethod
+    def load(cls, path=STATE_FILE_PATH, legacy_path=LEGACY_STATE_FILE_PATH):
+        """상태 파일을 읽습니다. 새 형식이 없으면 이전 형식(오늘 파일의 오프셋)을 이어받습니다."""
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                return cls(data.get('file'), data.get('inode'), int(data.get('offset', 0)))
+            except (ValueError, OSError) as e:
+                print(f"상태 파일을 읽을 수 없어 처음부터 처리합니다: {e}")
+                return cls()
+        if os.path.exists(legacy_path):
+            with open(legacy_path, 'r') as f:
+                try:
+                    return cls(log_file_name_for(today_str()), None, int(f.read().strip()))
+                except ValueError:
+                    pass
+        return cls()
+
+    def save(self, path=STATE_FILE_PATH):
+        """임시 파일에 쓴 뒤 os.replace 로 교체하여, 중간에 종료되어도 상태 파일이 깨지지 않게 합니다."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"file": self.file_name, "inode": self.inode, "offset": self.offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+class ChangeWaiter:
+    """로그 디렉토리에 변경이 생길 때까지 기다립니다. inotify_simple 이 설치되어 있으면 inotify, 아니면 폴링을 사용합니다."""
+
+    def __init__(self, directory, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._inotify = None
         try:
-            return int(f.read().strip())
+            from inotify_simple import INotify, flags
+            self._inotify = INotify()
+            self._inotify.add_watch(directory, flags.MODIFY | flags.CREATE | flags.MOVED_TO)
+        except (ImportError, OSError):
+            self._inotify = None
+
+    def wait(self):
+        if self._inotify is not None:
+            # 이벤트가 없더라도 poll_interval 마다 깨어나 날짜 변경 등을 확인합니다.
+            self._inotify.read(timeout=int(self.poll_interval * 1000))
+        else:
+            time.sleep(self.poll_interval)
+
+class LogTailer:
+    """
+    날짜별 access 로그를 계속 따라가며(tail -F) 완성된 줄만 한 줄씩 처리합니다.
+    - 줄 끝(\n)이 아직 기록되지 않은 마지막 조각은 다음 읽기까지 보관하고, 오프셋에도 반영하지 않습니다.
+    - inode 가 바뀌면(로테이션) 새 파일을 처음부터, 크기가 줄면(잘림) 처음부터 다시 읽습니다.
+    - 자정에 새 날짜의 파일이 생기면 이전 파일의 남은 줄을 모두 처리한 뒤 새 파일로 넘어갑니다.
+      여러 날 멈춰 있었다면 그사이 날짜의 파일을 하나씩 끝까지 처리합니다.
+      파일을 마칠 때마다 on_file_finished(이전 파일 이름)가 주어져 있으면 호출합니다.
+    - 새로 처리할 줄이 없어 기다리기 직전마다 on_idle() 이 주어져 있으면 호출합니다. (SLO 집계 구간을 현재 시각으로 옮기는 용도)
+    """
+
+    def __init__(self, line_handler, log_dir=LOG_DIR, state_path=STATE_FILE_PATH, date_func=today_str,
+                 on_file_finished=None, on_idle=None):
+        self.log_dir = log_dir
+        self.state_path = state_path
+        self.line_handler = line_handler
+        self.date_func = date_func
+        self.on_file_finished = on_file_finished
+        self.on_idle = on_idle
+        self.state = TailState.load(state_path)
+        self._file = None
+        self._partial = b''
+
+    def _path(self, file_name):
+        return os.path.join(self.log_dir, file_name)
+
+    def _open(self, file_name):
+        """file_name 을 열고 저장된 상태와 비교하여 이어서 읽을 위치를 정합니다."""
+        self._close()
+        self._file = open(self._path(file_name), 'rb')
+        st = os.fstat(self._file.fileno())
+
+        if self.state.file_name != file_name:
+            offset = 0
+        elif self.state.inode is not None and self.state.inode != st.st_ino:
+            print(f"로그 파일이 교체되었습니다(inode 변경). 처음부터 다시 처리합니다: {file_name}")
+            offset = 0
+        elif self.state.offset > st.st_size:
+            print(f"로그 파일이 초기화되었습니다. 처음부터 다시 처리합니다: {file_name}")
+            offset = 0
+        else:
+            offset = self.state.offset
+
+        self._file.seek(offset)
+        self._partial = b''
+        self.state = TailState(file_name, st.st_ino, offset)
+        self.state.save(self.state_path)
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _check_file(self):
+        """
+        이름이 가리키는 파일이 열려 있는 파일과 다르면 'rotated',
+        같은 파일인데 읽은 위치보다 작아졌으면 'truncated', 그 외에는 None 을 반환합니다.
+        """
+        try:
+            st = os.stat(self._path(self.state.file_name))
+        except FileNotFoundError:
+            return None
+        if st.st_ino != self.state.inode:
+            return 'rotated'
+        if st.st_size < self.state.offset + len(self._partial):
+            return 'truncated'
+        return None
+
+    def _drain(self, final=False):
+        """현재 파일에서 새로 기록된 내용을 끝까지 읽어 완성된 줄을 처리합니다. 처리한 줄 수를 반환합니다."""
+        processed = 0
+        while True:
+            chunk = self._file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            data = self._partial + chunk
+            lines = data.split(b'\n')
+            # 마지막 원소는 줄 끝이 없는 조각(또는 빈 문자열)이므로 다음 읽기로 넘깁니다.
+            self._partial = lines.pop()
+            for raw in lines:
+                self.state.offset += len(raw) + 1
+                line = raw.decode('utf-8', errors='replace').strip()
+                if line:
+                    self.line_handler(line)
+                    processed += 1
+            if lines:
+                self.state.save(self.state_path)
+
+        # 더 이상 기록되지 않는 이전 날짜 파일은 줄 끝이 없는 마지막 조각까지 처리합니다.
+        if final and self._partial:
+            self.state.offset += len(self._partial)
+            line = self._partial.decode('utf-8', errors='replace').strip()
+            self._partial = b''
+            if line:
+                self.line_handler(line)
+                processed += 1
+            self.state.save(self.state_path)
+        return processed
+
+    def _next_file(self, file_name, today_file):
+        """
+        file_name 다음 날짜부터 오늘까지 하루씩 확인하여 처음으로 존재하는 로그 파일 이름을 반환합니다. 없으면 None.
+        처리기가 며칠 동안 멈춰 있었더라도 그사이 날짜의 파일을 건너뛰지 않도록 합니다.
+        """
+        try:
+            day = datetime.strptime(date_str_for(file_name) or '', '%Y-%m-%d').date()
+            today = datetime.strptime(date_str_for(today_file), '%Y-%m-%d').date()
         except ValueError:
-            return 0
+            return today_file if os.path.exists(self._path(today_file)) else None
+        if day >= today:
+            # 시계가 되돌아간 경우 등. 오늘 파일이 있으면 그 파일로 넘어갑니다.
+            return today_file if os.path.exists(self._path(today_file)) else None
+        while day < today:
+            day += timedelta(days=1)
+            candidate = log_file_name_for(day.strftime('%Y-%m-%d'))
+            if os.path.exists(self._path(candidate)):
+                return candidate
+        return None
+
+    def poll(self):
+        """한 번 확인하여 처리할 수 있는 줄을 모두 처리합니다. 처리한 줄 수를 반환합니다."""
+        processed = 0
+        today_file = log_file_name_for(self.date_func())
+
+        if self._file is None:
+            # 처음 시작할 때는 상태 파일에 기록된 파일(며칠 전 파일일 수 있음)부터 이어서 처리합니다.
+            # 그 파일이 없으면(아카이브 후 삭제 등) 그다음 날짜의 파일부터 처리합니다.
+            start_file = self.state.file_name or today_file
+            if not os.path.exists(self._path(start_file)):
+                start_file = self._next_file(start_file, today_file) if start_file != today_file else None
+            if start_file is None or not os.path.exists(self._path(start_file)):
+                return 0
+            self._open(start_file)
+
+        change = self._check_file()
+        if change == 'rotated':
+            # 이름이 바뀐 이전 파일은 열린 파일 디스크립터로 끝까지 읽은 뒤 새 파일을 엽니다.
+            processed += self._drain(final=True)
+            self._open(self.state.file_name)
+        elif change == 'truncated':
+            self._open(self.state.file_name)
+
+        while self.state.file_name != today_file:
+            # 날짜가 바뀌었고 다음 날짜의 파일이 생겼으면, 이전 파일은 더 이상 기록되지 않으므로 끝까지 처리한 뒤 넘어갑니다.
+            # 여러 날이 지났으면 그사이 날짜의 파일도 하나씩 끝까지 처리합니다.
+            next_file = self._next_file(self.state.file_name, today_file)
+            if next_file is None:
+                break
+            processed += self._drain(final=True)
+            finished_file = self.state.file_name
+            print(f"로그 파일 전환: {finished_file} -> {next_file}")
+            self._open(next_file)
+            if self.on_file_finished is not None:
+                self.on_file_finished(finished_file)
 
-def save_last_position(position):
-    """상태 파일에 마지막으로 처리한 파일 위치를 저장합니다."""
-    with open(STATE_FILE_PATH, 'w') as f:
-        f.write(str(position))
+        processed += self._drain()
+        return processed
+
+    def run_forever(self, waiter=None):
+        waiter = waiter or ChangeWaiter(self.log_dir)
+        print(f"로그 tail 시작: {self.log_dir}")
+        try:
+            while True:
+                if self.poll() == 0:
+                    if self.on_idle is not None:
+                        self.on_idle()
+                    waiter.wait()
+        finally:
+            # 종료 신호로 줄 처리 도중 멈췄더라도 마지막으로 처리한 위치를 남겨, 재시작 시 같은 줄을 다시 알리지 않습니다.
+            if self.state.file_name is not None:
+                self.state.save(self.state_path)
+            self._close()
+
+def archive_in_background(file_name, log_dir=LOG_DIR):
+    """처리가 끝난 날짜의 로그를 별도 스레드에서 컬럼형 파일로 변환합니다. (tail 을 멈추지 않도록)"""
+    def run():
+        date_str = date_str_for(file_name)
+        try:
+            rows, skipped = archive_log_file(os.path.join(log_dir, file_name), archive_path_for(date_str),
+                                             delete_source=LOG_ARCHIVE_DELETE_SOURCE)
+            print(f"[아카이브] {file_name}: {rows}줄 변환 완료 (건너뜀 {skipped}줄)")
+        except Exception as e:
+            print(f"[아카이브] {file_name} 변환 실패: {e}")
+    threading.Thread(target=run, name=f"archive-{file_name}").start()
 
 def process_logs_for_date(date_str):
-    """특정 날짜의 로그 파일을 처리합니다."""
-    log_file_name = f"access-{date_str}.log"
-    log_file_path = os.path.join(LOG_DIR, log_file_name)
+    """특정 날짜의 로그 파일을 현재까지 기록된 부분만 한 번 처리합니다. (일회성 실행용)"""
+    log_file_path = os.path.join(LOG_DIR, log_file_name_for(date_str))
 
     if not os.path.exists(log_file_path):
         print(f"로그 파일이 존재하지 않습니다: {log_file_path}")
         return
 
     print(f"로그 처리 시작: {log_file_path}")
-    
-    last_position = get_last_position()
-    current_size = os.path.getsize(log_file_path)
-
-    # 로그 파일이 초기화되었는지 확인 (파일 크기가 줄어든 경우)
-    if last_position > current_size:
-        print("로그 파일이 초기화되었습니다. 처음부터 다시 처리합니다.")
-        last_position = 0
-
-    with open(log_file_path, 'r') as f:
-        f.seek(last_position)
-        new_logs = f.readlines()
-        
-        for line in new_logs:
-            try:
-                log_entry = json.loads(line.strip())
-                
-                if 'status' in log_entry and 500 <= int(log_entry['status']) < 600:
-                    send_notification(log_entry)
-
-            except (json.JSONDecodeError, ValueError):
-                print(f"로그 라인 처리 오류: {line.strip()}")
-            except Exception as e:
-                print(f"알 수 없는 오류 발생: {e}")
-
-    save_last_position(current_size)
+    sender = SlackSender(SLACK_WEBHOOK_URL)
+    alerter = AlertBatcher(sender)
+    monitor = SLOMonitor(sender)
+    tailer = LogTailer(make_line_handler(alerter, monitor), date_func=lambda: date_str)
+    try:
+        tailer.poll()
+        # 일회성 실행은 판정 주기를 기다리지 않고 마지막으로 한 번 판정합니다.
+        monitor.evaluate()
+    finally:
+        tailer._close()
+        monitor.close()
+        alerter.close()
     print(f"로그 처리 완료: {log_file_path}")
 
+def _exit_on_signal(signum, frame):
+    # SystemExit 으로 바꾸어 finally 의 알림 flush(AlertBatcher/SLOMonitor)와 tail 상태 저장이 실행되도록 합니다.
+    raise SystemExit(128 + signum)
+
 if __name__ == "__main__":
-    import os
-    print("--- All Environment Variables ---")
-    for key, value in os.environ.items():
-        print(f'{key}={value}')
-    print("---------------------------------")
+    parser = argparse.ArgumentParser(description="Nginx access 로그를 따라가며 5xx 에러와 라우트별 SLO 위반을 알립니다.")
+    parser.add_argument('--once', action='store_true', help="오늘 로그를 한 번만 처리하고 종료합니다.")
+    args = parser.parse_args()
 
     if not SLACK_WEBHOOK_URL:
         print("[시작 실패] SLACK_WEBHOOK_URL 환경 변수가 필요합니다.")
+    elif args.once:
+        process_logs_for_date(today_str())
     else:
-        today_str = datetime.now().strftime('%Y-%m-%d')
-        process_logs_for_date(today_str)
+        # docker stop/systemd 는 SIGTERM 으로 종료를 요청합니다. (기본 동작은 finally 없이 즉시 종료)
+        signal.signal(signal.SIGTERM, _exit_on_signal)
+        sender = SlackSender(SLACK_WEBHOOK_URL)
+        alerter = AlertBatcher(sender)
+        monitor = SLOMonitor(sender)
+        try:
+            LogTailer(make_line_handler(alerter, monitor),
+                      on_file_finished=archive_in_background if LOG_ARCHIVE_ENABLED else None,
+                      on_idle=monitor.tick).run_forever()
+        finally:
+            monitor.close()
+            alerter.close()
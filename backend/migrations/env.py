@@ -56,6 +56,15 @@ def get_metadata():
     return target_db.metadata
 
 
+# 모델에 매핑하지 않고 마이그레이션으로만 관리하는 Postgres 전용 검색 컬럼/인덱스.
+# autogenerate 가 이를 삭제하는 마이그레이션을 만들지 않도록 비교 대상에서 제외합니다.
+UNMAPPED_SCHEMA_OBJECTS = {'search_vector', 'ix_posts_search_vector', 'ix_posts_title_trgm', 'ix_posts_content_trgm'}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return name not in UNMAPPED_SCHEMA_OBJECTS
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -70,7 +79,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -98,6 +108,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
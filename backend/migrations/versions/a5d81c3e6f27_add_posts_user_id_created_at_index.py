@@ -0,0 +1,47 @@
+"""Add composite (user_id, created_at DESC, id DESC) index on posts for per-user listing
+
+Revision ID: a5d81c3e6f27
+Revises: e7f3a9c2b184
+Create Date: 2025-10-20 10:41:08.214735
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d81c3e6f27'
+down_revision = 'e7f3a9c2b184'
+branch_labels = None
+depends_on = None
+
+
+def _create_index(**kwargs):
+    # 사용자별 목록은 user_id 로 범위를 좁힌 뒤 (created_at, id) 최신순으로 keyset 페이지네이션을 하고,
+    # 게시글 수는 같은 인덱스의 user_id 범위만 세면 되므로 posts 테이블 전체를 읽지 않습니다.
+    op.create_index(
+        'ix_posts_user_id_created_at_id',
+        'posts',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        **kwargs
+    )
+
+
+def upgrade():
+    # Postgres 에서는 테이블 쓰기를 막지 않도록 CREATE INDEX CONCURRENTLY 로 만듭니다.
+    # CONCURRENTLY 는 트랜잭션 안에서 실행할 수 없으므로 마이그레이션 트랜잭션 밖(autocommit)에서 실행하며,
+    # 중간에 실패하면 INVALID 인덱스가 남으므로 DROP INDEX 후 다시 적용하세요.
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            _create_index(postgresql_concurrently=True)
+    else:
+        _create_index()
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_posts_user_id_created_at_id', table_name='posts', postgresql_concurrently=True)
+    else:
+        op.drop_index('ix_posts_user_id_created_at_id', table_name='posts')
@@ -0,0 +1,45 @@
+"""Add composite (created_at DESC, id DESC) index on posts for keyset pagination
+
+Revision ID: c41d7e2f9a13
+Revises: 8b2a27423dfa
+Create Date: 2025-10-02 14:12:31.502118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e2f9a13'
+down_revision = '8b2a27423dfa'
+branch_labels = None
+depends_on = None
+
+
+def _create_index(**kwargs):
+    op.create_index(
+        'ix_posts_created_at_id',
+        'posts',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        **kwargs
+    )
+
+
+def upgrade():
+    # Postgres 에서는 테이블 쓰기를 막지 않도록 CREATE INDEX CONCURRENTLY 로 만듭니다.
+    # CONCURRENTLY 는 트랜잭션 안에서 실행할 수 없으므로 마이그레이션 트랜잭션 밖(autocommit)에서 실행하며,
+    # 중간에 실패하면 INVALID 인덱스가 남으므로 DROP INDEX 후 다시 적용하세요.
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            _create_index(postgresql_concurrently=True)
+    else:
+        _create_index()
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_posts_created_at_id', table_name='posts', postgresql_concurrently=True)
+    else:
+        op.drop_index('ix_posts_created_at_id', table_name='posts')
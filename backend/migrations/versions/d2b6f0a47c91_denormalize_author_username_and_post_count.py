@@ -0,0 +1,66 @@
+"""Denormalize posts.author_username and users.post_count, backfilled in batches
+
+Revision ID: d2b6f0a47c91
+Revises: a5d81c3e6f27
+Create Date: 2025-10-23 16:02:44.930512
+
+두 컬럼 추가는 Postgres 11 이상에서 테이블을 다시 쓰지 않습니다. (NULL 허용, 상수 기본값)
+채우기는 id 범위 BATCH_SIZE 개씩 나누어 실행하고, Postgres 에서는 배치마다 커밋하여
+한 번에 잠그는 행 수와 트랜잭션 길이를 제한합니다. 중간에 실패해도 다시 실행하면 이어서 채웁니다.
+
+배포 순서 (새 버전 코드는 두 컬럼이 있어야 동작하므로 마이그레이션을 먼저 적용합니다.)
+  1. 이 마이그레이션을 적용합니다. 이전 버전 서버는 새 컬럼을 사용하지 않으므로 그대로 동작합니다.
+  2. 모든 서버를 새 버전으로 바꿉니다.
+  3. `flask backfill-denormalized` 를 실행합니다. 그사이 이전 버전 서버가 만든 게시글의 author_username 을 채우고,
+     여기서 센 post_count 는 서비스 중의 작성/삭제와 겹쳐 어긋날 수 있으므로 사용자 행을 잠근 채 다시 셉니다.
+  4. POSTS_DENORMALIZED_AUTHOR=true 로 읽기 경로를 전환합니다.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b6f0a47c91'
+down_revision = 'a5d81c3e6f27'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def _backfill_in_batches(table, statement):
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text(f"SELECT max(id) FROM {table}")).scalar() or 0
+    for start in range(1, max_id + 1, BATCH_SIZE):
+        bind.execute(sa.text(statement), {"start": start, "end": start + BATCH_SIZE})
+
+
+def _backfill():
+    _backfill_in_batches('posts', """
+        UPDATE posts SET author_username = (SELECT username FROM users WHERE users.id = posts.user_id)
+        WHERE id >= :start AND id < :end AND author_username IS NULL
+    """)
+    # (user_id, created_at, id) 인덱스로 사용자별 게시글 수를 셉니다.
+    _backfill_in_batches('users', """
+        UPDATE users SET post_count = (SELECT count(*) FROM posts WHERE posts.user_id = users.id)
+        WHERE id >= :start AND id < :end
+    """)
+
+
+def upgrade():
+    op.add_column('posts', sa.Column('author_username', sa.String(length=50), nullable=True))
+    op.add_column('users', sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # 배치마다 커밋되도록 마이그레이션 트랜잭션 밖에서 실행합니다.
+        with op.get_context().autocommit_block():
+            _backfill()
+    else:
+        _backfill()
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('post_count')
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('author_username')
@@ -0,0 +1,60 @@
+"""Add full-text search on posts: generated tsvector column, GIN index, pg_trgm indexes
+
+Revision ID: e7f3a9c2b184
+Revises: c41d7e2f9a13
+Create Date: 2025-10-09 10:41:07.218843
+
+search_vector 는 모델에 매핑하지 않는 Postgres 전용 컬럼이므로 migrations/env.py 의
+include_object 에서 autogenerate 비교 대상에서 제외합니다.
+STORED 생성 컬럼을 추가하면 ACCESS EXCLUSIVE 잠금을 잡고 테이블 전체를 다시 쓰므로, 그동안 posts 의 읽기/쓰기가 멈춥니다.
+nullable 컬럼 + 트리거 + 배치 채우기로 나누는 대신 이 재작성을 감수하기로 했으므로, 게시글이 많다면 트래픽이 적은 시간에 적용하세요.
+인덱스는 재작성이 끝나 잠금이 풀린 뒤 CONCURRENTLY 로 만듭니다.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7f3a9c2b184'
+down_revision = 'c41d7e2f9a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # 'simple' 설정은 불용어 제거/어간 추출 없이 소문자화만 하므로 한국어/영어가 섞인 글에도 안전합니다.
+    # 제목(A)이 내용(B)보다 높은 가중치를 받습니다.
+    op.execute("""
+        ALTER TABLE posts ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+        ) STORED
+    """)
+
+    # 부분 문자열 검색(ILIKE '%검색어%')용 trigram 인덱스
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # GIN 인덱스는 만드는 데 오래 걸리므로 테이블 쓰기를 막지 않도록 CREATE INDEX CONCURRENTLY 로 만듭니다.
+    # CONCURRENTLY 는 트랜잭션 안에서 실행할 수 없으므로 마이그레이션 트랜잭션 밖(autocommit)에서 실행하며,
+    # 중간에 실패하면 INVALID 인덱스가 남으므로 DROP INDEX 후 다시 적용하세요.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_posts_search_vector', 'posts', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True)
+        op.create_index('ix_posts_title_trgm', 'posts', ['title'], postgresql_using='gin',
+                        postgresql_ops={'title': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_posts_content_trgm', 'posts', ['content'], postgresql_using='gin',
+                        postgresql_ops={'content': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_content_trgm', table_name='posts', postgresql_concurrently=True)
+        op.drop_index('ix_posts_title_trgm', table_name='posts', postgresql_concurrently=True)
+        op.drop_index('ix_posts_search_vector', table_name='posts', postgresql_concurrently=True)
+    op.drop_column('posts', 'search_vector')
@@ -0,0 +1,36 @@
+"""Add composite (updated_at, id) index on posts for incremental export
+
+Revision ID: f19c4b7d2e60
+Revises: d2b6f0a47c91
+Create Date: 2025-10-27 11:18:52.604127
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f19c4b7d2e60'
+down_revision = 'd2b6f0a47c91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # updated_since 이후에 바뀐 게시글만 (updated_at, id) 순서대로 읽어, 정렬 없이 인덱스 순서로 내보냅니다.
+    # Postgres 에서는 테이블 쓰기를 막지 않도록 CREATE INDEX CONCURRENTLY 로 만듭니다.
+    # CONCURRENTLY 는 트랜잭션 안에서 실행할 수 없으므로 마이그레이션 트랜잭션 밖(autocommit)에서 실행하며,
+    # 중간에 실패하면 INVALID 인덱스가 남으므로 DROP INDEX 후 다시 적용하세요.
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index('ix_posts_updated_at_id', 'posts', ['updated_at', 'id'], unique=False,
+                            postgresql_concurrently=True)
+    else:
+        op.create_index('ix_posts_updated_at_id', 'posts', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_posts_updated_at_id', table_name='posts', postgresql_concurrently=True)
+    else:
+        op.drop_index('ix_posts_updated_at_id', table_name='posts')
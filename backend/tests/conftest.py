@@ -0,0 +1,56 @@
+# pytest 공통 설정. backend 디렉토리에서 `python -m pytest` 로 실행합니다.
+# 테스트마다 SQLite DB 로 앱을 새로 만들며, 설정은 TestConfig 를 상속한 클래스로 바꿉니다.
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+import config
+from app import create_app, db
+
+class TestConfig(config.Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_BINDS = {}
+    CACHE_BACKEND = 'none'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    PASSWORD_HASH_WORKERS = 0
+    REQUEST_METRICS_LOG = False
+
+@pytest.fixture
+def make_app(monkeypatch):
+    """설정 값을 덮어쓴 앱을 만들고 테이블을 생성하는 함수를 반환합니다. 예) make_app(CACHE_BACKEND='memory')"""
+    apps = []
+
+    def make(**overrides):
+        config.config_by_name['test'] = type('TestConfig', (TestConfig,), overrides)
+        monkeypatch.setenv('FLASK_ENV', 'test')
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def signup_login(client, name='alice'):
+    """회원가입 후 로그인하여 Authorization 헤더를 반환합니다."""
+    client.post('/users/signup', json={"email": f"{name}@example.com", "username": name, "password": "password123"})
+    response = client.post('/users/login', json={"email": f"{name}@example.com", "password": "password123"})
+    return {"Authorization": f"Bearer {response.get_json()['accessToken']}"}
@@ -0,0 +1,32 @@
+# 인증된 사용자(Principal) 캐시 테스트
+from app import db
+from app.models import User, Post
+from app.utils.decorators import _DELETED
+from conftest import signup_login
+
+def delete_user_elsewhere(app, user_id):
+    """다른 워커(또는 관리 작업)에서 사용자를 지운 상황. 이 앱의 Principal 캐시는 알지 못합니다."""
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(db.delete(User).where(User.id == user_id))
+
+def test_deleted_user_token_is_rejected_on_create(app, client):
+    headers = signup_login(client)
+    assert client.post('/posts', json={"title": "t", "content": "c"}, headers=headers).status_code == 201
+    delete_user_elsewhere(app, 1)
+
+    response = client.post('/posts', json={"title": "t", "content": "c"}, headers=headers)
+    assert response.status_code == 401
+    response = client.post('/posts/bulk', json=[{"title": "t", "content": "c"}], headers=headers)
+    assert response.status_code == 401
+    with app.app_context():
+        assert db.session.query(Post).count() == 1
+        assert app.extensions['principal_cache'].get(1) is _DELETED
+
+def test_deleted_user_is_remembered_after_orm_delete(app, client):
+    headers = signup_login(client)
+    with app.app_context():
+        db.session.delete(db.session.get(User, 1))
+        db.session.commit()
+    response = client.put('/posts/1', json={"title": "t", "content": "c"}, headers=headers)
+    assert response.status_code == 401
@@ -0,0 +1,103 @@
+# 응답 캐시 테스트. Redis 대신 redis-py 인터페이스 일부(get/set/delete/incr/scan_iter)만 흉내 내는 FakeRedis 를 사용합니다.
+import fnmatch
+import pytest
+from app.utils.cache import LRUTTLCache, RedisCache, ResponseCache
+from conftest import signup_login
+
+class FakeRedis:
+    """여러 워커가 함께 쓰는 Redis 서버 대역. redis-py 처럼 값을 bytes 로 돌려줍니다."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def incr(self, key):
+        value = int(self.data.get(key, b'0')) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    def scan_iter(self, match='*'):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+def test_lru_ttl_cache_evicts_least_recently_used(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('app.utils.cache.time.monotonic', lambda: now[0])
+    cache = LRUTTLCache(max_entries=2, default_ttl=30)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+
+    now[0] += 31
+    assert cache.get('a') is None
+    assert cache.incr('generation') == 1
+    now[0] += 3600
+    assert cache.incr('generation') == 2
+
+def test_redis_cache_invalidation_reaches_other_workers():
+    server = FakeRedis()
+    worker_a = ResponseCache(RedisCache(server))
+    worker_b = ResponseCache(RedisCache(server))
+
+    list_key = worker_a.list_key('limit=20')
+    worker_a.backend.set(list_key, '{}')
+    worker_a.backend.set(worker_a.detail_key(1), '{}')
+    worker_a.set_user_post_count(7, 3)
+    assert worker_b.get_user_post_count(7) == 3
+
+    worker_b.invalidate_post(post_id=1, user_id=7)
+    assert worker_a.list_key('limit=20') != list_key
+    assert worker_a.backend.get(worker_a.detail_key(1)) is None
+    assert worker_a.get_user_post_count(7) is None
+
+def test_only_shared_backends_are_marked_shared():
+    assert ResponseCache(RedisCache(FakeRedis())).shared
+    assert not ResponseCache(LRUTTLCache()).shared
+
+@pytest.fixture
+def workers(make_app, tmp_path):
+    """같은 DB 와 같은 FakeRedis 를 쓰는 앱 두 개(gunicorn 워커 두 개 대역)"""
+    server = FakeRedis()
+    apps = []
+    for _ in range(2):
+        app = make_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'app.db'}")
+        app.extensions['response_cache'] = ResponseCache(RedisCache(server))
+        apps.append(app)
+    return [app.test_client() for app in apps]
+
+def test_write_on_one_worker_invalidates_lists_on_another(workers):
+    worker_a, worker_b = workers
+    headers = signup_login(worker_b)
+    worker_b.post('/posts', json={"title": "first", "content": "c"}, headers=headers)
+
+    assert worker_a.get('/posts').headers['X-Cache'] == 'MISS'
+    assert worker_a.get('/posts').headers['X-Cache'] == 'HIT'
+    assert worker_a.get('/users/1/posts').get_json()["postCount"] == 1
+
+    worker_b.post('/posts', json={"title": "second", "content": "c"}, headers=headers)
+    response = worker_a.get('/posts')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert [post["title"] for post in response.get_json()["posts"]] == ["second", "first"]
+    assert worker_a.get('/users/1/posts').get_json()["postCount"] == 2
+
+def test_memory_backend_does_not_cache_user_post_count(make_app, tmp_path):
+    path = f"sqlite:///{tmp_path / 'app.db'}"
+    worker_a = make_app(SQLALCHEMY_DATABASE_URI=path, CACHE_BACKEND='memory').test_client()
+    worker_b = make_app(SQLALCHEMY_DATABASE_URI=path, CACHE_BACKEND='memory').test_client()
+    headers = signup_login(worker_b)
+    worker_b.post('/posts', json={"title": "first", "content": "c"}, headers=headers)
+    assert worker_a.get('/users/1/posts?limit=1').get_json()["postCount"] == 1
+
+    worker_b.post('/posts', json={"title": "second", "content": "c"}, headers=headers)
+    # 목록은 다른 키(limit=2)로 새로 읽으며, 게시글 수는 워커 A 의 캐시에 남아 있지 않아야 합니다.
+    assert worker_a.get('/users/1/posts?limit=2').get_json()["postCount"] == 2
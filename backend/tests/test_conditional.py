@@ -0,0 +1,73 @@
+# 조건부 요청(ETag / Last-Modified) 테스트
+import pytest
+
+from conftest import signup_login
+
+def create_posts(client, headers, count):
+    return [client.post('/posts', json={"title": f"post {i}", "content": "본문입니다"}, headers=headers).get_json()["postId"]
+            for i in range(count)]
+
+def test_list_is_not_revalidated_by_date_after_delete(client):
+    headers = signup_login(client)
+    ids = create_posts(client, headers, 3)
+    response = client.get('/posts')
+    assert 'Last-Modified' not in response.headers
+    etag = response.headers['ETag']
+
+    assert client.delete(f'/posts/{ids[1]}', headers=headers).status_code == 204
+    client.delete_cookie('db_primary_until')
+    future = 'Wed, 01 Jan 2100 00:00:00 GMT'
+    response = client.get('/posts', headers={"If-Modified-Since": future})
+    assert response.status_code == 200
+    assert [post["postId"] for post in response.get_json()["posts"]] == [ids[2], ids[0]]
+    assert client.get('/posts', headers={"If-None-Match": etag}).status_code == 200
+
+def test_list_etag_varies_with_excerpt(client):
+    headers = signup_login(client)
+    create_posts(client, headers, 2)
+    etags = {client.get(url).headers['ETag'] for url in ('/posts', '/posts?excerpt=2', '/posts?excerpt=3')}
+    assert len(etags) == 3
+    etags = {client.get(url).headers['ETag'] for url in ('/posts?all=true', '/posts?all=true&excerpt=2')}
+    assert len(etags) == 2
+
+def test_detail_still_supports_if_modified_since(client):
+    headers = signup_login(client)
+    post_id = create_posts(client, headers, 1)[0]
+    response = client.get(f'/posts/{post_id}')
+    last_modified = response.headers['Last-Modified']
+    assert client.get(f'/posts/{post_id}', headers={"If-Modified-Since": last_modified}).status_code == 304
+
+def test_user_post_list_has_no_last_modified(client):
+    headers = signup_login(client)
+    create_posts(client, headers, 2)
+    response = client.get('/users/1/posts')
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response.headers
+
+def rename_user(app, user_id, username):
+    from app import db
+    from app.models import User
+    with app.app_context():
+        db.session.get(User, user_id).username = username
+        db.session.commit()
+
+@pytest.mark.parametrize('denormalized', [False, True])
+def test_rename_changes_etags_and_clears_cache(make_app, denormalized):
+    app = make_app(CACHE_BACKEND='memory', POSTS_DENORMALIZED_AUTHOR=denormalized)
+    client = app.test_client()
+    headers = signup_login(client)
+    post_id = create_posts(client, headers, 1)[0]
+    client.delete_cookie('db_primary_until')
+    urls = [f'/posts/{post_id}', '/posts', f'/posts?ids={post_id}', '/users/1/posts']
+    etags = {}
+    for url in urls:
+        client.get(url)
+        response = client.get(url)
+        assert response.headers['X-Cache'] == 'HIT'
+        etags[url] = response.headers['ETag']
+
+    rename_user(app, 1, 'alice2')
+    for url in urls:
+        response = client.get(url, headers={"If-None-Match": etags[url]})
+        assert response.status_code == 200, url
+        assert 'alice2' in response.get_data(as_text=True)
@@ -0,0 +1,46 @@
+# 비정규화 컬럼(posts.author_username, users.post_count) 테스트
+from datetime import datetime
+from app import db
+from app.models import User, Post
+
+def test_username_change_updates_posts_without_touching_updated_at(app):
+    updated_at = datetime(2025, 1, 1, 12, 0, 0)
+    with app.app_context():
+        db.session.add(User(id=1, email="a@example.com", username="alice", password="x"))
+        db.session.flush()
+        db.session.add(Post(id=1, title="t", content="c", user_id=1, author_username="alice",
+                            created_at=updated_at, updated_at=updated_at))
+        db.session.commit()
+
+        db.session.get(User, 1).username = "alicia"
+        db.session.commit()
+        db.session.expire_all()
+        post = db.session.get(Post, 1)
+        assert post.author_username == "alicia"
+        assert post.updated_at.replace(tzinfo=None) == updated_at
+
+def test_backfill_fills_authors_and_recounts_posts(app):
+    from app.repositories import post_repository
+    updated_at = datetime(2025, 1, 1, 12, 0, 0)
+    with app.app_context():
+        db.session.execute(db.insert(User), [
+            {"id": i, "email": f"u{i}@example.com", "username": f"u{i}", "password": "x", "post_count": 99}
+            for i in (1, 2, 3)
+        ])
+        # 이전 버전 서버가 만든 게시글(author_username 없음)
+        db.session.execute(db.insert(Post), [
+            {"id": i, "title": "t", "content": "c", "user_id": 1 if i < 4 else 2,
+             "created_at": updated_at, "updated_at": updated_at}
+            for i in range(1, 6)
+        ])
+        db.session.commit()
+
+        assert post_repository.backfill_denormalized_columns(batch_size=2) == (5, 3)
+        assert [user.post_count for user in db.session.query(User).order_by(User.id)] == [3, 2, 0]
+        posts = db.session.query(Post).order_by(Post.id).all()
+        assert [post.author_username for post in posts] == ["u1", "u1", "u1", "u2", "u2"]
+        assert all(post.updated_at.replace(tzinfo=None) == updated_at for post in posts)
+
+def test_backfill_cli(app):
+    result = app.test_cli_runner().invoke(args=['backfill-denormalized', '--batch-size', '10'])
+    assert result.exit_code == 0, result.output
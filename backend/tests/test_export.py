@@ -0,0 +1,90 @@
+# 게시글 내보내기(GET /posts/export) 테스트
+import json
+from datetime import datetime
+from urllib.parse import quote
+
+import pytest
+
+from conftest import signup_login
+
+@pytest.fixture
+def export_app(make_app):
+    return make_app(POSTS_EXPORT_BATCH_SIZE=2)
+
+def create_posts(client, headers, count):
+    return [client.post('/posts', json={"title": f"post {i}", "content": f"본문 {i}\n둘째 줄"}, headers=headers).get_json()["postId"]
+            for i in range(count)]
+
+def export_lines(client, query=''):
+    response = client.get(f'/posts/export{query}')
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def test_ndjson_is_one_post_per_line_streamed_in_batches(export_app):
+    client = export_app.test_client()
+    ids = create_posts(client, signup_login(client), 5)
+
+    response = client.get('/posts/export')
+    assert response.is_streamed
+    assert response.mimetype == 'application/x-ndjson'
+    # 뷰 함수가 반환된 뒤에 본문을 읽습니다. 스트림은 stream_with_context 로 유지한 요청의 DB 세션에서 배치(2개)마다 한 번씩 씁니다.
+    chunks = list(response.response)
+    response.close()
+    assert len(chunks) == 3
+    assert all(chunk.endswith(b'\n') for chunk in chunks)
+
+    body = b''.join(chunks).decode('utf-8')
+    assert body.count('\n') == 5
+    posts = [json.loads(line) for line in body.splitlines()]
+    assert [post["postId"] for post in posts] == ids
+    assert posts[0]["content"] == "본문 0\n둘째 줄"
+    assert posts[0]["author"] == "alice"
+
+def test_json_format_is_a_single_array(export_app):
+    client = export_app.test_client()
+    ids = create_posts(client, signup_login(client), 3)
+    response = client.get('/posts/export?format=json')
+    assert response.mimetype == 'application/json'
+    assert [post["postId"] for post in json.loads(response.get_data())] == ids
+
+def test_empty_export(export_app):
+    client = export_app.test_client()
+    assert client.get('/posts/export').get_data() == b''
+    assert json.loads(client.get('/posts/export?format=json').get_data()) == []
+
+def test_updated_since_is_inclusive_and_follows_updated_at(export_app):
+    client = export_app.test_client()
+    headers = signup_login(client)
+    ids = create_posts(client, headers, 4)
+    posts = export_lines(client)
+
+    # 마지막으로 받은 updatedAt 을 다음 요청의 updated_since 로 넘기면 경계의 게시글이 다시 포함됩니다.
+    since = posts[1]["updatedAt"]
+    again = export_lines(client, f'?updated_since={quote(since)}')
+    assert [post["postId"] for post in again] == ids[1:]
+
+    # 수정한 게시글은 updatedAt 순서상 맨 뒤로 가고, 마지막 updatedAt 이후 증분에 포함됩니다.
+    client.put(f'/posts/{ids[0]}', json={"title": "changed", "content": "changed"}, headers=headers)
+    changed = export_lines(client, f'?updated_since={quote(posts[-1]["updatedAt"])}')
+    assert [post["postId"] for post in changed] == [ids[3], ids[0]]
+    assert changed[-1]["title"] == "changed"
+    timestamps = [datetime.fromisoformat(post["updatedAt"]) for post in export_lines(client)]
+    assert timestamps == sorted(timestamps)
+
+@pytest.mark.parametrize('query', ['?format=csv', '?updated_since=yesterday'])
+def test_bad_parameters_are_rejected(export_app, query):
+    assert export_app.test_client().get(f'/posts/export{query}').status_code == 400
+
+def test_stream_keeps_its_own_session_while_other_requests_run(export_app):
+    client = export_app.test_client()
+    ids = create_posts(client, signup_login(client), 5)
+
+    response = client.get('/posts/export')
+    chunks = iter(response.response)
+    first = next(chunks)
+    # 스트림을 읽는 도중에 다른 요청이 자기 세션을 열고 닫아도(teardown) 스트림의 커서는 그대로 이어집니다.
+    assert client.get(f'/posts/{ids[0]}').status_code == 200
+    rest = list(chunks)
+    response.close()
+    posts = [json.loads(line) for line in (first + b''.join(rest)).decode('utf-8').splitlines()]
+    assert [post["postId"] for post in posts] == ids
@@ -0,0 +1,119 @@
+# Slack 알림 전송(재시도)과 요약 묶음 테스트. Slack 대신 로컬 http.server 스텁으로 보냅니다.
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from log_alerter import AlertBatcher, SlackSender
+
+class StubWebhook:
+    """responses 에 넣은 (상태 코드, 헤더) 를 차례로 돌려주고, 받은 메시지를 기록하는 웹훅 서버. 다 쓰면 200 을 돌려줍니다."""
+
+    def __init__(self):
+        self.responses = []
+        self.messages = []
+        self.gate = None
+        self.entered = threading.Event()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                stub.messages.append(json.loads(body))
+                stub.entered.set()
+                if stub.gate is not None:
+                    stub.gate.wait(5)
+                status, headers = stub.responses.pop(0) if stub.responses else (200, {})
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def webhook():
+    stub = StubWebhook()
+    yield stub
+    if stub.gate is not None:
+        stub.gate.set()
+    stub.close()
+
+def make_sender(webhook, sleeps, **kwargs):
+    return SlackSender(webhook.url, sleep=sleeps.append, **kwargs)
+
+def entry(status='500', uri='/posts/1', ip='10.0.0.1'):
+    return {"status": status, "request_method": "GET", "request_uri": uri, "client_ip": ip,
+            "timestamp": "2025-01-01T12:00:00+00:00"}
+
+def test_retry_after_is_honoured_on_429(webhook):
+    sleeps = []
+    webhook.responses = [(429, {'Retry-After': '3'}), (200, {})]
+    assert make_sender(webhook, sleeps).send({"text": "hi"}) is True
+    assert sleeps == [3.0]
+    assert len(webhook.messages) == 2
+
+def test_retry_after_is_capped_by_backoff_max(webhook):
+    sleeps = []
+    webhook.responses = [(429, {'Retry-After': '120'})]
+    assert make_sender(webhook, sleeps, backoff_max=7).send({"text": "hi"}) is True
+    assert sleeps == [7]
+
+def test_server_errors_back_off_exponentially_then_give_up(webhook):
+    sleeps = []
+    webhook.responses = [(500, {})] * 4
+    assert make_sender(webhook, sleeps, max_retries=3, backoff_base=1, backoff_max=3).send({"text": "hi"}) is False
+    assert sleeps == [1, 2, 3]
+    assert len(webhook.messages) == 4
+
+def test_client_errors_are_not_retried(webhook):
+    sleeps = []
+    webhook.responses = [(400, {})]
+    assert make_sender(webhook, sleeps).send({"text": "hi"}) is False
+    assert sleeps == []
+    assert len(webhook.messages) == 1
+
+def test_max_send_seconds_covers_the_retry_budget(webhook):
+    sender = SlackSender(webhook.url, max_retries=2, backoff_max=5, timeout=1)
+    assert sender.max_send_seconds() == 2 * 5 + 3 * 1
+
+def test_errors_in_a_window_are_summarised_in_one_message(webhook):
+    batcher = AlertBatcher(make_sender(webhook, []), window_seconds=30)
+    for post_id in (1, 2, 3):
+        batcher.submit(entry(uri=f'/posts/{post_id}?x=1'))
+    batcher.submit(entry(status='502', uri='/users/login'))
+    batcher.close(timeout=5)
+
+    assert len(webhook.messages) == 1
+    text = webhook.messages[0]["blocks"][1]["text"]["text"]
+    lines = text.split('\n')
+    assert lines[0].startswith('`500` `GET /posts/:id` × *3*')
+    assert lines[1].startswith('`502` `GET /users/login` × *1*')
+
+def test_full_queue_drops_without_blocking_and_reports_count(webhook):
+    webhook.gate = threading.Event()
+    batcher = AlertBatcher(make_sender(webhook, []), window_seconds=0.1, queue_size=2)
+    batcher.submit(entry())
+    # 첫 요약을 보내는 동안(웹훅이 응답을 미루는 동안) 전송 스레드는 대기열을 비우지 않습니다.
+    assert webhook.entered.wait(5)
+    for _ in range(5):
+        batcher.submit(entry())
+    webhook.gate.set()
+    batcher.close(timeout=5)
+
+    assert len(webhook.messages) == 2
+    context = webhook.messages[1]["blocks"][2]["elements"][0]["text"]
+    assert "2건" in context and "3건 누락" in context
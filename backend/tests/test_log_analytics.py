@@ -0,0 +1,43 @@
+# SLO 집계 구간 테스트
+from log_analytics import RollingRouteStats, SLOMonitor
+
+class FakeSender:
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message):
+        self.messages.append(message)
+        return True
+
+    def max_send_seconds(self):
+        return 1
+
+def test_window_expires_on_wall_clock_ticks():
+    stats = RollingRouteStats(window_seconds=100, slots=10, max_routes=10)
+    for i in range(10):
+        stats.observe('/posts', 1000 + i, 0.01, False)
+    assert stats.snapshot()['/posts']['requests'] == 10
+
+    stats.advance(1050)
+    assert stats.snapshot()['/posts']['requests'] == 10
+    stats.advance(1200)
+    assert stats.snapshot() == {}
+
+def test_breach_recovers_when_traffic_stops():
+    sender = FakeSender()
+    monitor = SLOMonitor(sender, stats=RollingRouteStats(window_seconds=100, slots=10), eval_interval=3600)
+    try:
+        for i in range(60):
+            monitor.observe({"status": "500", "request_uri": "/posts", "request_time": "0.010",
+                             "timestamp": "2025-01-01T12:00:00+00:00"})
+        assert monitor.evaluate(now=0) is not None
+        assert ('/posts', 'errors') in monitor._active
+
+        # 로그가 더 들어오지 않아도, 구간이 지나면 회복으로 판정하고 다시 알리지 않습니다.
+        monitor.tick()
+        message = monitor.evaluate(now=10_000)
+        assert message is not None and 'SLO 회복' in message["blocks"][0]["text"]["text"]
+        assert monitor._active == {}
+        assert monitor.evaluate(now=20_000) is None
+    finally:
+        monitor.close()
@@ -0,0 +1,71 @@
+# 날짜별 로그 파일 tail 테스트
+from log_processor import LogTailer, TailState, log_file_name_for
+
+def write_log(log_dir, date_str, *lines):
+    with open(log_dir / log_file_name_for(date_str), 'a') as f:
+        for line in lines:
+            f.write(line + '\n')
+
+def make_tailer(log_dir, today, handled, finished):
+    return LogTailer(handled.append, log_dir=str(log_dir), state_path=str(log_dir / 'state.json'),
+                     date_func=lambda: today[0], on_file_finished=finished.append)
+
+def test_date_change_moves_to_new_file(tmp_path):
+    today, handled, finished = ['2025-01-01'], [], []
+    write_log(tmp_path, '2025-01-01', 'a1')
+    tailer = make_tailer(tmp_path, today, handled, finished)
+    assert tailer.poll() == 1
+
+    write_log(tmp_path, '2025-01-01', 'a2')
+    write_log(tmp_path, '2025-01-02', 'b1')
+    today[0] = '2025-01-02'
+    assert tailer.poll() == 2
+    assert handled == ['a1', 'a2', 'b1']
+    assert finished == ['access-2025-01-01.log']
+
+def test_restart_after_several_days_drains_every_file_in_between(tmp_path):
+    today, handled, finished = ['2025-01-01'], [], []
+    write_log(tmp_path, '2025-01-01', 'a1')
+    tailer = make_tailer(tmp_path, today, handled, finished)
+    tailer.poll()
+    tailer._close()
+
+    # 처리기가 멈춰 있는 동안 01일에 한 줄이 더 쓰이고, 02일과 04일 파일이 생겼습니다. (03일은 로그 없음)
+    write_log(tmp_path, '2025-01-01', 'a2')
+    write_log(tmp_path, '2025-01-02', 'b1', 'b2')
+    write_log(tmp_path, '2025-01-04', 'd1')
+    today[0] = '2025-01-04'
+    tailer = make_tailer(tmp_path, today, handled, finished)
+    assert tailer.poll() == 4
+    assert handled == ['a1', 'a2', 'b1', 'b2', 'd1']
+    assert finished == ['access-2025-01-01.log', 'access-2025-01-02.log']
+
+    state = TailState.load(str(tmp_path / 'state.json'))
+    assert state.file_name == 'access-2025-01-04.log'
+
+def test_waits_on_old_file_until_a_later_file_exists(tmp_path):
+    today, handled, finished = ['2025-01-01'], [], []
+    write_log(tmp_path, '2025-01-01', 'a1')
+    tailer = make_tailer(tmp_path, today, handled, finished)
+    tailer.poll()
+
+    # 날짜는 바뀌었지만 새 파일이 아직 없으면 이전 파일을 계속 따라갑니다.
+    today[0] = '2025-01-03'
+    write_log(tmp_path, '2025-01-01', 'a2')
+    assert tailer.poll() == 1
+    assert finished == []
+
+    write_log(tmp_path, '2025-01-03', 'c1')
+    assert tailer.poll() == 1
+    assert handled == ['a1', 'a2', 'c1']
+    assert finished == ['access-2025-01-01.log']
+
+def test_missing_saved_file_starts_from_next_date(tmp_path):
+    TailState('access-2025-01-01.log', 1, 10).save(str(tmp_path / 'state.json'))
+    write_log(tmp_path, '2025-01-02', 'b1')
+    write_log(tmp_path, '2025-01-03', 'c1')
+    handled, finished = [], []
+    tailer = make_tailer(tmp_path, ['2025-01-03'], handled, finished)
+    assert tailer.poll() == 2
+    assert handled == ['b1', 'c1']
+    assert finished == ['access-2025-01-02.log']
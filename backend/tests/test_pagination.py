@@ -0,0 +1,24 @@
+# keyset 페이지네이션 테스트
+import pytest
+from conftest import signup_login
+
+def collect_pages(client, url, limit=2):
+    """cursor 를 따라가며 모든 페이지의 게시글 id 를 모읍니다."""
+    ids, cursor = [], None
+    for _ in range(20):
+        response = client.get(url, query_string={"limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.get_json()
+        ids.extend(post["postId"] for post in body["posts"])
+        cursor = body.get("nextCursor")
+        if not cursor:
+            break
+    return ids
+
+@pytest.mark.parametrize('url', ['/posts', '/users/1/posts'])
+def test_pages_do_not_repeat_posts_created_in_the_same_second(client, url):
+    headers = signup_login(client)
+    for i in range(5):
+        # 서버 기본값(created_at)으로 저장되어 같은 초에 만든 게시글이 여러 개 생깁니다.
+        assert client.post('/posts', json={"title": f"post {i}", "content": "c"}, headers=headers).status_code == 201
+    assert collect_pages(client, url) == [5, 4, 3, 2, 1]
@@ -0,0 +1,63 @@
+# 비밀번호 해시(재해시, 전용 프로세스 풀, 대기열 초과 503) 테스트
+import pytest
+from werkzeug.security import generate_password_hash
+
+import config
+from app import db
+from app.models import User
+from app.utils.passwords import HasherBusyError, PasswordHasher
+
+def create_user(app, password_hash):
+    with app.app_context():
+        db.session.add(User(email='alice@example.com', username='alice', password=password_hash))
+        db.session.commit()
+
+def stored_hash(app):
+    with app.app_context():
+        return db.session.query(User.password).scalar()
+
+def login(client):
+    return client.post('/users/login', json={"email": "alice@example.com", "password": "password123"})
+
+def test_login_rehashes_outdated_hash(app, client):
+    create_user(app, generate_password_hash('password123', 'pbkdf2:sha256:500'))
+    assert login(client).status_code == 200
+    assert stored_hash(app).startswith('pbkdf2:sha256:1000$')
+
+    # 이미 현재 설정으로 해시되어 있으면 다시 저장하지 않습니다.
+    rehashed = stored_hash(app)
+    assert login(client).status_code == 200
+    assert stored_hash(app) == rehashed
+
+def test_saturated_pool_returns_503(make_app):
+    app = make_app(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_SIZE=0)
+    create_user(app, generate_password_hash('password123', 'pbkdf2:sha256:1000'))
+    hasher = app.extensions['password_hasher']
+    # 실행 중인 해시 작업 하나가 유일한 자리를 차지하고 있는 상태를 만듭니다.
+    assert hasher._slots.acquire(blocking=False)
+    try:
+        response = login(app.test_client())
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        hasher._slots.release()
+    assert login(app.test_client()).status_code == 200
+
+def test_pool_hashes_in_a_separate_process():
+    hasher = PasswordHasher('pbkdf2:sha256:1000', workers=1, queue_size=0)
+    pwhash = hasher.hash('password123')
+    assert hasher.verify(pwhash, 'password123')
+    assert not hasher.verify(pwhash, 'wrong')
+    hasher._executor.shutdown()
+
+def test_timed_out_hash_is_reported_as_busy():
+    hasher = PasswordHasher('pbkdf2:sha256:1000', workers=1, queue_size=0, timeout=0)
+    with pytest.raises(HasherBusyError):
+        hasher.hash('password123')
+    hasher._executor.shutdown()
+
+@pytest.mark.parametrize('worker_class, expected', [('sync', 0), ('gthread', 2), ('gevent', 2)])
+def test_auto_workers_follow_gunicorn_worker_class(monkeypatch, worker_class, expected):
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', worker_class)
+    assert config.default_password_hash_workers('auto') == expected
+    assert config.default_password_hash_workers('3') == 3
@@ -0,0 +1,96 @@
+# 여러 게시글을 한 번에 읽고(?ids=) 쓰는(POST /posts/bulk) API 테스트
+import pytest
+
+from app import db
+from app.models import User, Post
+from app.utils.decorators import _DELETED
+from app.utils.pagination import MAX_PAGE_SIZE
+from conftest import signup_login
+
+def create_posts(client, headers, count):
+    return [client.post('/posts', json={"title": f"post {i}", "content": f"본문 {i}"}, headers=headers).get_json()["postId"]
+            for i in range(count)]
+
+def post_count(app, user_id=1):
+    with app.app_context():
+        return db.session.get(User, user_id).post_count
+
+def test_ids_returns_posts_in_request_order_with_missing(client):
+    headers = signup_login(client)
+    ids = create_posts(client, headers, 3)
+    response = client.get(f'/posts?ids={ids[2]},999,{ids[0]},{ids[2]}')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [post["postId"] for post in body["posts"]] == [ids[2], ids[0]]
+    assert body["posts"][0]["content"] == "본문 2"
+    assert body["posts"][0]["author"] == "alice"
+    assert body["missing"] == [999]
+
+@pytest.mark.parametrize('ids', ['', 'a,b', ','.join(str(i) for i in range(1, MAX_PAGE_SIZE + 2))])
+def test_ids_rejects_bad_or_too_many_ids(client, ids):
+    assert client.get(f'/posts?ids={ids}').status_code == 400
+
+def test_ids_accepts_exactly_the_limit(client):
+    ids = ','.join(str(i) for i in range(1, MAX_PAGE_SIZE + 1))
+    response = client.get(f'/posts?ids={ids}')
+    assert response.status_code == 200
+    assert len(response.get_json()["missing"]) == MAX_PAGE_SIZE
+
+def test_ids_revalidates_with_etag(client):
+    headers = signup_login(client)
+    ids = create_posts(client, headers, 2)
+    url = f'/posts?ids={ids[0]},{ids[1]}'
+    etag = client.get(url).headers['ETag']
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f'/posts/{ids[1]}', json={"title": "changed", "content": "changed"}, headers=headers)
+    client.delete_cookie('db_primary_until')
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+def test_bulk_insert_returns_ids_in_order_and_counts_posts(app, client):
+    headers = signup_login(client)
+    items = [{"title": "a", "content": "1"}, {"title": "", "content": "2"}, {"title": "c", "content": "3"}]
+    response = client.post('/posts/bulk', json=items, headers=headers)
+    assert response.status_code == 207
+    body = response.get_json()
+    assert [created["index"] for created in body["created"]] == [0, 2]
+    assert [error["index"] for error in body["errors"]] == [1]
+    assert post_count(app) == 2
+
+    with app.app_context():
+        titles = {post.id: post.title for post in db.session.query(Post)}
+        assert [titles[created["postId"]] for created in body["created"]] == ["a", "c"]
+        assert {post.author_username for post in db.session.query(Post)} == {"alice"}
+
+def test_bulk_ndjson_and_atomic(app, client):
+    headers = {**signup_login(client), "Content-Type": "application/x-ndjson"}
+    body = '{"title": "a", "content": "1"}\nnot json\n{"title": "b", "content": "2"}\n'
+    response = client.post('/posts/bulk?atomic=true', data=body, headers=headers)
+    assert response.status_code == 400
+    assert post_count(app) == 0
+
+    response = client.post('/posts/bulk', data=body, headers=headers)
+    assert response.status_code == 207
+    assert response.get_json()["errors"] == [{"index": 1, "message": "JSON 형식이 올바르지 않습니다."}]
+    assert post_count(app) == 2
+
+def test_bulk_rejects_too_many_items(make_app):
+    app = make_app(POSTS_BULK_MAX_ITEMS=2)
+    client = app.test_client()
+    headers = signup_login(client)
+    response = client.post('/posts/bulk', json=[{"title": "t", "content": "c"}] * 3, headers=headers)
+    assert response.status_code == 413
+
+def test_bulk_for_deleted_user_marks_principal_and_writes_nothing(app, client):
+    headers = signup_login(client)
+    # 인증된 사용자 정보가 캐시된 뒤, 다른 워커에서 사용자가 삭제된 상황을 만듭니다.
+    assert client.post('/posts/bulk', json=[{"title": "t", "content": "c"}], headers=headers).status_code == 201
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(db.delete(Post))
+            conn.execute(db.delete(User).where(User.id == 1))
+    response = client.post('/posts/bulk', json=[{"title": "t", "content": "c"}] * 2, headers=headers)
+    assert response.status_code == 401
+    with app.app_context():
+        assert db.session.query(Post).count() == 0
+        assert app.extensions['principal_cache'].get(1) is _DELETED
@@ -0,0 +1,63 @@
+# 목록/상세 조회가 게시글 수나 작성자 수와 관계없이 같은 수의 SQL 만 실행하는지(N+1 이 없는지) 확인합니다.
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import User, Post
+
+def seed(app, posts, users=5):
+    started = datetime(2025, 1, 1)
+    with app.app_context():
+        db.session.execute(db.insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "username": f"user{i}", "password": "x", "post_count": 0}
+            for i in range(1, users + 1)
+        ])
+        db.session.execute(db.insert(Post), [
+            {"id": i, "title": f"post {i}", "content": "c" * 100, "user_id": i % users + 1,
+             "author_username": f"user{i % users + 1}", "created_at": started + timedelta(minutes=i),
+             "updated_at": started + timedelta(minutes=i)}
+            for i in range(1, posts + 1)
+        ])
+        db.session.commit()
+
+def count_queries(app, client, url):
+    """url 요청 한 번에 실행된 SQL 문 수를 반환합니다."""
+    statements = []
+
+    def count(*args, **kwargs):
+        statements.append(args[2])
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', count)
+    try:
+        response = client.get(url)
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', count)
+    assert response.status_code == 200, response.get_json()
+    return len(statements)
+
+@pytest.mark.parametrize('denormalized', [False, True])
+@pytest.mark.parametrize('url, max_queries', [
+    ('/posts', 1), ('/posts?limit=50', 1), ('/posts?all=true', 1), ('/posts?excerpt=20', 1), ('/posts?ids={ids}', 1),
+    # 사용자 확인 + 게시글 수 + 목록
+    ('/users/1/posts', 3),
+])
+def test_list_query_count_does_not_grow_with_posts(make_app, denormalized, url, max_queries):
+    counts = []
+    for posts in (5, 40):
+        app = make_app(POSTS_DENORMALIZED_AUTHOR=denormalized)
+        seed(app, posts)
+        ids = ','.join(str(i) for i in range(1, min(posts, 20) + 1))
+        counts.append(count_queries(app, app.test_client(), url.format(ids=ids)))
+    assert counts[0] == counts[1]
+    assert counts[0] <= max_queries
+
+@pytest.mark.parametrize('denormalized', [False, True])
+def test_detail_is_a_single_query(make_app, denormalized):
+    app = make_app(POSTS_DENORMALIZED_AUTHOR=denormalized)
+    seed(app, 10)
+    client = app.test_client()
+    assert [count_queries(app, client, f'/posts/{post_id}') for post_id in (1, 5, 10)] == [1, 1, 1]
@@ -0,0 +1,123 @@
+# 읽기 복제본 라우팅 테스트
+# SQLite 파일 두 개를 primary/복제본 대역으로 사용합니다. 복제본에는 제목에 '(replica)' 를 붙인 데이터를 넣어
+# 어느 DB 에서 읽었는지 구분하고, 게시글 4 와 사용자 bob 은 primary 에만 넣어 복제 지연을 흉내 냅니다.
+import pytest
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.models import User, Post
+from app.utils.passwords import get_password_hasher
+from conftest import signup_login
+
+@pytest.fixture
+def replica_app(make_app, tmp_path):
+    app = make_app(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'primary.db'}",
+        SQLALCHEMY_BINDS={'replica0': f"sqlite:///{tmp_path / 'replica.db'}"},
+    )
+    with app.app_context():
+        replica_engine = db.engines['replica0']
+        db.metadata.create_all(replica_engine)
+        password = get_password_hasher().hash('password123')
+        users = [{"id": 1, "email": "alice@example.com", "username": "alice", "password": password}]
+        posts = [{"id": i, "title": f"post {i}", "content": "c", "user_id": 1, "author_username": "alice"}
+                 for i in (1, 2, 3)]
+        with replica_engine.begin() as conn:
+            conn.execute(db.insert(User), users)
+            conn.execute(db.insert(Post), [dict(post, title=f"{post['title']} (replica)") for post in posts])
+        db.session.execute(db.insert(User), users + [
+            {"id": 2, "email": "bob@example.com", "username": "bobby", "password": password}])
+        db.session.execute(db.insert(Post), posts + [
+            {"id": 4, "title": "post 4", "content": "c", "user_id": 1, "author_username": "alice"}])
+        db.session.commit()
+    return app
+
+@pytest.fixture
+def router(replica_app):
+    return replica_app.extensions['replica_router']
+
+@pytest.fixture
+def client(replica_app):
+    return replica_app.test_client()
+
+def titles(response):
+    return [post["title"] for post in response.get_json()["posts"]]
+
+def from_replica(response):
+    return all(title.endswith('(replica)') for title in titles(response))
+
+def test_reads_go_to_replica(client):
+    response = client.get('/posts')
+    assert titles(response) == ["post 3 (replica)", "post 2 (replica)", "post 1 (replica)"]
+    assert client.get('/posts/1').get_json()["title"] == "post 1 (replica)"
+
+def test_missing_rows_are_retried_on_primary(client):
+    response = client.get('/posts/4')
+    assert response.status_code == 200
+    assert response.get_json()["title"] == "post 4"
+
+    response = client.post('/users/login', json={"email": "bob@example.com", "password": "password123"})
+    assert response.status_code == 200
+
+def test_write_pins_client_to_primary(client):
+    headers = signup_login(client, 'carol')
+    response = client.post('/posts', json={"title": "post 5", "content": "c"}, headers=headers)
+    assert response.status_code == 201
+    assert 'db_primary_until' in response.headers.get('Set-Cookie', '')
+    assert titles(client.get('/posts'))[0] == "post 5"
+
+    client.delete_cookie('db_primary_until')
+    assert from_replica(client.get('/posts'))
+
+def test_lagging_replica_is_skipped_until_it_recovers(client, router):
+    router.lag_probe = lambda engine: router.max_lag + 25
+    router.replicas[0]["checkedAt"] = None
+    response = client.get('/posts')
+    assert not any(title.endswith('(replica)') for title in titles(response))
+    stats = router.stats()
+    assert stats["replicas"][0]["error"] == "ReplicationLag"
+    assert stats["primaryFallbacks"] == 1
+
+    router.lag_probe = lambda engine: 0.0
+    router.replicas[0]["checkedAt"] = None
+    assert from_replica(client.get('/posts'))
+
+def test_probe_errors_expose_only_the_exception_class(client, router):
+    def unreachable(engine):
+        raise ConnectionError("could not connect to server: host=10.0.0.5 password=secret")
+
+    router.lag_probe = unreachable
+    router.replicas[0]["checkedAt"] = None
+    assert client.get('/posts').status_code == 200
+    replica = client.get('/db/replicas').get_json()["replicas"][0]
+    assert replica["healthy"] is False
+    assert replica["error"] == "ConnectionError"
+
+def test_failed_replica_query_is_rerun_on_primary(replica_app, client, router):
+    with replica_app.app_context():
+        with db.engines['replica0'].begin() as conn:
+            conn.exec_driver_sql("DROP TABLE posts")
+
+    response = client.get('/posts')
+    assert response.status_code == 200
+    assert titles(response) == ["post 4", "post 3", "post 2", "post 1"]
+    stats = router.stats()["replicas"][0]
+    assert stats["healthy"] is False
+    assert stats["failures"] == 1
+    assert stats["error"] == "OperationalError"
+
+def test_operational_endpoints_are_internal_only(client):
+    assert client.get('/db/replicas').status_code == 200
+    assert client.get('/db/replicas', headers={"X-Forwarded-For": "203.0.113.7"}).status_code == 404
+    assert client.get('/metrics', environ_base={"REMOTE_ADDR": "203.0.113.7"}).status_code == 404
+
+def test_primary_error_inside_use_primary_does_not_fail_the_replica(replica_app, client, router):
+    with replica_app.app_context():
+        db.session.execute(db.text("DROP TABLE posts"))
+        db.session.commit()
+
+    # 게시글 4 는 복제본에 없어 use_primary() 로 primary 에서 다시 찾는데, 그 조회가 실패합니다.
+    with pytest.raises(OperationalError):
+        client.get('/posts/4')
+    stats = router.stats()["replicas"][0]
+    assert stats["healthy"] is True
+    assert stats["failures"] == 0
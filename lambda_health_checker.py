@@ -1,90 +1,283 @@
-
 import os
 import json
+import re
+import socket
+import ssl
+import time
 import http.client
-import boto3
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
 
 # Lambda 환경 변수에서 설정값을 가져옵니다.
-TARGET_URL = os.environ['TARGET_URL']
-SNS_TOPIC_ARN = os.environ['SNS_TOPIC_ARN']
+# HEALTH_TARGETS: 확인할 엔드포인트 목록. JSON 배열 또는 쉼표로 구분한 URL 목록입니다.
+#   예) [{"name": "home", "url": "https://example.com/"},
+#        {"name": "posts", "url": "https://example.com/api/posts?limit=1", "latencyThresholdMs": 800},
+#        {"name": "ready", "url": "https://example.com/api/readyz"}]
+# 설정하지 않으면 이전처럼 TARGET_URL 하나만 확인합니다.
+SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN')
+# 연속으로 이 횟수만큼 실패해야 DOWN 으로 판단하여 알립니다. (일시적인 네트워크 오류로 알림이 가지 않도록)
+FAILURE_THRESHOLD = int(os.environ.get('FAILURE_THRESHOLD', 3))
+# 전체 응답 시간이 이 값을 넘으면 느린 것으로 보고, LATENCY_BREACH_THRESHOLD 회 연속이면 알립니다.
+LATENCY_THRESHOLD_MS = float(os.environ.get('LATENCY_THRESHOLD_MS', 2000))
+LATENCY_BREACH_THRESHOLD = int(os.environ.get('LATENCY_BREACH_THRESHOLD', 1))
+# 요청 하나의 제한 시간(초). 모든 대상을 동시에 확인하므로 전체 실행 시간도 대략 이 값 이내입니다.
+PROBE_TIMEOUT = float(os.environ.get('PROBE_TIMEOUT', 5))
+# 연속 실패 횟수 등을 저장할 곳. 운영에서는 dynamodb://<테이블 이름>, 로컬 테스트는 file:///tmp/health_state.json
+# Lambda 의 /tmp 는 실행 환경이 바뀔 때마다 비워져 연속 실패 횟수가 초기화되므로, 기본값 없이 반드시 지정해야 합니다.
+STATE_STORE_URL = os.environ.get('STATE_STORE_URL')
+SNS_TOPIC_ARN_PATTERN = re.compile(r'^arn:aws[a-z-]*:sns:[a-z0-9-]+:\d{12}:[A-Za-z0-9_-]{1,256}(\.fifo)?$')
+
+def validate_config(state_store_url=STATE_STORE_URL, sns_topic_arn=SNS_TOPIC_ARN):
+    """
+    필수 설정을 확인합니다. 잘못된 설정은 알림을 보내야 할 때가 되어서야 드러나므로,
+    대상이 모두 정상이어도 매 실행 시작 시 확인하여 Lambda 오류(Errors 지표)로 드러나게 합니다.
+    """
+    errors = []
+    if not sns_topic_arn or not SNS_TOPIC_ARN_PATTERN.match(sns_topic_arn):
+        errors.append(f"SNS_TOPIC_ARN 이 올바른 SNS 토픽 ARN 이 아닙니다: {sns_topic_arn!r}")
+    if state_store_url is not None and urlsplit(state_store_url).scheme not in ('file', 'dynamodb'):
+        errors.append(f"지원하지 않는 STATE_STORE_URL 입니다: {state_store_url}")
+    if errors:
+        raise ValueError(' / '.join(errors))
+
+def load_targets():
+    raw = os.environ.get('HEALTH_TARGETS', '').strip()
+    if not raw:
+        return [{"name": os.environ['TARGET_URL'], "url": os.environ['TARGET_URL']}]
+    if raw.startswith('['):
+        targets = json.loads(raw)
+    else:
+        targets = [{"url": url.strip()} for url in raw.split(',') if url.strip()]
+    for target in targets:
+        target.setdefault("name", target["url"])
+    return targets
+
+# --- 상태 저장소 --- #
+# Lambda 는 호출마다 메모리가 초기화될 수 있으므로, 연속 실패 횟수처럼 호출 사이에 이어지는 값은 외부에 저장합니다.
+# load() 는 {대상 이름: 상태 dict} 를 반환하고, save() 는 같은 형태를 저장합니다.
+
+class FileStateStore:
+    """JSON 파일에 저장합니다. 로컬 테스트용이며, Lambda 의 /tmp 는 컨테이너가 바뀌면 사라집니다."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        # 파일이 없으면 처음 실행이므로 빈 상태입니다. 읽을 수 없거나 깨진 파일은 오류로 올려 fail open 하게 합니다.
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
 
-# URL에서 호스트와 경로를 분리합니다.
-try:
-    url_parts = TARGET_URL.replace('http://', '').replace('https://', '').split('/', 1)
-    HOST = url_parts[0]
-    PATH = '/' + (url_parts[1] if len(url_parts) > 1 else '')
-except IndexError:
-    print(f"Invalid TARGET_URL format: {TARGET_URL}")
-    raise
+    def save(self, states):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(states, f)
+        os.replace(tmp_path, self.path)
 
-sns_client = boto3.client('sns')
+class DynamoDBStateStore:
+    """파티션 키가 'target'(문자열)인 DynamoDB 테이블에 대상별로 한 항목씩 저장합니다."""
 
-def lambda_handler(event, context):
+    def __init__(self, table_name):
+        import boto3
+        self.table = boto3.resource('dynamodb').Table(table_name)
+
+    def load(self):
+        states = {}
+        for item in self.table.scan().get('Items', []):
+            states[item['target']] = json.loads(item['state'])
+        return states
+
+    def save(self, states):
+        with self.table.batch_writer() as batch:
+            for name, state in states.items():
+                batch.put_item(Item={'target': name, 'state': json.dumps(state)})
+
+def make_state_store(url=STATE_STORE_URL):
+    if not url:
+        raise ValueError("STATE_STORE_URL 을 지정해야 합니다. (운영: dynamodb://<테이블 이름>, 로컬 테스트: file:///tmp/health_state.json)")
+    parts = urlsplit(url)
+    if parts.scheme == 'file':
+        return FileStateStore(parts.path)
+    if parts.scheme == 'dynamodb':
+        return DynamoDBStateStore(parts.netloc)
+    raise ValueError(f"지원하지 않는 STATE_STORE_URL 입니다: {url}")
+
+# --- 상태 확인 --- #
+
+def probe(target, timeout=PROBE_TIMEOUT):
     """
-    지정된 URL의 상태를 확인하고, 비정상일 경우 SNS로 메시지를 발행합니다.
+    대상 URL 에 GET 요청을 보내고 단계별 소요 시간(ms)을 측정합니다.
+    dns -> connect(TCP) -> tls(HTTPS 인 경우) -> ttfb(요청 전송 ~ 응답 헤더 수신) -> total
     """
-    print(f"Performing health check for {TARGET_URL}...")
-    
+    url = urlsplit(target["url"])
+    https = url.scheme == 'https'
+    port = url.port or (443 if https else 80)
+    path = (url.path or '/') + (f"?{url.query}" if url.query else '')
+    timings = {}
+    result = {"name": target["name"], "url": target["url"], "ok": False, "status": None,
+              "timings": timings, "error": None}
+
+    started = time.perf_counter()
+    def mark(name, since):
+        now = time.perf_counter()
+        timings[name] = round((now - since) * 1000, 1)
+        return now
+
     conn = None
     try:
-        # 기본 라이브러리인 http.client를 사용하여 외부 라이브러리 의존성 없음
-        if TARGET_URL.startswith('https://'):
-            conn = http.client.HTTPSConnection(HOST, timeout=10)
-        else:
-            conn = http.client.HTTPConnection(HOST, timeout=10)
-            
-        conn.request("GET", PATH)
+        address = socket.getaddrinfo(url.hostname, port, type=socket.SOCK_STREAM)[0][4]
+        step = mark('dns', started)
+        sock = socket.create_connection(address[:2], timeout=timeout)
+        step = mark('connect', step)
+        if https:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=url.hostname)
+            step = mark('tls', step)
+
+        # 직접 연결한 소켓을 http.client 에 넘겨 요청/응답 파싱만 맡깁니다.
+        conn = http.client.HTTPConnection(url.hostname, port, timeout=timeout)
+        conn.sock = sock
+        conn.request("GET", path, headers={"User-Agent": "health-checker", "Connection": "close"})
         response = conn.getresponse()
-        
-        status_code = response.status
-        print(f"Received status code: {status_code}")
-        
-        if 200 <= status_code < 300:
-            print("Health check successful.")
-            return {
-                'statusCode': 200,
-                'body': json.dumps('Health check successful!')
-            }
-        else:
-            # 2xx 응답이 아니면 실패로 간주
-            raise Exception(f"Health check failed with status code: {status_code}")
+        mark('ttfb', step)
+        response.read()
+        mark('total', started)
 
+        result["status"] = response.status
+        if 200 <= response.status < 300:
+            result["ok"] = True
+        else:
+            result["error"] = f"Health check failed with status code: {response.status}"
     except Exception as e:
-        error_message = f"Health check failed for {TARGET_URL}. Reason: {str(e)}"
-        print(error_message)
-        
-        # SNS로 보낼 메시지 형식 정의
-        sns_message = {
-            "service": "EC2 Web Service",
-            "url": TARGET_URL,
-            "status": "DOWN",
-            "reason": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        # SNS 토픽으로 알람 메시지 발행
-        try:
-            sns_client.publish(
-                TopicArn=SNS_TOPIC_ARN,
-                Subject=f"Service Down Alert: {TARGET_URL}",
-                Message=json.dumps({'default': json.dumps(sns_message)}),
-                MessageStructure='json'
-            )
-            print(f"Successfully published failure alert to SNS topic: {SNS_TOPIC_ARN}")
-        except Exception as sns_error:
-            print(f"Failed to publish to SNS. Error: {str(sns_error)}")
-            # SNS 발행 실패 시에도 에러 응답 반환
-            return {
-                'statusCode': 500,
-                'body': json.dumps(f'Health check failed, and SNS notification also failed: {str(sns_error)}')
-            }
-            
-        return {
-            'statusCode': 500,
-            'body': json.dumps(error_message)
-        }
-        
+        mark('total', started)
+        result["error"] = f"{type(e).__name__}: {e}"
     finally:
         if conn:
             conn.close()
+    return result
+
+def update_state(state, result, latency_threshold_ms, failure_threshold=FAILURE_THRESHOLD):
+    """
+    probe 결과로 대상의 상태를 갱신하고, 알려야 할 상태 변화가 있으면 'DOWN'/'SLOW'/'UP' 을 반환합니다.
+    같은 상태가 계속되는 동안에는 다시 알리지 않습니다.
+    """
+    slow = result["ok"] and result["timings"]["total"] > latency_threshold_ms
+    state["consecutiveFailures"] = 0 if result["ok"] else state.get("consecutiveFailures", 0) + 1
+    state["consecutiveSlow"] = state.get("consecutiveSlow", 0) + 1 if slow else 0
+    state["lastCheckedAt"] = datetime.now(timezone.utc).isoformat()
+    state["lastTimings"] = result["timings"]
+
+    previous = state.get("status", "UP")
+    if state["consecutiveFailures"] >= failure_threshold:
+        current = "DOWN"
+    elif state["consecutiveSlow"] >= LATENCY_BREACH_THRESHOLD:
+        current = "SLOW"
+    elif result["ok"] and not slow:
+        current = "UP"
+    else:
+        # 실패/지연이 아직 기준 횟수에 이르지 않았으면 이전 상태를 유지합니다.
+        current = previous
+
+    state["status"] = current
+    if current != previous:
+        state["lastChangedAt"] = state["lastCheckedAt"]
+        return current
+    return None
+
+def publish_alert(target, result, status, sns_client, failures=FAILURE_THRESHOLD):
+    """lambda_sns_to_slack 이 읽는 형식(service/url/status/reason/timestamp)으로 SNS 에 발행합니다."""
+    timings = ', '.join(f"{k}={v}ms" for k, v in result["timings"].items())
+    if status == "UP":
+        reason = f"Recovered. ({timings})"
+    elif status == "SLOW":
+        reason = f"Response time exceeded {target.get('latencyThresholdMs', LATENCY_THRESHOLD_MS):.0f}ms. ({timings})"
+    else:
+        reason = f"{result['error']} ({failures} consecutive failures, {timings})"
+
+    sns_message = {
+        "service": f"EC2 Web Service ({target['name']})",
+        "url": target["url"],
+        "status": status,
+        "reason": reason,
+        "timings": result["timings"],
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+    subject = {"DOWN": "Service Down Alert", "SLOW": "Service Latency Alert", "UP": "Service Recovered"}[status]
+    sns_client.publish(
+        TopicArn=SNS_TOPIC_ARN,
+        Subject=f"{subject}: {target['name']}"[:100],
+        Message=json.dumps({'default': json.dumps(sns_message)}),
+        MessageStructure='json'
+    )
+
+def lambda_handler(event, context, state_store=None, sns_client=None):
+    """
+    설정된 모든 엔드포인트를 동시에 확인하고, 연속 실패/지연 기준을 넘거나 회복된 대상만 SNS 로 알립니다.
+    상태 저장소를 읽지 못하면 연속 실패 횟수를 알 수 없으므로, 실패한 대상은 한 번의 실패로도 DOWN 으로 알립니다. (fail open)
+    이때 저장된 연속 실패 횟수와 알림 상태를 빈 상태로 덮어쓰지 않도록 저장하지 않습니다.
+    """
+    validate_config(STATE_STORE_URL if state_store is None else None, SNS_TOPIC_ARN)
+    targets = load_targets()
+    if not targets:
+        print("No health check targets configured.")
+        return {'statusCode': 200, 'body': json.dumps({"results": [], "alerts": [], "publishErrors": [], "stateErrors": []})}
+    state_store = state_store or make_state_store()
+    print(f"Performing health check for {len(targets)} targets...")
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        results = list(executor.map(probe, targets))
+
+    state_errors = []
+    try:
+        states = state_store.load()
+        loaded = True
+    except Exception as e:
+        print(f"Failed to load health state. Alerting on first failure. Error: {e}")
+        state_errors.append(f"load: {type(e).__name__}: {e}")
+        states = {}
+        loaded = False
+    failure_threshold = FAILURE_THRESHOLD if loaded else 1
+
+    alerts = []
+    for target, result in zip(targets, results):
+        print(json.dumps(result))
+        state = states.setdefault(target["name"], {})
+        previous = state.get("status", "UP")
+        change = update_state(state, result, target.get("latencyThresholdMs", LATENCY_THRESHOLD_MS),
+                              failure_threshold)
+        if change:
+            alerts.append((target, result, change, previous))
+
+    publish_errors = []
+    if alerts:
+        if sns_client is None:
+            import boto3
+            sns_client = boto3.client('sns')
+        for target, result, change, previous in alerts:
+            try:
+                publish_alert(target, result, change, sns_client, states[target["name"]]["consecutiveFailures"])
+                print(f"Published {change} alert for {target['name']} to SNS topic: {SNS_TOPIC_ARN}")
+            except Exception as sns_error:
+                print(f"Failed to publish to SNS. Error: {str(sns_error)}")
+                publish_errors.append(str(sns_error))
+                # 다음 실행에서 다시 알리도록 상태 변화는 되돌리고, 연속 실패 횟수는 유지합니다.
+                states[target["name"]]["status"] = previous
+    if loaded:
+        try:
+            state_store.save(states)
+        except Exception as e:
+            print(f"Failed to save health state. Error: {e}")
+            state_errors.append(f"save: {type(e).__name__}: {e}")
+
+    healthy = all(result["ok"] for result in results)
+    return {
+        'statusCode': 200 if healthy and not publish_errors and not state_errors else 500,
+        'body': json.dumps({
+            "results": results,
+            "alerts": [{"name": target["name"], "status": change} for target, _, change, _ in alerts],
+            "publishErrors": publish_errors,
+            "stateErrors": state_errors
+        })
+    }
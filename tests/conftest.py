@@ -0,0 +1,5 @@
+# 저장소 최상위의 Lambda 함수 테스트. 저장소 최상위에서 `python -m pytest tests` 로 실행합니다.
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,123 @@
+# lambda_health_checker 테스트. probe 와 SNS 는 가짜로 바꾸고, 상태는 FileStateStore 로 임시 디렉토리에 저장합니다.
+import json
+
+import pytest
+
+import lambda_health_checker as checker
+
+TOPIC_ARN = 'arn:aws:sns:ap-northeast-2:123456789012:health-alerts'
+
+class FakeSNS:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.published = []
+
+    def publish(self, **kwargs):
+        if self.fail:
+            raise RuntimeError("sns unavailable")
+        self.published.append(json.loads(json.loads(kwargs['Message'])['default']))
+
+class BrokenStore:
+    def __init__(self):
+        self.saved = False
+
+    def load(self):
+        raise RuntimeError("dynamodb unavailable")
+
+    def save(self, states):
+        self.saved = True
+
+def result(ok=True, total=100.0):
+    return {"name": "home", "url": "https://example.com/", "ok": ok, "status": 200 if ok else None,
+            "timings": {"total": total}, "error": None if ok else "ConnectionRefusedError: refused"}
+
+@pytest.fixture
+def probes(monkeypatch):
+    """다음 실행에서 probe 가 돌려줄 결과. probes.append(result(...)) 로 정합니다."""
+    queue = []
+    monkeypatch.setattr(checker, 'SNS_TOPIC_ARN', TOPIC_ARN)
+    monkeypatch.setattr(checker, 'FAILURE_THRESHOLD', 3)
+    monkeypatch.setattr(checker, 'LATENCY_BREACH_THRESHOLD', 2)
+    monkeypatch.setenv('HEALTH_TARGETS', '[{"name": "home", "url": "https://example.com/"}]')
+    monkeypatch.setattr(checker, 'probe', lambda target: queue.pop(0))
+    return queue
+
+def run(probes, store, sns, *results):
+    probes.extend(results)
+    response = checker.lambda_handler({}, None, state_store=store, sns_client=sns)
+    return response['statusCode'], json.loads(response['body'])
+
+def test_update_state_thresholds_and_transitions(monkeypatch):
+    monkeypatch.setattr(checker, 'LATENCY_BREACH_THRESHOLD', 2)
+    state = {}
+    assert checker.update_state(state, result(ok=False), 2000, failure_threshold=3) is None
+    assert checker.update_state(state, result(ok=False), 2000, failure_threshold=3) is None
+    assert checker.update_state(state, result(ok=False), 2000, failure_threshold=3) == 'DOWN'
+    assert checker.update_state(state, result(ok=False), 2000, failure_threshold=3) is None
+    assert checker.update_state(state, result(), 2000, failure_threshold=3) == 'UP'
+    assert state["consecutiveFailures"] == 0
+
+    assert checker.update_state(state, result(total=2500), 2000) is None
+    assert checker.update_state(state, result(total=2500), 2000) == 'SLOW'
+    assert checker.update_state(state, result(total=100), 2000) == 'UP'
+
+def test_down_and_recovery_alerts_persist_across_invocations(probes, tmp_path):
+    store = checker.FileStateStore(str(tmp_path / 'state.json'))
+    sns = FakeSNS()
+    for _ in range(2):
+        status, body = run(probes, store, sns, result(ok=False))
+        assert status == 500 and body["alerts"] == []
+    status, body = run(probes, store, sns, result(ok=False))
+    assert body["alerts"] == [{"name": "home", "status": "DOWN"}]
+    assert "3 consecutive failures" in sns.published[0]["reason"]
+
+    status, body = run(probes, store, sns, result())
+    assert status == 200
+    assert body["alerts"] == [{"name": "home", "status": "UP"}]
+    assert [message["status"] for message in sns.published] == ["DOWN", "UP"]
+
+def test_publish_failure_keeps_previous_status_so_alert_is_retried(probes, tmp_path):
+    store = checker.FileStateStore(str(tmp_path / 'state.json'))
+    store.save({"home": {"status": "UP", "consecutiveFailures": 2}})
+
+    status, body = run(probes, store, FakeSNS(fail=True), result(ok=False))
+    assert status == 500 and body["publishErrors"] == ["sns unavailable"]
+    assert store.load()["home"]["status"] == "UP"
+    assert store.load()["home"]["consecutiveFailures"] == 3
+
+    sns = FakeSNS()
+    status, body = run(probes, store, sns, result(ok=False))
+    assert body["alerts"] == [{"name": "home", "status": "DOWN"}]
+    assert store.load()["home"]["status"] == "DOWN"
+
+def test_load_failure_alerts_on_first_failure_and_does_not_save(probes):
+    store, sns = BrokenStore(), FakeSNS()
+    status, body = run(probes, store, sns, result(ok=False))
+    assert status == 500
+    assert body["alerts"] == [{"name": "home", "status": "DOWN"}]
+    assert body["stateErrors"] == ["load: RuntimeError: dynamodb unavailable"]
+    assert store.saved is False
+
+def test_corrupt_state_file_fails_open_without_overwriting(probes, tmp_path):
+    path = tmp_path / 'state.json'
+    path.write_text('{not json')
+    status, body = run(probes, checker.FileStateStore(str(path)), FakeSNS(), result(ok=False))
+    assert body["alerts"] == [{"name": "home", "status": "DOWN"}]
+    assert path.read_text() == '{not json'
+
+def test_empty_target_list_is_a_no_op(probes, monkeypatch):
+    monkeypatch.setenv('HEALTH_TARGETS', '[]')
+    store = BrokenStore()
+    status, body = run(probes, store, FakeSNS())
+    assert status == 200 and body["results"] == []
+    assert store.saved is False
+
+def test_invalid_topic_arn_is_rejected_before_probing(probes, monkeypatch):
+    monkeypatch.setattr(checker, 'SNS_TOPIC_ARN', 'health-alerts')
+    with pytest.raises(ValueError):
+        run(probes, BrokenStore(), FakeSNS(), result())
+    assert probes == [result()]
+
+def test_state_store_url_is_required():
+    with pytest.raises(ValueError):
+        checker.make_state_store(None)